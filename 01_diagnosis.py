@@ -1,17 +1,19 @@
 import streamlit as st
-import cv2
-import numpy as np
+import streamlit.components.v1 as components
 from PIL import Image, ImageDraw
+import io
 import time
 import os
 import sys
-import base64
-from io import BytesIO
-import requests
 
 # 상위 디렉토리 경로 추가
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+from analysis import TARGET_SIZE, ViewAnalysisOrchestrator, warm_up_detector
+from export_archive import ExportCache, export_fingerprint
+from frame_quality import assess_frame_quality
+from image_ingest import ingest_image, source_digest, SessionImageStore, MemoryBudgetExceeded
+
 # 페이지 설정
 st.set_page_config(
     page_title="SpineCheck - 척추측만증 진단",
@@ -87,9 +89,21 @@ st.markdown("""
 # 세션 상태 초기화
 if 'diagnosis_step' not in st.session_state:
     st.session_state.diagnosis_step = 1
+    
+    # 새 세션이 촬영을 시작하기 전에 검출 모델 로드 (프로세스당 한 번)
+    warm_up_detector()
 
 if 'images' not in st.session_state:
-    st.session_state.images = {'back': None, 'side': None, 'front': None}
+    st.session_state.images = SessionImageStore()
+
+if 'analysis' not in st.session_state:
+    st.session_state.analysis = ViewAnalysisOrchestrator()
+
+if 'export_cache' not in st.session_state:
+    st.session_state.export_cache = ExportCache()  # 마지막으로 만든 ZIP (입력이 같으면 재사용)
+
+if 'rejected_images' not in st.session_state:
+    st.session_state.rejected_images = {}  # 촬영 방향별 품질 미달 이미지 (원본 해시, 사유)
 
 if 'analysis_complete' not in st.session_state:
     st.session_state.analysis_complete = False
@@ -100,6 +114,9 @@ if 'timer_active' not in st.session_state:
 if 'timer_duration' not in st.session_state:
     st.session_state.timer_duration = 5  # 기본 타이머 시간 (5초)
 
+if 'timer_deadline' not in st.session_state:
+    st.session_state.timer_deadline = None  # 타이머 촬영 시각 (time.time() 기준)
+
 # 이미지 저장 상태 초기화
 for img_type in ['back', 'side', 'front']:
     if f'{img_type}_saved' not in st.session_state:
@@ -107,6 +124,11 @@ for img_type in ['back', 'side', 'front']:
 
 # 함수 정의
 def next_step():
+    # 결과 페이지에서 한 방향만 다시 촬영한 경우 나머지 촬영은 건너뛰고 바로 분석
+    if st.session_state.get('retake_view'):
+        st.session_state.retake_view = None
+        st.session_state.diagnosis_step = 5
+        return
     st.session_state.diagnosis_step += 1
 
 def prev_step():
@@ -114,25 +136,43 @@ def prev_step():
 
 def reset_diagnosis():
     st.session_state.diagnosis_step = 1
-    st.session_state.images = {'back': None, 'side': None, 'front': None}
+    st.session_state.images = SessionImageStore()
+    st.session_state.analysis = ViewAnalysisOrchestrator()
+    st.session_state.rejected_images = {}
+    st.session_state.retake_view = None
     st.session_state.analysis_complete = False
 
 def start_timer():
     st.session_state.timer_active = True
+    st.session_state.timer_deadline = time.time() + st.session_state.timer_duration
     
 def stop_timer():
     st.session_state.timer_active = False
+    st.session_state.timer_deadline = None
 
-def get_image_download_link(img, filename, text):
-    """이미지 다운로드 링크 생성"""
-    buffered = BytesIO()
-    img.save(buffered, format="JPEG")
-    img_str = base64.b64encode(buffered.getvalue()).decode()
-    href = f'<a href="data:file/jpg;base64,{img_str}" download="{filename}">{text}</a>'
-    return href
+def export_download():
+    """촬영 이미지와 완료된 분석 결과 ZIP 다운로드 (버튼을 눌렀을 때만 ZIP 생성)"""
+    view_results, _ = st.session_state.analysis.collect()
+    fingerprint = export_fingerprint(st.session_state.analysis, view_results)
+    data = st.session_state.export_cache.get(fingerprint)
+    if data is None and st.button("ZIP 파일 만들기", key="diagnosis_export_build"):
+        data = st.session_state.export_cache.build(fingerprint, st.session_state.images, view_results)
+    if data is not None:
+        st.download_button(
+            "촬영 이미지 ZIP 다운로드",
+            data=data,
+            file_name="spine_images.zip",
+            mime="application/zip",
+            key="diagnosis_export_download"
+        )
 
+@st.cache_resource(show_spinner=False)
 def get_sample_image(image_type):
-    """샘플 이미지 생성 - 실제 인체 실루엣과 유사한 형태로 생성"""
+    """
+    샘플 이미지 생성 - 실제 인체 실루엣과 유사한 형태로 생성
+    
+    프로세스당 방향별로 한 번만 그리고 PNG 바이트로 캐시하여 모든 세션과 재실행이 공유한다.
+    """
     width, height = 300, 400
     
     # 배경색 생성
@@ -182,13 +222,52 @@ def get_sample_image(image_type):
         draw.line((145, 250, 120, 350), fill=(255, 255, 255), width=3)  # 왼다리
         draw.line((155, 250, 180, 350), fill=(255, 255, 255), width=3)  # 오른다리
     
-    return img
+    buffer = io.BytesIO()
+    img.save(buffer, format='PNG')
+    return buffer.getvalue()
 
 # 이미지 처리 및 저장 함수
-def process_and_save_image(img, image_type):
-    """이미지 처리 및 세션 상태에 저장"""
-    # 이미지를 세션 상태에 저장
-    st.session_state.images[image_type] = img
+def process_and_save_image(source, image_type, analysis_result=None):
+    """
+    이미지 수집(디코딩 및 분석 해상도로 축소) 후 세션 상태에 저장
+    
+    analysis_result가 있으면(실시간 영상 모드) 다시 분석하지 않고 그 결과를 사용한다.
+    """
+    current = st.session_state.images[image_type]
+    
+    # Streamlit 재실행마다 같은 업로드 파일이 다시 들어오므로 이미 수집/거부한 이미지는 다시 처리하지 않음
+    if not isinstance(source, Image.Image):
+        digest = source_digest(source.getvalue())
+        if current is not None and current.source_digest == digest:
+            return current
+        rejected = st.session_state.rejected_images.get(image_type)
+        if rejected is not None and rejected[0] == digest:
+            st.warning(f"분석하기 어려운 이미지입니다: {rejected[1]}. 다시 촬영해주세요.")
+            return None
+    
+    img = ingest_image(source)
+    
+    # 흐리거나 어둡거나 잘린 이미지는 분석하지 않음 (썸네일 기준 품질 검사)
+    if analysis_result is None:
+        quality = assess_frame_quality(img.array)
+        if not quality.usable:
+            issues = ", ".join(quality.issues)
+            st.session_state.rejected_images[image_type] = (img.source_digest, issues)
+            st.warning(f"분석하기 어려운 이미지입니다: {issues}. 다시 촬영해주세요.")
+            return None
+    
+    # 이미지를 세션 상태에 저장 (세션 메모리 한도 적용)
+    try:
+        st.session_state.images[image_type] = img
+    except MemoryBudgetExceeded as e:
+        st.error(f"이미지를 저장할 수 없습니다. {e}")
+        return None
+    
+    if analysis_result is not None:
+        st.session_state.analysis.complete(image_type, img.array, analysis_result)
+    else:
+        # 저장 즉시 백그라운드 분석 시작
+        st.session_state.analysis.submit(image_type, img.array)
     
     # 성공 메시지 표시
     st.success(f"{image_type} 이미지가 성공적으로 저장되었습니다!")
@@ -199,27 +278,118 @@ def process_and_save_image(img, image_type):
     return img
 
 # 타이머 컴포넌트
+TIMER_CAPTURE_LABEL = "📸 지금 촬영"
+
+def countdown_html(remaining_ms, capture_label):
+    """브라우저에서 카운트다운 후 촬영 버튼을 눌러 재실행을 요청하는 HTML"""
+    return f"""
+    <div id="timer" style="font-family: sans-serif; font-size: 6rem; font-weight: bold;
+         text-align: center; color: #1E88E5;"></div>
+    <div style="font-family: sans-serif; font-size: 1.5rem; text-align: center;">
+        잠시 후 자동으로 촬영됩니다. 자세를 유지하세요.
+    </div>
+    <script>
+        const deadline = Date.now() + {remaining_ms};
+        const timer = document.getElementById("timer");
+        function tick() {{
+            const left = Math.ceil((deadline - Date.now()) / 1000);
+            if (left > 0) {{
+                timer.textContent = left;
+                setTimeout(tick, 200);
+                return;
+            }}
+            timer.textContent = "📸";
+            // 서버에 재실행을 요청하기 위해 페이지의 촬영 버튼을 누름
+            const buttons = window.parent.document.querySelectorAll("button");
+            for (const button of buttons) {{
+                if (button.innerText.trim() === "{capture_label}") {{
+                    button.click();
+                    break;
+                }}
+            }}
+        }}
+        tick();
+    </script>
+    """
+
 def timer_component(seconds, image_type):
-    if st.session_state.timer_active:
-        # 타이머 표시
-        timer_placeholder = st.empty()
-        message_placeholder = st.empty()
-        
-        for remaining in range(seconds, 0, -1):
-            timer_placeholder.markdown(f'<div class="timer-container">{remaining}</div>', unsafe_allow_html=True)
-            message_placeholder.markdown(f'<div class="timer-message">잠시 후 자동으로 촬영됩니다. 자세를 유지하세요.</div>', unsafe_allow_html=True)
-            time.sleep(1)
-        
-        # 타이머 완료 후 카메라 촬영
-        timer_placeholder.markdown(f'<div class="timer-container">📸</div>', unsafe_allow_html=True)
-        message_placeholder.markdown(f'<div class="timer-message">촬영 완료!</div>', unsafe_allow_html=True)
-        
-        # 샘플 이미지 생성 및 저장
-        sample_image = get_sample_image(image_type)
-        process_and_save_image(sample_image, image_type)
-        
-        st.session_state.timer_active = False
-        st.rerun()
+    """
+    타이머 촬영 표시
+    
+    카운트다운은 브라우저에서 진행되고 서버 스크립트는 대기하지 않는다.
+    촬영 시각이 지난 뒤의 재실행(카운트다운 종료 시 자동 클릭 또는 사용자 클릭)에서 촬영을 처리한다.
+    """
+    if not st.session_state.timer_active:
+        return
+    
+    if st.session_state.timer_deadline is None:
+        st.session_state.timer_deadline = time.time() + seconds
+    
+    remaining = st.session_state.timer_deadline - time.time()
+    
+    if remaining > 0:
+        components.html(countdown_html(int(remaining * 1000), TIMER_CAPTURE_LABEL), height=220)
+        if st.button(TIMER_CAPTURE_LABEL, key=f"{image_type}_timer_capture"):
+            # 사용자가 직접 누르면 즉시 촬영
+            st.session_state.timer_deadline = time.time()
+            st.rerun()
+        return
+    
+    # 타이머 완료 후 카메라 촬영
+    st.markdown(f'<div class="timer-container">📸</div>', unsafe_allow_html=True)
+    st.markdown(f'<div class="timer-message">촬영 완료!</div>', unsafe_allow_html=True)
+    
+    # 샘플 이미지 생성 및 저장
+    process_and_save_image(io.BytesIO(get_sample_image(image_type)), image_type)
+    
+    stop_timer()
+    st.rerun()
+
+# 실시간 영상 분석
+def video_capture(image_type):
+    """
+    실시간 영상 모드 (streamlit-webrtc)
+    
+    프레임 분석은 webrtc 스레드에서 계속 진행되고, 이 함수는 재실행 시점의 평활화 결과만 읽는다.
+    '이 자세로 저장'을 누르면 최근 프레임 중 품질이 가장 좋은 프레임과 평활화된 결과를 그대로 저장한다.
+    """
+    try:
+        from streamlit_webrtc import webrtc_streamer
+    except ImportError:
+        st.info("실시간 영상 분석을 사용하려면 streamlit-webrtc를 설치하세요.")
+        return
+    
+    from video_analysis import SpineVideoProcessor
+    
+    ctx = webrtc_streamer(
+        key=f"{image_type}_video",
+        video_processor_factory=lambda: SpineVideoProcessor(TARGET_SIZE),
+        media_stream_constraints={"video": True, "audio": False},
+        async_processing=True
+    )
+    
+    processor = ctx.video_processor
+    if processor is None:
+        st.caption("시작 버튼을 눌러 카메라를 켜면 척추 각도가 실시간으로 표시됩니다.")
+        return
+    
+    stats = processor.analyzer.stats()
+    latest = processor.analyzer.latest
+    if latest is not None:
+        st.metric("현재 Cobb 각도 (평활화)", f"{latest['angle']:.1f}°")
+    st.caption(
+        f"{stats['fps']:.1f} fps · 검출 {stats['detections']}회 · "
+        f"재사용 {stats['reused']}회 · 버린 프레임 {stats['dropped']}개"
+    )
+    
+    if stats['rejected']:
+        st.caption(f"품질 미달로 건너뛴 프레임 {stats['rejected']}개 (흐림/어두움/잘림)")
+    
+    if st.button("이 자세로 저장", key=f"{image_type}_video_save", disabled=latest is None):
+        frame, result = processor.analyzer.capture()
+        if frame is not None:
+            process_and_save_image(Image.fromarray(frame[:, :, ::-1]), image_type, analysis_result=result)
+            st.rerun()
 
 # 진단 과정 표시 함수
 def show_progress():
@@ -246,6 +416,11 @@ st.markdown('<h1 class="header">척추측만증 진단</h1>', unsafe_allow_html=
 # 진행 상태 표시
 show_progress()
 
+# 세션 이미지 메모리 사용량 표시
+memory_report = st.session_state.images.report()
+if memory_report['used_bytes']:
+    st.caption(f"이미지 메모리 사용량: {memory_report['used_bytes'] / 1024:.0f}KB / {memory_report['budget_bytes'] / 1024:.0f}KB")
+
 # 단계별 진행
 if st.session_state.diagnosis_step == 1:
     st.markdown('<h2 class="subheader">촬영 가이드</h2>', unsafe_allow_html=True)
@@ -311,19 +486,18 @@ elif st.session_state.diagnosis_step == 2:
     
     with col2:
         # 탭으로 카메라와 업로드 옵션 구분
-        tab1, tab2 = st.tabs(["📷 카메라 촬영", "📁 이미지 업로드"])
+        tab1, tab2, tab3 = st.tabs(["📷 카메라 촬영", "📁 이미지 업로드", "🎥 실시간 분석"])
         
         with tab1:
             st.markdown('<div class="tab-content">', unsafe_allow_html=True)
             if not st.session_state.timer_active and not st.session_state.images['back']:
                 if st.button("타이머로 촬영하기", key="back_timer"):
-                    st.session_state.timer_active = True
+                    start_timer()
                     st.rerun()
                 
                 camera_input = st.camera_input("직접 촬영하기")
                 if camera_input:
-                    img = Image.open(camera_input)
-                    process_and_save_image(img, 'back')
+                    process_and_save_image(camera_input, 'back')
             
             # 타이머 활성화 시 표시
             if st.session_state.timer_active:
@@ -331,9 +505,10 @@ elif st.session_state.diagnosis_step == 2:
                 
             # 이미지가 있으면 표시
             if st.session_state.images['back']:
-                st.image(st.session_state.images['back'], caption="촬영된 후면 이미지", width=300)
+                st.image(st.session_state.images['back'].encoded, caption="촬영된 후면 이미지", width=300)
                 if st.button("다시 촬영", key="retake_back"):
                     st.session_state.images['back'] = None
+                    st.session_state.analysis.discard('back')
                     st.session_state.back_saved = False
                     st.rerun()
             st.markdown('</div>', unsafe_allow_html=True)
@@ -344,10 +519,12 @@ elif st.session_state.diagnosis_step == 2:
             st.markdown("### 이미지 업로드")
             uploaded_file = st.file_uploader("후면 이미지 업로드", type=["jpg", "jpeg", "png"])
             if uploaded_file:
-                img = Image.open(uploaded_file)
-                process_and_save_image(img, 'back')
+                process_and_save_image(uploaded_file, 'back')
             st.markdown('</div>', unsafe_allow_html=True)
             st.markdown('</div>', unsafe_allow_html=True)
+        
+        with tab3:
+            video_capture('back')
     
     # 이미지가 업로드/촬영되었을 때만 다음 버튼 활성화
     col1, col2 = st.columns(2)
@@ -380,19 +557,18 @@ elif st.session_state.diagnosis_step == 3:
     
     with col2:
         # 탭으로 카메라와 업로드 옵션 구분
-        tab1, tab2 = st.tabs(["📷 카메라 촬영", "📁 이미지 업로드"])
+        tab1, tab2, tab3 = st.tabs(["📷 카메라 촬영", "📁 이미지 업로드", "🎥 실시간 분석"])
         
         with tab1:
             st.markdown('<div class="tab-content">', unsafe_allow_html=True)
             if not st.session_state.timer_active and not st.session_state.images['side']:
                 if st.button("타이머로 촬영하기", key="side_timer"):
-                    st.session_state.timer_active = True
+                    start_timer()
                     st.rerun()
                 
                 camera_input = st.camera_input("직접 촬영하기")
                 if camera_input:
-                    img = Image.open(camera_input)
-                    process_and_save_image(img, 'side')
+                    process_and_save_image(camera_input, 'side')
             
             # 타이머 활성화 시 표시
             if st.session_state.timer_active:
@@ -400,9 +576,10 @@ elif st.session_state.diagnosis_step == 3:
                 
             # 이미지가 있으면 표시
             if st.session_state.images['side']:
-                st.image(st.session_state.images['side'], caption="촬영된 측면 이미지", width=300)
+                st.image(st.session_state.images['side'].encoded, caption="촬영된 측면 이미지", width=300)
                 if st.button("다시 촬영", key="retake_side"):
                     st.session_state.images['side'] = None
+                    st.session_state.analysis.discard('side')
                     st.session_state.side_saved = False
                     st.rerun()
             st.markdown('</div>', unsafe_allow_html=True)
@@ -413,10 +590,12 @@ elif st.session_state.diagnosis_step == 3:
             st.markdown("### 이미지 업로드")
             uploaded_file = st.file_uploader("측면 이미지 업로드", type=["jpg", "jpeg", "png"])
             if uploaded_file:
-                img = Image.open(uploaded_file)
-                process_and_save_image(img, 'side')
+                process_and_save_image(uploaded_file, 'side')
             st.markdown('</div>', unsafe_allow_html=True)
             st.markdown('</div>', unsafe_allow_html=True)
+        
+        with tab3:
+            video_capture('side')
     
     # 이미지가 업로드/촬영되었을 때만 다음 버튼 활성화
     col1, col2 = st.columns(2)
@@ -449,19 +628,18 @@ elif st.session_state.diagnosis_step == 4:
     
     with col2:
         # 탭으로 카메라와 업로드 옵션 구분
-        tab1, tab2 = st.tabs(["📷 카메라 촬영", "📁 이미지 업로드"])
+        tab1, tab2, tab3 = st.tabs(["📷 카메라 촬영", "📁 이미지 업로드", "🎥 실시간 분석"])
         
         with tab1:
             st.markdown('<div class="tab-content">', unsafe_allow_html=True)
             if not st.session_state.timer_active and not st.session_state.images['front']:
                 if st.button("타이머로 촬영하기", key="front_timer"):
-                    st.session_state.timer_active = True
+                    start_timer()
                     st.rerun()
                 
                 camera_input = st.camera_input("직접 촬영하기")
                 if camera_input:
-                    img = Image.open(camera_input)
-                    process_and_save_image(img, 'front')
+                    process_and_save_image(camera_input, 'front')
             
             # 타이머 활성화 시 표시
             if st.session_state.timer_active:
@@ -469,9 +647,10 @@ elif st.session_state.diagnosis_step == 4:
                 
             # 이미지가 있으면 표시
             if st.session_state.images['front']:
-                st.image(st.session_state.images['front'], caption="촬영된 전면 이미지", width=300)
+                st.image(st.session_state.images['front'].encoded, caption="촬영된 전면 이미지", width=300)
                 if st.button("다시 촬영", key="retake_front"):
                     st.session_state.images['front'] = None
+                    st.session_state.analysis.discard('front')
                     st.session_state.front_saved = False
                     st.rerun()
             st.markdown('</div>', unsafe_allow_html=True)
@@ -482,18 +661,18 @@ elif st.session_state.diagnosis_step == 4:
             st.markdown("### 이미지 업로드")
             uploaded_file = st.file_uploader("전면 이미지 업로드", type=["jpg", "jpeg", "png"])
             if uploaded_file:
-                img = Image.open(uploaded_file)
-                process_and_save_image(img, 'front')
+                process_and_save_image(uploaded_file, 'front')
             st.markdown('</div>', unsafe_allow_html=True)
             st.markdown('</div>', unsafe_allow_html=True)
+        
+        with tab3:
+            video_capture('front')
     
     # 이미지 공유 옵션
     if st.session_state.images['front']:
         with st.expander("이미지 저장 옵션"):
-            st.markdown("촬영한 이미지를 저장하려면 아래 링크를 클릭하세요.")
-            st.markdown(get_image_download_link(st.session_state.images['front'], 'spine_front.jpg', '전면 이미지 저장'), unsafe_allow_html=True)
-            st.markdown(get_image_download_link(st.session_state.images['side'], 'spine_side.jpg', '측면 이미지 저장'), unsafe_allow_html=True)
-            st.markdown(get_image_download_link(st.session_state.images['back'], 'spine_back.jpg', '후면 이미지 저장'), unsafe_allow_html=True)
+            st.markdown("촬영한 이미지와 분석이 끝난 방향의 분석 이미지를 ZIP 파일 하나로 저장합니다.")
+            export_download()
     
     # 이미지가 업로드/촬영되었을 때만 다음 버튼 활성화
     col1, col2 = st.columns(2)
@@ -513,39 +692,37 @@ elif st.session_state.diagnosis_step == 5:
     progress_bar = st.progress(0)
     status_text = st.empty()
     
-    # 분석 과정 시뮬레이션
-    for i in range(101):
-        progress_bar.progress(i)
-        if i < 20:
-            status_text.text("이미지 전처리 중...")
-        elif i < 40:
-            status_text.text("척추 포인트 검출 중...")
-        elif i < 60:
-            status_text.text("척추 곡률 분석 중...")
-        elif i < 80:
-            status_text.text("측만 각도 계산 중...")
-        else:
-            status_text.text("결과 생성 중...")
-        time.sleep(0.05)  # 실제 앱에서는 실제 처리 시간에 따라 조정
+    # 저장 시 제출되지 않은 이미지가 있으면 지금 분석 제출 (세 방향은 동시에 분석됨)
+    analysis = st.session_state.analysis
+    analysis.submit_missing({
+        view: image.array if image is not None else None
+        for view, image in st.session_state.images.items()
+    })
+    
+    # 실제 단계별 진행 상황을 표시하며 분석 완료 대기
+    while True:
+        progress_bar.progress(analysis.progress)
+        status_text.text(analysis.status_text)
+        if analysis.wait(timeout=0.05):
+            break
+    progress_bar.progress(1.0)
+    
+    # 분석 결과 수집
+    _, errors = analysis.collect()
+    
+    if errors or not analysis.active_jobs:
+        st.error("이미지 분석 중 오류가 발생했습니다. 다시 촬영해주세요.")
+        for error in errors:
+            st.caption(error)
+        st.button("처음으로", on_click=reset_diagnosis)
+        st.stop()
     
     # 분석 완료 후 결과 페이지로 이동
+    status_text.text("분석 완료")
+    # 바뀐 방향이 없으면 이전 병합 결과를 그대로 사용
+    st.session_state.result = analysis.merge()
     st.session_state.analysis_complete = True
     st.success("분석이 완료되었습니다!")
     
-    # 예시 결과 생성 (실제로는 AI 모델을 통한 예측 결과)
-    if 'result' not in st.session_state:
-        st.session_state.result = {
-            'angle': 15.7,
-            'risk_level': '중간',
-            'risk_color': 'yellow',
-            'recommendations': [
-                '정형외과 전문의 상담 권장',
-                '자세 교정 운동 시작 고려',
-                '6개월 내 재검사 권장'
-            ]
-        }
-    
-    time.sleep(1)  # 결과 표시 전 잠시 대기
-    
     # 결과 페이지로 이동
-    st.switch_page("pages/02_results.py") 
\ No newline at end of file
+    st.switch_page("pages/02_results.py")
@@ -1,15 +1,59 @@
 import streamlit as st
-import pandas as pd
-import plotly.graph_objects as go
+import streamlit.components.v1 as components
 import numpy as np
 import os
 import sys
-import time
 from datetime import datetime
 
 # 상위 디렉토리 경로 추가
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+from assets import asset_html
+from export_archive import ExportCache, export_fingerprint
+from history_store import get_history_store
+from pdf_report import get_report_queue
+from lazy_import import lazy_import
+
+# 그래프는 결과가 있을 때만 그리므로 첫 사용 시 import
+go = lazy_import('plotly.graph_objects')
+
+# 이력 목록 한 번에 불러오는 결과 수
+HISTORY_PAGE_SIZE = 20
+
+# 촬영 방향별 진단 페이지 단계 번호와 표시 이름
+RETAKE_STEPS = {'back': (2, "후면"), 'side': (3, "측면"), 'front': (4, "전면")}
+
+# 위험도별 예시 그림 (정적 에셋 이름)
+RISK_ASSETS = {'low': 'spine_low', 'medium': 'spine_medium', 'high': 'spine_high'}
+
+# 보고서 완성 확인 버튼과 브라우저에서 자동으로 누르는 간격 (밀리초)
+REPORT_REFRESH_LABEL = "보고서 상태 확인"
+REPORT_POLL_MS = 1000
+
+def report_poll_html(delay_ms, refresh_label):
+    """브라우저에서 잠시 후 보고서 확인 버튼을 눌러 재실행을 요청하는 HTML (서버 스크립트는 대기하지 않음)"""
+    return f"""
+    <script>
+        setTimeout(() => {{
+            const buttons = window.parent.document.querySelectorAll("button");
+            for (const button of buttons) {{
+                if (button.innerText.trim() === "{refresh_label}") {{
+                    button.click();
+                    break;
+                }}
+            }}
+        }}, {delay_ms});
+    </script>
+    """
+
+def analysis_overlays():
+    """진단 페이지 분석 작업의 방향별 오버레이 이미지 (보고서용)"""
+    analysis = st.session_state.get('analysis')
+    if analysis is None:
+        return {}
+    view_results, _ = analysis.collect()
+    return {view: result['overlay'] for view, result in view_results.items() if result.get('overlay') is not None}
+
 # 페이지 설정
 st.set_page_config(
     page_title="SpineCheck - 진단 결과",
@@ -97,13 +141,14 @@ else:
         st.markdown('<div class="result-box">', unsafe_allow_html=True)
         st.markdown('<h2 class="subheader">척추 분석 결과</h2>', unsafe_allow_html=True)
         
-        # 이미지 표시
-        if st.session_state.result['angle'] < 10:
-            st.image("https://img.freepik.com/free-vector/orthopedic-composition-with-flat-image-human-back_1284-63818.jpg", 
-                    caption="척추 곡률 분석 결과", use_container_width=True)
+        # 이미지 표시 (분석한 결과면 실제 분석 오버레이, 예시 결과면 위험도별 그림)
+        overlays = analysis_overlays()
+        overlay_view = 'back' if 'back' in overlays else next(iter(overlays), None)
+        if overlay_view is not None:
+            st.image(overlays[overlay_view], channels="BGR", caption="척추 곡률 분석 결과", use_container_width=True)
         else:
-            st.image("https://img.freepik.com/free-vector/orthopedic-composition-with-flat-image-human-back_1284-63818.jpg", 
-                    caption="척추 곡률 분석 결과 (샘플)", use_container_width=True)
+            st.markdown(asset_html(RISK_ASSETS.get(st.session_state.result['risk_color'], 'spine_medium'),
+                                   caption="척추 곡률 분석 결과 (샘플)"), unsafe_allow_html=True)
         
         # 스파인 곡률 그래프 (시각화)
         st.markdown("### 척추 곡률 시각화")
@@ -191,27 +236,126 @@ else:
     st.markdown('<div class="result-box">', unsafe_allow_html=True)
     st.markdown('<h2 class="subheader">다음 단계</h2>', unsafe_allow_html=True)
     
-    col1, col2 = st.columns(2)
+    col1, col2, col3 = st.columns(3)
     
     with col1:
         if st.button("주변 병원 찾기", type="primary"):
             st.switch_page("pages/03_hospitals.py")
     
     with col2:
-        if st.button("진단 결과 저장"):
-            # 여기서는 단순 메시지로 표시 (실제로는 파일 저장 구현)
-            now = datetime.now().strftime("%Y%m%d_%H%M%S")
-            st.success(f"진단 결과가 저장되었습니다. (spine_check_result_{now}.pdf)")
-            
-            # 실제 앱에서는 PDF 생성 및 다운로드 구현
-            # with open(f"spine_check_result_{now}.pdf", "wb") as f:
-            #     f.write(generate_pdf_report())
+        user_id = st.text_input("사용자 이름", key="user_id", placeholder="이력을 저장할 이름을 입력하세요")
+        
+        # 예시 결과(분석하지 않은 결과)는 저장하지 않음
+        can_save = bool(user_id) and 'views' in st.session_state.result
+        if st.button("진단 결과 저장", disabled=not can_save):
+            if get_history_store().save(user_id, st.session_state.result):
+                st.success("진단 결과가 이력에 저장되었습니다.")
+            else:
+                st.info("이미 저장된 진단 결과입니다.")
+    
+    with col3:
+        # PDF는 백그라운드에서 만들고 기다리지 않음 (진행 중인 작업은 큐에 남아 다음 재실행에서 확인)
+        if 'views' in st.session_state.result:
+            report_future = get_report_queue().submit(st.session_state.result, analysis_overlays())
+            if not report_future.done():
+                st.caption("PDF 보고서를 만드는 중입니다...")
+                st.button(REPORT_REFRESH_LABEL, key="report_refresh")
+                components.html(report_poll_html(REPORT_POLL_MS, REPORT_REFRESH_LABEL), height=0)
+            elif report_future.exception() is not None:
+                st.caption(f"보고서를 만들지 못했습니다: {report_future.exception()}")
+            else:
+                st.download_button(
+                    "PDF 보고서 다운로드",
+                    data=report_future.result(),
+                    file_name=f"spine_check_result_{datetime.now().strftime('%Y%m%d_%H%M%S')}.pdf",
+                    mime="application/pdf",
+                    key="report_download"
+                )
+        else:
+            st.caption("예시 결과는 보고서를 만들 수 없습니다.")
+    
+    # 한 방향만 다시 촬영 (나머지 방향의 분석 결과는 재사용)
+    if 'analysis' in st.session_state and 'images' in st.session_state:
+        st.markdown("#### 다시 촬영")
+        for column, (view, (step, label)) in zip(st.columns(len(RETAKE_STEPS)), RETAKE_STEPS.items()):
+            with column:
+                if st.button(f"{label} 다시 촬영", key=f"results_retake_{view}"):
+                    st.session_state.images[view] = None
+                    st.session_state.analysis.discard(view)
+                    st.session_state[f'{view}_saved'] = False
+                    st.session_state.retake_view = view
+                    st.session_state.diagnosis_step = step
+                    st.switch_page("pages/01_diagnosis.py")
+    
+    # 촬영 이미지, 분석 이미지, 결과 JSON 내보내기 (버튼을 눌렀을 때만 ZIP 생성, 같은 결과면 재사용)
+    if 'views' in st.session_state.result and 'analysis' in st.session_state and 'images' in st.session_state:
+        if 'export_cache' not in st.session_state:
+            st.session_state.export_cache = ExportCache()
+        view_results, _ = st.session_state.analysis.collect()
+        fingerprint = export_fingerprint(st.session_state.analysis, view_results, st.session_state.result)
+        export_data = st.session_state.export_cache.get(fingerprint)
+        if export_data is None and st.button("이미지와 결과 ZIP 만들기", key="results_export_build"):
+            export_data = st.session_state.export_cache.build(
+                fingerprint, st.session_state.images, view_results, st.session_state.result
+            )
+        if export_data is not None:
+            st.download_button(
+                "이미지와 결과 ZIP 다운로드",
+                data=export_data,
+                file_name=f"spine_check_{st.session_state.result['id']}.zip",
+                mime="application/zip",
+                key="results_export_download"
+            )
     
     st.markdown('</div>', unsafe_allow_html=True)
     
+    # 진단 이력 (저장된 결과의 각도 추이와 목록)
+    if st.session_state.get('user_id'):
+        user_id = st.session_state.user_id
+        with st.expander(f"{user_id}님의 진단 이력"):
+            store = get_history_store()
+            timestamps, angles = store.angle_trend(user_id)
+            
+            if len(angles) == 0:
+                st.caption("저장된 진단 결과가 없습니다.")
+            else:
+                trend = go.Figure()
+                trend.add_trace(go.Scatter(
+                    x=[datetime.fromtimestamp(t) for t in timestamps], y=angles,
+                    mode='lines+markers', name='Cobb 각도', line=dict(color='#1E88E5')
+                ))
+                trend.update_layout(
+                    title="각도 추이", xaxis_title="진단 시각", yaxis_title="각도 (°)",
+                    height=300, margin=dict(l=20, r=20, t=40, b=20)
+                )
+                st.plotly_chart(trend, use_container_width=True)
+                
+                # 키셋 페이지네이션: 이미 불러온 결과는 세션에 두고 '더 보기'로 다음 페이지만 조회
+                history = st.session_state.get('history_rows')
+                if history is None or history['user_id'] != user_id or history['count'] != len(angles):
+                    page = store.list_results(user_id, limit=HISTORY_PAGE_SIZE)
+                    history = {'user_id': user_id, 'count': len(angles),
+                               'records': page.records, 'cursor': page.next_cursor}
+                    st.session_state.history_rows = history
+                
+                st.table([
+                    {
+                        "진단 시각": datetime.fromtimestamp(record['created_at']).strftime("%Y-%m-%d %H:%M"),
+                        "각도": f"{record['angle']}°",
+                        "위험도": record['risk_level']
+                    }
+                    for record in history['records']
+                ])
+                
+                if history['cursor'] is not None and st.button("더 보기", key="history_more"):
+                    page = store.list_results(user_id, limit=HISTORY_PAGE_SIZE, cursor=history['cursor'])
+                    history['records'].extend(page.records)
+                    history['cursor'] = page.next_cursor
+                    st.rerun()
+    
     # 면책조항
     st.info("본 진단 결과는 참고용으로만 사용하시고, 정확한 진단은 반드시 전문의와 상담하세요.")
     
     # 홈으로 버튼
     if st.button("홈으로"):
-        st.switch_page("app.py") 
\ No newline at end of file
+        st.switch_page("app.py")
@@ -10,6 +10,8 @@ from datetime import datetime
 # 상위 디렉토리 경로 추가
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+from assets import asset_html
+
 # 페이지 설정
 st.set_page_config(
     page_title="SpineCheck - 결과 예시",
@@ -138,15 +140,9 @@ if selected_case:
         st.markdown('<div class="result-box">', unsafe_allow_html=True)
         st.markdown('<h2 class="subheader">척추 분석 결과</h2>', unsafe_allow_html=True)
         
-        # 예시 이미지 선택 (심각도에 따른 이미지 변경)
-        if selected_case["risk_level"] == "낮음":
-            image_url = "https://img.freepik.com/free-vector/spine-care-concept-illustration_114360-7160.jpg"
-        elif selected_case["risk_level"] == "중간":
-            image_url = "https://img.freepik.com/free-vector/scoliosis-disease-concept-illustration_114360-7153.jpg"
-        else:
-            image_url = "https://img.freepik.com/free-vector/back-pain-concept-illustration_114360-7163.jpg"
-            
-        st.image(image_url, caption="척추 곡률 분석 결과 (샘플)", use_container_width=True)
+        # 예시 이미지 선택 (심각도에 따른 이미지 변경, 로컬 정적 에셋)
+        st.markdown(asset_html(f"spine_{selected_case['risk_color']}", caption="척추 곡률 분석 결과 (샘플)"),
+                    unsafe_allow_html=True)
         
         # 스파인 곡률 그래프 (시각화)
         st.markdown("### 척추 곡률 시각화")
@@ -1,15 +1,39 @@
 import streamlit as st
-import pandas as pd
-import numpy as np
+import math
 import os
 import sys
-import time
-import random
 from datetime import datetime
 
 # 상위 디렉토리 경로 추가
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+from geocoder import get_geocoder
+from hospital_directory import DAY_TYPES, SPECIALTIES
+from hospital_facets import KST, RATING_THRESHOLDS, day_type
+from hospital_index import get_hospital_index
+from lazy_import import lazy_import
+
+# 지도는 검색 결과가 있을 때만 그리므로 첫 사용 시 import
+go = lazy_import('plotly.graph_objects')
+
+# 한 번에 보여 줄 최대 병원 수 (가까운 순)
+HOSPITAL_RESULT_LIMIT = 30
+
+# 주소 일부만 일치했을 때 안내 문구
+GEOCODE_PRECISION_NOTES = {
+    'interpolated': "건물 번호 사이 추정 위치",
+    'street': "도로/동 중심 위치",
+    'area': "지역 중심 위치"
+}
+
+def format_hours(hospital, moment):
+    """오늘(moment 기준 요일 구분) 진료 시간 문구"""
+    day = DAY_TYPES[day_type(moment)]
+    opens, closes = hospital[f"{day}_open"], hospital[f"{day}_close"]
+    if opens < 0 or closes < 0:
+        return "오늘 휴진 또는 진료 시간 정보 없음"
+    return f"오늘 {opens // 60:02d}:{opens % 60:02d}~{closes // 60:02d}:{closes % 60:02d}"
+
 # 페이지 설정
 st.set_page_config(
     page_title="SpineCheck - 주변 병원 찾기",
@@ -74,60 +98,6 @@ st.markdown("""
 # 헤더
 st.markdown('<h1 class="header">주변 병원 찾기</h1>', unsafe_allow_html=True)
 
-# 가상의 샘플 병원 데이터 생성 함수
-def generate_sample_hospitals(user_lat, user_lon, count=10):
-    # 병원 이름 목록
-    hospital_names = [
-        "바른척추병원", "튼튼정형외과의원", "건강한의원", 
-        "척추전문병원", "연세정형외과", "미소정형외과",
-        "서울척추병원", "대학병원정형외과", "척추관절센터",
-        "바른자세의원", "현대정형외과", "척추신경외과"
-    ]
-    
-    # 병원 주소 목록
-    addresses = [
-        "서울시 강남구 삼성동", "서울시 서초구 서초동", "서울시 송파구 잠실동", 
-        "서울시 강남구 역삼동", "서울시 마포구 홍대동", "서울시 종로구 종로동",
-        "서울시 영등포구 여의도동", "서울시 중구 명동", "서울시 강동구 천호동",
-        "서울시 성북구 안암동", "서울시 동작구 상도동", "서울시 광진구 건대입구"
-    ]
-    
-    # 랜덤 위치 생성 (사용자 위치 주변)
-    hospitals = []
-    for i in range(count):
-        # 랜덤 위치 생성 (사용자 위치 주변)
-        lat_offset = random.uniform(-0.01, 0.01)
-        lon_offset = random.uniform(-0.01, 0.01)
-        
-        lat = user_lat + lat_offset
-        lon = user_lon + lon_offset
-        
-        # 거리 계산 (간단한 근사치)
-        distance = np.sqrt(lat_offset**2 + lon_offset**2) * 111  # 1도는 약 111km
-        
-        # 병원 정보 생성
-        hospital_name = f"{hospital_names[i % len(hospital_names)]}" if i < len(hospital_names) else f"{hospital_names[i % len(hospital_names)]} {i//len(hospital_names)+1}"
-        address = f"{addresses[i % len(addresses)]} {random.randint(100, 999)}번지"
-        phone = f"02-{random.randint(1000, 9999)}-{random.randint(1000, 9999)}"
-        rating = round(random.uniform(3.0, 5.0), 1)
-        
-        hospitals.append({
-            "id": i+1,
-            "name": hospital_name,
-            "lat": lat,
-            "lon": lon,
-            "address": address,
-            "phone": phone,
-            "rating": rating,
-            "distance": round(distance, 2),
-            "reviews": random.randint(5, 100)
-        })
-    
-    # 거리 순으로 정렬
-    hospitals.sort(key=lambda x: x["distance"])
-    
-    return pd.DataFrame(hospitals)
-
 # 위치 정보 입력 섹션
 st.markdown('<h2 class="subheader">내 위치 입력</h2>', unsafe_allow_html=True)
 
@@ -155,51 +125,101 @@ else:
     address_input = st.text_input("주소 입력", "서울특별시 강남구")
     
     if address_input:
-        # 실제 앱에서는 지오코딩 API를 사용하여 주소를 좌표로 변환
-        # 여기서는 샘플 데이터 사용
-        user_location["lat"] = 37.498095 + random.uniform(-0.005, 0.005)
-        user_location["lon"] = 127.027610 + random.uniform(-0.005, 0.005)
-        user_location["address"] = address_input
-        
-        st.success("입력하신 주소의 좌표를 가져왔습니다.")
+        # 로컬 주소 데이터로 좌표 변환 (외부 지오코딩 서비스 사용 안 함)
+        geocoded = get_geocoder().geocode(address_input)
+        if geocoded is not None:
+            user_location["lat"] = geocoded.lat
+            user_location["lon"] = geocoded.lon
+            user_location["address"] = geocoded.address
+            
+            st.success("입력하신 주소의 좌표를 가져왔습니다.")
+            if geocoded.precision in GEOCODE_PRECISION_NOTES:
+                st.info(f"위치: {geocoded.address} ({GEOCODE_PRECISION_NOTES[geocoded.precision]})")
+            else:
+                st.info(f"위치: {geocoded.address}")
+        else:
+            st.error("입력하신 주소를 찾을 수 없습니다.")
+            suggestions = get_geocoder().suggest(address_input)
+            if suggestions:
+                st.caption("비슷한 주소: " + ", ".join(suggestions))
 
 # 검색 반경 설정
 search_radius = st.slider("검색 반경 (km)", min_value=1, max_value=10, value=3)
 
-# 전문 분야 필터
+# 병원 데이터 (처음 한 번만 열고 프로세스 전체에서 공유)
+hospital_index = get_hospital_index()
+
+# 전문 분야 필터 (선택한 분야 중 하나라도 있는 병원, 선택하지 않으면 전체)
 specialty_filter = st.multiselect(
     "전문 분야 필터",
-    ["정형외과", "척추전문", "재활의학과", "통증의학과", "신경외과"],
+    SPECIALTIES,
     default=["정형외과", "척추전문"]
 )
 
+filter_col1, filter_col2 = st.columns(2)
+
+with filter_col1:
+    # 평점 필터 (공공 데이터처럼 평점이 없으면 비활성화)
+    rating_filter = st.selectbox(
+        "최소 평점",
+        [None] + list(RATING_THRESHOLDS),
+        format_func=lambda value: "전체" if value is None else f"{value:.1f} 이상",
+        disabled=not hospital_index.facets.has_ratings
+    )
+
+with filter_col2:
+    # 진료 중 필터 (진료 시간 정보가 없으면 비활성화)
+    open_now_filter = st.checkbox(
+        "지금 진료 중인 병원만",
+        disabled=not hospital_index.facets.has_hours,
+        help="현재 시각(한국 시간)이 포함된 30분 동안 계속 진료하는 병원만 표시합니다. 공휴일은 구분하지 않습니다."
+    )
+
 # 검색 버튼
 if user_location["lat"] and user_location["lon"]:
     if st.button("주변 병원 검색", type="primary"):
         with st.spinner("주변 병원을 검색 중입니다..."):
-            # 샘플 병원 데이터 생성
-            hospitals_df = generate_sample_hospitals(
-                user_location["lat"], 
+            now = datetime.now(KST)
+            # 공간 인덱스로 반경 안 병원 중 조건(비트맵 인덱스)을 만족하는 병원을 거리순으로 검색
+            hospitals_df = hospital_index.search(
+                user_location["lat"],
                 user_location["lon"],
-                count=10
+                search_radius,
+                limit=HOSPITAL_RESULT_LIMIT,
+                specialties=specialty_filter,
+                min_rating=rating_filter,
+                open_at=now if open_now_filter else None
             )
             
-            # 검색 반경 필터링
-            hospitals_df = hospitals_df[hospitals_df["distance"] <= search_radius]
-            
             # 맵 표시 (실제 앱에서는 folium 또는 mapbox 등으로 구현)
             st.markdown('<h2 class="subheader">병원 위치</h2>', unsafe_allow_html=True)
             
-            # 지도 표시 (실제 앱에서는 지도 API 사용)
+            # 지도 표시 (외부 지도 타일 없이 위경도 좌표에 현재 위치와 병원을 표시)
             st.markdown("<h3>지도</h3>", unsafe_allow_html=True)
-            st.image("https://img.freepik.com/free-vector/city-map-with-street-navigation-GPS-scheme_107791-1365.jpg", 
-                    caption="지도 (실제 앱에서는 실시간 지도로 표시됩니다)", use_container_width=True)
+            hospital_map = go.Figure()
+            hospital_map.add_trace(go.Scatter(
+                x=hospitals_df["lon"], y=hospitals_df["lat"], mode='markers',
+                marker=dict(size=12, color='#1E88E5'), name='병원',
+                text=hospitals_df["name"] + "<br>" + hospitals_df["distance"].astype(str) + " km",
+                hoverinfo='text'
+            ))
+            hospital_map.add_trace(go.Scatter(
+                x=[user_location["lon"]], y=[user_location["lat"]], mode='markers',
+                marker=dict(size=16, color='#F44336', symbol='star'), name='현재 위치', hoverinfo='name'
+            ))
+            hospital_map.update_layout(
+                xaxis_title="경도", yaxis_title="위도", height=400,
+                margin=dict(l=20, r=20, t=20, b=20), plot_bgcolor='#F5F5F5'
+            )
+            # 위도 1도와 경도 1도의 실제 거리 비율을 맞춰 방향과 거리가 왜곡되지 않게 표시
+            hospital_map.update_yaxes(scaleanchor='x', scaleratio=1 / math.cos(math.radians(user_location["lat"])))
+            st.plotly_chart(hospital_map, use_container_width=True)
             
             # 병원 목록 표시
             st.markdown('<h2 class="subheader">주변 병원 목록</h2>', unsafe_allow_html=True)
             
             if hospitals_df.empty:
-                st.warning(f"검색 반경 {search_radius}km 내에 병원을 찾을 수 없습니다.")
+                st.warning(f"검색 반경 {search_radius}km 내에 조건에 맞는 병원을 찾을 수 없습니다.")
             else:
                 st.success(f"{len(hospitals_df)}개의 병원을 찾았습니다.")
                 
@@ -211,6 +231,7 @@ if user_location["lat"] and user_location["lon"]:
                     st.markdown(f'<div class="hospital-name">{hospital["name"]}</div>', unsafe_allow_html=True)
                     st.markdown(f'<div class="hospital-address">{hospital["address"]}</div>', unsafe_allow_html=True)
                     st.markdown(f'<div class="hospital-phone">☎ {hospital["phone"]}</div>', unsafe_allow_html=True)
+                    st.markdown(f'<div class="hospital-address">🕘 {format_hours(hospital, now)}</div>', unsafe_allow_html=True)
                     
                     col1, col2 = st.columns(2)
                     
@@ -218,7 +239,11 @@ if user_location["lat"] and user_location["lon"]:
                         st.markdown(f'<div class="hospital-distance">🚶‍♂️ {hospital["distance"]} km</div>', unsafe_allow_html=True)
                     
                     with col2:
-                        st.markdown(f'<div class="hospital-rating">⭐ {hospital["rating"]} ({hospital["reviews"]}건의 리뷰)</div>', unsafe_allow_html=True)
+                        # 공공 데이터에는 평점이 없을 수 있음
+                        if math.isnan(hospital["rating"]):
+                            st.markdown(f'<div class="hospital-rating">평점 정보 없음</div>', unsafe_allow_html=True)
+                        else:
+                            st.markdown(f'<div class="hospital-rating">⭐ {hospital["rating"]:.1f} ({hospital["reviews"]}건의 리뷰)</div>', unsafe_allow_html=True)
                     
                     btn_col1, btn_col2 = st.columns(2)
                     
@@ -232,8 +257,8 @@ if user_location["lat"] and user_location["lon"]:
                 
                 # 전체 병원 목록 (테이블로 표시)
                 with st.expander("전체 병원 목록 보기"):
-                    view_df = hospitals_df[["name", "address", "phone", "rating", "distance"]].copy()
-                    view_df.columns = ["병원명", "주소", "전화번호", "평점", "거리(km)"]
+                    view_df = hospitals_df[["name", "address", "phone", "specialties", "rating", "distance"]].copy()
+                    view_df.columns = ["병원명", "주소", "전화번호", "진료과목", "평점", "거리(km)"]
                     st.dataframe(view_df, use_container_width=True)
 else:
     st.warning("위치 정보를 가져올 수 없습니다. 주소를 정확히 입력하시거나 위치 접근을 허용해주세요.")
@@ -0,0 +1,359 @@
+"""
+백그라운드 이미지 분석
+
+촬영/업로드된 각 이미지를 저장하는 즉시 공유 스레드 풀에 분석 작업으로 제출하고,
+단계별 진행 상황을 노출하여 진단 페이지가 실제 처리 상태를 표시할 수 있게 한다.
+"""
+import os
+import threading
+import uuid
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+
+from image_processing import analyze_image, assess_risk
+from analysis_cache import get_analysis_cache, make_cache_key
+from cobb_angle import SOLVER_VERSION
+from spine_detector import detector_cache_token, get_detector
+
+# 촬영 방향 (st.session_state.images 키)
+VIEW_TYPES = ('back', 'side', 'front')
+
+# 대표 각도를 측정하는 촬영 방향 (관상면 Cobb 각도는 후면에서 측정)
+PRIMARY_VIEW = 'back'
+
+# 분석 단계 (단계 키, 진행 중 표시 문구)
+ANALYSIS_STAGES = [
+    ('preprocess', "이미지 전처리 중..."),
+    ('detect', "척추 포인트 검출 중..."),
+    ('angle', "측만 각도 계산 중..."),
+    ('overlay', "결과 생성 중...")
+]
+
+# 분석 이미지 크기 (높이, 너비)
+TARGET_SIZE = (480, 640)
+
+class AnalysisJob:
+    """
+    한 장의 이미지에 대한 분석 작업
+
+    워커 스레드가 단계를 마칠 때마다 completed_stages를 증가시키며,
+    스크립트 스레드는 progress/status_text로 진행 상황을 읽는다.
+    """
+
+    def __init__(self, view, image, target_size=TARGET_SIZE):
+        self.view = view
+        self.image = image
+        self.target_size = tuple(target_size)
+        self.key = make_cache_key(image, target_size=self.target_size, solver=SOLVER_VERSION,
+                                  detector=detector_cache_token())
+        self.completed_stages = 0
+        self.future = None
+
+    @property
+    def progress(self):
+        """완료된 단계 비율 (0.0 ~ 1.0)"""
+        return self.completed_stages / len(ANALYSIS_STAGES)
+
+    @property
+    def status_text(self):
+        """현재 진행 중인 단계 문구"""
+        if self.completed_stages >= len(ANALYSIS_STAGES):
+            return "분석 완료"
+        return ANALYSIS_STAGES[self.completed_stages][1]
+
+    def done(self):
+        return self.future is not None and self.future.done()
+
+    def failed(self):
+        return self.done() and self.future.exception() is not None
+
+    def result(self, timeout=None):
+        return self.future.result(timeout)
+
+    def run(self):
+        """
+        분석 실행 (워커 스레드에서 호출)
+
+        Returns:
+            분석 결과 딕셔너리 (points, angle, overlay)
+        """
+        cache = get_analysis_cache()
+
+        try:
+            return self._run(cache)
+        finally:
+            # 분석이 끝난 원본은 더 이상 필요 없으므로 참조 해제
+            self.image = None
+
+    def _run(self, cache):
+        # 같은 이미지를 이미 분석했다면 바로 반환
+        cached = cache.get(self.key)
+        if cached is not None:
+            self.completed_stages = len(ANALYSIS_STAGES)
+            return cached
+
+        # 단계를 마칠 때마다 진행 상황 갱신 (ANALYSIS_STAGES 순서)
+        result = analyze_image(self.image, self.target_size, with_overlay=True,
+                               on_stage=lambda completed: setattr(self, 'completed_stages', completed))
+        if result is None:
+            raise ValueError(f"{self.view} 이미지를 분석할 수 없습니다")
+
+        cache.put(self.key, result)
+        return result
+
+_executor = None
+_executor_lock = threading.Lock()
+
+def get_executor():
+    """
+    프로세스 전체에서 공유하는 분석 스레드 풀 반환
+
+    OpenCV 연산은 GIL을 해제하므로 스레드만으로도 여러 코어를 사용한다.
+    세 촬영 방향이 서로를 기다리지 않도록 워커는 최소 촬영 방향 수만큼 둔다.
+    SPINECHECK_ANALYSIS_WORKERS 환경 변수로 워커 수를 지정할 수 있다.
+    """
+    global _executor
+
+    with _executor_lock:
+        if _executor is None:
+            workers = (
+                int(os.environ.get('SPINECHECK_ANALYSIS_WORKERS', 0))
+                or max(len(VIEW_TYPES), min(4, os.cpu_count() or 1))
+            )
+            _executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='spinecheck-analysis')
+        return _executor
+
+def warm_up_detector():
+    """
+    검출 모델을 백그라운드에서 미리 로드
+
+    프로세스당 한 번만 로드되므로 여러 번 호출해도 비용이 없다.
+    사용자가 촬영하는 동안 로드를 마쳐 첫 분석이 모델 로드를 기다리지 않게 한다.
+    """
+    return get_executor().submit(get_detector)
+
+def submit_analysis(view, image, previous=None):
+    """
+    이미지 분석 작업을 백그라운드에 제출
+
+    Args:
+        view: 촬영 방향 ('back', 'side', 'front')
+        image: 분석할 OpenCV 이미지
+        previous: 같은 촬영 방향의 이전 작업 (같은 이미지이면 재사용)
+
+    Returns:
+        AnalysisJob
+    """
+    job = AnalysisJob(view, image)
+
+    # Streamlit 재실행마다 같은 업로드 파일이 다시 들어오므로 동일 이미지는 재제출하지 않음
+    # (실패한 작업은 다시 실행)
+    if previous is not None and previous.key == job.key and not previous.failed():
+        return previous
+
+    job.future = get_executor().submit(job.run)
+    return job
+
+def completed_analysis(view, image, result):
+    """
+    이미 분석된 결과로 완료 상태의 작업 생성 (실시간 영상 모드에서 평활화된 결과를 사용할 때)
+
+    Args:
+        view: 촬영 방향 ('back', 'side', 'front')
+        image: 결과에 해당하는 OpenCV 이미지
+        result: 분석 결과 딕셔너리 (points, angle, segments, overlay)
+
+    Returns:
+        완료된 AnalysisJob
+    """
+    job = AnalysisJob(view, image)
+    job.image = None
+    job.completed_stages = len(ANALYSIS_STAGES)
+    job.future = Future()
+    job.future.set_result(result)
+    return job
+
+def overall_progress(jobs):
+    """
+    여러 작업의 전체 진행률
+
+    Args:
+        jobs: AnalysisJob 목록
+
+    Returns:
+        진행률 (0.0 ~ 1.0)
+    """
+    jobs = [job for job in jobs if job is not None]
+    if not jobs:
+        return 0.0
+    return sum(job.progress for job in jobs) / len(jobs)
+
+def build_result(view_results):
+    """
+    촬영 방향별 분석 결과를 결과 페이지 형식(st.session_state.result)으로 병합
+
+    Args:
+        view_results: {촬영 방향: 분석 결과 딕셔너리}
+
+    Returns:
+        결과 딕셔너리 (id, angle, risk_level, risk_color, recommendations, views)
+    """
+    views = {
+        view: {
+            'points': [tuple(map(int, p)) for p in result['points']],
+            'angle': round(result['angle'], 1),
+            'segments': [
+                {'upper': s['upper'], 'lower': s['lower'], 'angle': round(s['angle'], 1)}
+                for s in result.get('segments', [])
+            ]
+        }
+        for view, result in view_results.items()
+        if result is not None
+    }
+
+    if PRIMARY_VIEW in views:
+        angle = views[PRIMARY_VIEW]['angle']
+    else:
+        angle = max((v['angle'] for v in views.values()), default=0.0)
+
+    result = {'id': uuid.uuid4().hex, 'angle': angle}
+    result.update(assess_risk(angle))
+    result['views'] = views
+    return result
+
+class ViewAnalysisOrchestrator:
+    """
+    촬영 방향별 분석 작업 관리 (st.session_state.analysis)
+
+    각 방향의 이미지는 저장 즉시 공유 스레드 풀에 제출되어 동시에 분석되므로,
+    전체 대기 시간은 세 방향의 합이 아니라 가장 느린 방향의 시간이다.
+    모든 작업이 끝나면 결과 페이지 형식(build_result)으로 병합한다.
+
+    방향별 결과는 작업 키(이미지 내용 + 파라미터)로 추적한다. 한 방향만 다시 촬영하면
+    그 방향만 다시 분석하고, 병합 결과는 방향별 키가 바뀌었을 때만 다시 만든다.
+    """
+
+    def __init__(self, views=VIEW_TYPES):
+        self.jobs = {view: None for view in views}
+        # 다시 촬영으로 내려간 작업 (같은 이미지가 다시 들어오면 재사용)
+        self._retired = {}
+        # (병합에 사용한 방향별 키, 병합 결과)
+        self._merged = None
+
+    def submit(self, view, image):
+        """
+        방향별 분석 제출 (같은 이미지의 작업이 이미 있으면 재사용)
+
+        Returns:
+            AnalysisJob
+        """
+        previous = self.jobs.get(view) or self._retired.get(view)
+        self.jobs[view] = submit_analysis(view, image, previous=previous)
+        return self.jobs[view]
+
+    def complete(self, view, image, result):
+        """이미 분석된 결과로 방향의 작업을 채움 (실시간 영상 모드)"""
+        self.jobs[view] = completed_analysis(view, image, result)
+        return self.jobs[view]
+
+    def discard(self, view):
+        """방향의 작업 삭제 (다시 촬영, 다른 방향의 작업과 결과는 유지)"""
+        if self.jobs.get(view) is not None:
+            self._retired[view] = self.jobs[view]
+        self.jobs[view] = None
+
+    def dependencies(self):
+        """
+        병합 결과가 의존하는 방향별 작업 키
+
+        Returns:
+            {촬영 방향: 작업 키}
+        """
+        return {view: job.key for view, job in self.jobs.items() if job is not None}
+
+    def submit_missing(self, images):
+        """
+        이미지는 있지만 작업이 없는 방향을 모두 제출
+
+        Args:
+            images: {촬영 방향: OpenCV 이미지 또는 None}
+        """
+        for view, image in images.items():
+            if image is not None and self.jobs.get(view) is None:
+                self.submit(view, image)
+
+    @property
+    def active_jobs(self):
+        return [job for job in self.jobs.values() if job is not None]
+
+    @property
+    def progress(self):
+        """전체 진행률 (0.0 ~ 1.0)"""
+        return overall_progress(self.active_jobs)
+
+    @property
+    def status_text(self):
+        """가장 늦은 작업의 현재 단계 문구"""
+        pending = [job for job in self.active_jobs if not job.done()]
+        if not pending:
+            return "분석 완료"
+        return min(pending, key=lambda job: job.completed_stages).status_text
+
+    def done(self):
+        return all(job.done() for job in self.active_jobs)
+
+    def wait(self, timeout=None):
+        """
+        작업 하나가 끝나거나 timeout이 지날 때까지 대기
+
+        Returns:
+            모든 작업이 끝났으면 True
+        """
+        pending = [job.future for job in self.active_jobs if not job.done()]
+        if pending:
+            wait(pending, timeout=timeout, return_when=FIRST_COMPLETED)
+        return self.done()
+
+    def collect(self):
+        """
+        끝난 작업의 결과 수집
+
+        Returns:
+            ({촬영 방향: 분석 결과}, [오류 문구])
+        """
+        view_results = {}
+        errors = []
+        for view, job in self.jobs.items():
+            if job is None or not job.done():
+                continue
+            try:
+                view_results[view] = job.result()
+            except Exception as e:
+                errors.append(f"{view}: {e}")
+        return view_results, errors
+
+    def merge(self):
+        """
+        모든 방향의 결과를 결과 페이지 형식으로 병합 (모든 작업이 끝날 때까지 대기)
+
+        방향별 키가 지난 병합 때와 같으면 이전 병합 결과(같은 id)를 그대로 반환한다.
+
+        Returns:
+            build_result 결과 딕셔너리
+
+        Raises:
+            RuntimeError: 분석에 실패한 방향이 있거나 결과가 없는 경우
+        """
+        dependencies = self.dependencies()
+        if self._merged is not None and self._merged[0] == dependencies:
+            return self._merged[1]
+
+        while not self.wait():
+            pass
+
+        view_results, errors = self.collect()
+        if errors or not view_results:
+            raise RuntimeError("; ".join(errors) or "분석할 이미지가 없습니다")
+
+        result = build_result(view_results)
+        self._merged = (dependencies, result)
+        return result
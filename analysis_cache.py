@@ -0,0 +1,251 @@
+"""
+이미지 분석 결과 캐시
+
+디코딩된 이미지 바이트와 파이프라인 파라미터(target_size 등)의 해시를 키로
+분석 결과(척추 포인트, Cobb 각도, 오버레이 이미지)를 저장한다.
+메모리 LRU 계층과 선택적인 디스크 계층(용량 기반 삭제)으로 구성된다.
+"""
+import hashlib
+import os
+import pickle
+import tempfile
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+# 기본 캐시 크기
+DEFAULT_MAX_ENTRIES = 128
+DEFAULT_MAX_DISK_BYTES = 256 * 1024 * 1024
+
+# 디스크 캐시 파일 확장자
+_DISK_SUFFIX = '.pkl'
+
+def make_cache_key(image, **params):
+    """
+    이미지 내용과 파이프라인 파라미터로 캐시 키 생성
+
+    Args:
+        image: 디코딩된 이미지 배열
+        **params: 파이프라인 파라미터 (예: target_size)
+
+    Returns:
+        SHA-256 16진수 문자열
+    """
+    image = np.ascontiguousarray(image)
+
+    digest = hashlib.sha256()
+    # 같은 바이트라도 형태가 다르면 다른 이미지로 취급
+    digest.update(f"{image.dtype.str}|{image.shape}|".encode())
+    digest.update(memoryview(image).cast('B'))
+    digest.update(repr(sorted(params.items())).encode())
+
+    return digest.hexdigest()
+
+class AnalysisCache:
+    """
+    메모리 LRU + 디스크 2단계 분석 결과 캐시
+
+    Args:
+        max_entries: 메모리에 유지할 최대 항목 수
+        cache_dir: 디스크 캐시 디렉토리 (None이면 디스크 계층 사용 안 함)
+        max_disk_bytes: 디스크 캐시 최대 용량 (초과 시 오래 사용하지 않은 항목부터 삭제)
+    """
+
+    def __init__(self, max_entries=DEFAULT_MAX_ENTRIES, cache_dir=None, max_disk_bytes=DEFAULT_MAX_DISK_BYTES):
+        self.max_entries = max_entries
+        self.cache_dir = cache_dir
+        self.max_disk_bytes = max_disk_bytes
+
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._disk_hits = 0
+        self._misses = 0
+
+        self._disk_bytes = 0
+        if cache_dir is not None:
+            os.makedirs(cache_dir, exist_ok=True)
+            self._disk_bytes = sum(size for _, size, _ in self._scan_disk())
+
+    def get(self, key):
+        """
+        캐시된 결과 조회 (메모리 → 디스크 순)
+
+        Args:
+            key: 캐시 키
+
+        Returns:
+            캐시된 결과 (없으면 None)
+        """
+        with self._lock:
+            value = self._memory.get(key)
+            if value is not None:
+                self._memory.move_to_end(key)
+                self._hits += 1
+                return value
+
+        value = self._read_disk(key)
+
+        with self._lock:
+            if value is None:
+                self._misses += 1
+                return None
+
+            self._disk_hits += 1
+            self._put_memory(key, value)
+            return value
+
+    def put(self, key, value):
+        """
+        결과를 캐시에 저장
+
+        Args:
+            key: 캐시 키
+            value: 저장할 결과
+        """
+        with self._lock:
+            self._put_memory(key, value)
+
+        if self.cache_dir is not None:
+            self._write_disk(key, value)
+
+    def stats(self):
+        """
+        캐시 적중 통계
+
+        Returns:
+            통계 딕셔너리 (hits, disk_hits, misses, hit_rate, entries, disk_bytes)
+        """
+        with self._lock:
+            total = self._hits + self._disk_hits + self._misses
+            return {
+                'hits': self._hits,
+                'disk_hits': self._disk_hits,
+                'misses': self._misses,
+                'hit_rate': (self._hits + self._disk_hits) / total if total else 0.0,
+                'entries': len(self._memory),
+                'disk_bytes': self._disk_bytes
+            }
+
+    def clear(self):
+        """메모리와 디스크 캐시를 모두 비우고 통계 초기화"""
+        with self._lock:
+            self._memory.clear()
+            self._hits = self._disk_hits = self._misses = 0
+
+            if self.cache_dir is not None:
+                for path, _, _ in self._scan_disk():
+                    _remove_quietly(path)
+                self._disk_bytes = 0
+
+    def _put_memory(self, key, value):
+        # 호출자가 self._lock을 잡고 있어야 함
+        self._memory[key] = value
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+    def _disk_path(self, key):
+        return os.path.join(self.cache_dir, key + _DISK_SUFFIX)
+
+    def _scan_disk(self):
+        """디스크 캐시 파일 목록 ((경로, 크기, 최근 사용 시각) 리스트)"""
+        entries = []
+        for entry in os.scandir(self.cache_dir):
+            if entry.name.endswith(_DISK_SUFFIX):
+                try:
+                    stat = entry.stat()
+                except FileNotFoundError:
+                    continue
+                entries.append((entry.path, stat.st_size, stat.st_mtime))
+        return entries
+
+    def _read_disk(self, key):
+        if self.cache_dir is None:
+            return None
+
+        path = self._disk_path(key)
+        try:
+            with open(path, 'rb') as f:
+                value = pickle.load(f)
+        except FileNotFoundError:
+            return None
+        except Exception:
+            # 손상된 캐시 파일은 삭제하고 캐시 미스로 처리
+            _remove_quietly(path)
+            return None
+
+        # 최근 사용 시각 갱신 (삭제 순서 결정에 사용)
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+
+        return value
+
+    def _write_disk(self, key, value):
+        path = self._disk_path(key)
+
+        # 임시 파일에 쓴 뒤 교체하여 다른 프로세스가 반쯤 쓰인 파일을 읽지 않도록 함
+        fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL)
+            size = os.path.getsize(tmp_path)
+            # 같은 키의 파일을 덮어쓰면 기존 파일 크기만큼 사용량에서 뺌
+            try:
+                previous = os.path.getsize(path)
+            except OSError:
+                previous = 0
+            os.replace(tmp_path, path)
+        except Exception:
+            _remove_quietly(tmp_path)
+            raise
+
+        with self._lock:
+            self._disk_bytes += size - previous
+            if self._disk_bytes > self.max_disk_bytes:
+                self._evict_disk()
+
+    def _evict_disk(self):
+        # 호출자가 self._lock을 잡고 있어야 함
+        entries = sorted(self._scan_disk(), key=lambda entry: entry[2])
+        total = sum(size for _, size, _ in entries)
+
+        for path, size, _ in entries:
+            if total <= self.max_disk_bytes:
+                break
+            _remove_quietly(path)
+            total -= size
+
+        self._disk_bytes = total
+
+def _remove_quietly(path):
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
+_default_cache = None
+_default_cache_lock = threading.Lock()
+
+def get_analysis_cache():
+    """
+    프로세스 전체에서 공유하는 기본 분석 캐시 반환
+
+    SPINECHECK_CACHE_DIR 환경 변수가 설정되어 있으면 해당 디렉토리를 디스크 계층으로 사용하고,
+    SPINECHECK_CACHE_MAX_BYTES로 디스크 용량 한도를 지정할 수 있다.
+
+    Returns:
+        AnalysisCache 인스턴스
+    """
+    global _default_cache
+
+    with _default_cache_lock:
+        if _default_cache is None:
+            _default_cache = AnalysisCache(
+                cache_dir=os.environ.get('SPINECHECK_CACHE_DIR') or None,
+                max_disk_bytes=int(os.environ.get('SPINECHECK_CACHE_MAX_BYTES', DEFAULT_MAX_DISK_BYTES))
+            )
+        return _default_cache
@@ -1,6 +1,8 @@
 import streamlit as st
 import os
 
+from assets import asset_html
+
 # 파일 감시 기능 비활성화
 os.environ['STREAMLIT_SERVER_MAX_UPLOAD_SIZE'] = '0'
 os.environ['STREAMLIT_SERVER_FILE_WATCHER_TYPE'] = 'none'
@@ -64,10 +66,8 @@ st.markdown("""
 st.markdown('<h1 class="main-header">SpineCheck</h1>', unsafe_allow_html=True)
 st.markdown('<h2 class="sub-header">스마트폰으로 1분만에 척추측만증 진단하기</h2>', unsafe_allow_html=True)
 
-# 메인 이미지
-# 이미지 파일이 없으므로 텍스트로 대체
-st.image("https://img.freepik.com/free-vector/spine-health-concept-illustration_114360-7155.jpg", 
-         caption="척추 건강 관리 (샘플 이미지)")
+# 메인 이미지 (로컬 정적 에셋)
+st.markdown(asset_html('hero', caption="척추 건강 관리"), unsafe_allow_html=True)
 
 # 3가지 주요 기능 소개
 st.markdown('### 주요 기능')
@@ -0,0 +1,78 @@
+"""
+정적 이미지 에셋 조회
+
+build_assets.py가 만든 static/manifest.json을 읽어 에셋 이름을 정적 파일 URL로 바꾼다.
+이미지는 Streamlit 정적 파일 서빙(/app/static/)으로 브라우저가 직접 받아 오므로
+페이지를 다시 그릴 때 이미지 바이트가 웹소켓으로 전송되지 않고, 외부 네트워크도 필요 없다.
+"""
+import html
+import json
+import os
+import threading
+
+STATIC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'static')
+MANIFEST_NAME = 'manifest.json'
+
+# Streamlit 정적 파일 서빙 경로 (페이지 기준 상대 경로)
+STATIC_URL_PREFIX = 'app/static/'
+
+_manifest = None
+_manifest_lock = threading.Lock()
+
+def load_manifest(static_dir=STATIC_DIR):
+    """
+    에셋 매니페스트 (프로세스당 한 번 읽음)
+
+    Returns:
+        {이름: {'file', 'hash', 'width', 'height'}}
+    """
+    global _manifest
+
+    with _manifest_lock:
+        if _manifest is None:
+            path = os.path.join(static_dir, MANIFEST_NAME)
+            if not os.path.exists(path):
+                raise FileNotFoundError(f"에셋 매니페스트가 없습니다: {path} (python build_assets.py로 생성)")
+            with open(path, encoding='utf-8') as f:
+                _manifest = json.load(f)
+        return _manifest
+
+def asset_path(name):
+    """에셋 파일 경로"""
+    return os.path.join(STATIC_DIR, load_manifest()[name]['file'])
+
+def asset_url(name):
+    """
+    에셋 URL
+
+    파일 이름의 해시로 내용이 바뀌면 URL이 바뀌고, 버전 인자(v)가 있으면 정적 파일 서버가
+    장기 캐시 헤더(Cache-Control max-age)를 붙인다.
+    """
+    entry = load_manifest()[name]
+    return f"{STATIC_URL_PREFIX}{entry['file']}?v={entry['hash']}"
+
+def asset_html(name, caption=None, width=None):
+    """
+    에셋 이미지 HTML (st.markdown(..., unsafe_allow_html=True)로 표시)
+
+    Args:
+        name: 에셋 이름
+        caption: 이미지 설명 (None이면 생략)
+        width: 표시 너비 (픽셀, None이면 컨테이너 너비)
+
+    Returns:
+        HTML 문자열
+    """
+    entry = load_manifest()[name]
+    style = f"width:{width}px;max-width:100%" if width else "width:100%"
+    alt = html.escape(caption or name)
+    markup = (
+        f'<img src="{asset_url(name)}" alt="{alt}" width="{entry["width"]}" height="{entry["height"]}" '
+        f'style="{style};height:auto" loading="lazy">'
+    )
+    if caption:
+        markup += (
+            f'<p style="text-align:center;color:rgba(49,51,63,0.6);font-size:14px;margin-top:0.25rem">'
+            f'{html.escape(caption)}</p>'
+        )
+    return f'<div style="text-align:center">{markup}</div>'
@@ -0,0 +1,270 @@
+"""
+오프라인 일괄 진단 CLI
+
+촬영 이미지 디렉토리를 순회하며 대상자별(후면/측면/전면) 분석을 멀티프로세스로 수행하고
+대상자당 한 행씩 CSV 또는 Parquet 파일로 스트리밍 저장한다.
+
+사용 예:
+    python batch_diagnosis.py screening/ -o results.csv --workers 8
+
+디렉토리 구조는 다음 두 가지를 모두 지원한다.
+    screening/<대상자ID>/back.jpg, side.jpg, front.jpg
+    screening/<대상자ID>_back.jpg, <대상자ID>_side.jpg, <대상자ID>_front.jpg
+"""
+import argparse
+import csv
+import multiprocessing
+import os
+import sys
+import time
+
+from image_processing import load_image, analyze_image, assess_risk
+from analysis import VIEW_TYPES, TARGET_SIZE
+from frame_quality import assess_frame_quality
+from spine_detector import format_metrics, merge_metric_snapshots
+
+# 지원하는 이미지 확장자
+IMAGE_EXTENSIONS = ('.jpg', '.jpeg', '.png')
+
+# 결과 파일 컬럼
+RESULT_COLUMNS = [
+    'subject_id',
+    'back_angle',
+    'side_angle',
+    'front_angle',
+    'angle',
+    'risk_level',
+    'error'
+]
+
+def find_subjects(root):
+    """
+    디렉토리를 순회하여 대상자별 이미지 경로 수집
+
+    Args:
+        root: 촬영 이미지 최상위 디렉토리
+
+    Returns:
+        (대상자 ID, {촬영 방향: 이미지 경로}) 튜플 리스트 (대상자 ID 순 정렬)
+    """
+    subjects = {}
+
+    for dirpath, _, filenames in os.walk(root):
+        for filename in filenames:
+            stem, ext = os.path.splitext(filename)
+            if ext.lower() not in IMAGE_EXTENSIONS:
+                continue
+
+            stem = stem.lower()
+            for view in VIEW_TYPES:
+                if stem == view:
+                    # <대상자ID>/back.jpg 형식
+                    subject_id = os.path.relpath(dirpath, root)
+                elif stem.endswith(f'_{view}') or stem.endswith(f'-{view}'):
+                    # <대상자ID>_back.jpg 형식
+                    prefix = os.path.splitext(filename)[0][:-len(view) - 1]
+                    subject_id = os.path.normpath(os.path.join(os.path.relpath(dirpath, root), prefix))
+                else:
+                    continue
+
+                subjects.setdefault(subject_id, {})[view] = os.path.join(dirpath, filename)
+                break
+
+    return sorted(subjects.items())
+
+def analyze_subject(subject):
+    """
+    대상자 한 명의 이미지들을 분석 (워커 프로세스에서 실행)
+
+    Args:
+        subject: (대상자 ID, {촬영 방향: 이미지 경로}) 튜플
+
+    Returns:
+        결과 행 딕셔너리 (RESULT_COLUMNS 키)
+    """
+    subject_id, paths = subject
+    row = {column: None for column in RESULT_COLUMNS}
+    row['subject_id'] = subject_id
+
+    errors = []
+    for view in VIEW_TYPES:
+        path = paths.get(view)
+        if path is None:
+            errors.append(f"{view}: 이미지 없음")
+            continue
+
+        try:
+            # 전처리가 그레이스케일이므로 축소 디코딩 + 밝기 채널만 읽음
+            with open(path, 'rb') as f:
+                image = load_image(f.read(), target_size=TARGET_SIZE, grayscale=True)
+            if image is None:
+                errors.append(f"{view}: 이미지 로드 실패")
+                continue
+
+            # 흐리거나 어둡거나 잘린 이미지는 검출 모델을 실행하지 않음
+            quality = assess_frame_quality(image)
+            if not quality.usable:
+                errors.append(f"{view}: 품질 미달 ({', '.join(quality.issues)})")
+                continue
+
+            result = analyze_image(image, TARGET_SIZE)
+        except Exception as e:
+            errors.append(f"{view}: {e}")
+            continue
+
+        row[f'{view}_angle'] = round(result['angle'], 2)
+
+    # 대표 각도는 후면(관상면) 기준, 없으면 측정된 각도 중 최대값
+    if row['back_angle'] is not None:
+        row['angle'] = row['back_angle']
+    else:
+        angles = [row[f'{view}_angle'] for view in VIEW_TYPES if row[f'{view}_angle'] is not None]
+        row['angle'] = max(angles) if angles else None
+
+    if row['angle'] is not None:
+        row['risk_level'] = assess_risk(row['angle'])['risk_level']
+
+    row['error'] = '; '.join(errors) if errors else None
+    return row
+
+def _analyze_subject_with_metrics(subject):
+    """analyze_subject 결과와 이 워커의 검출기 통계 (프로세스 ID, snapshot)"""
+    from spine_detector import get_detector
+
+    row = analyze_subject(subject)
+    return row, os.getpid(), get_detector().metrics.snapshot()
+
+def _init_worker():
+    """워커 프로세스 초기화 - 프로세스 간 스레드 과다 생성 방지 및 검출 모델 로드"""
+    import cv2
+    from spine_detector import get_detector
+
+    cv2.setNumThreads(1)
+    get_detector()
+
+class CsvResultWriter:
+    """결과 행을 CSV 파일로 한 줄씩 기록"""
+
+    def __init__(self, path):
+        self._file = open(path, 'w', newline='', encoding='utf-8-sig')
+        self._writer = csv.DictWriter(self._file, fieldnames=RESULT_COLUMNS)
+        self._writer.writeheader()
+
+    def write(self, row):
+        self._writer.writerow(row)
+
+    def close(self):
+        self._file.close()
+
+class ParquetResultWriter:
+    """결과 행을 모아 Parquet row group 단위로 기록 (pyarrow 필요)"""
+
+    def __init__(self, path, batch_size=1000):
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise RuntimeError("Parquet 출력에는 pyarrow 패키지가 필요합니다: pip install pyarrow")
+
+        self._pa = pa
+        self._schema = pa.schema([
+            ('subject_id', pa.string()),
+            ('back_angle', pa.float64()),
+            ('side_angle', pa.float64()),
+            ('front_angle', pa.float64()),
+            ('angle', pa.float64()),
+            ('risk_level', pa.string()),
+            ('error', pa.string())
+        ])
+        self._writer = pq.ParquetWriter(path, self._schema)
+        self._batch_size = batch_size
+        self._rows = []
+
+    def write(self, row):
+        self._rows.append(row)
+        if len(self._rows) >= self._batch_size:
+            self._flush()
+
+    def _flush(self):
+        if self._rows:
+            table = self._pa.Table.from_pylist(self._rows, schema=self._schema)
+            self._writer.write_table(table)
+            self._rows = []
+
+    def close(self):
+        self._flush()
+        self._writer.close()
+
+def open_result_writer(path, output_format=None):
+    """
+    출력 경로/형식에 맞는 결과 기록기 생성
+
+    Args:
+        path: 출력 파일 경로
+        output_format: 'csv' 또는 'parquet' (None이면 확장자로 판단)
+
+    Returns:
+        write(row), close() 메서드를 가진 기록기
+    """
+    if output_format is None:
+        output_format = 'parquet' if path.lower().endswith(('.parquet', '.pq')) else 'csv'
+
+    if output_format == 'parquet':
+        return ParquetResultWriter(path)
+    return CsvResultWriter(path)
+
+def run_batch(root, output, workers=None, output_format=None, chunksize=16):
+    """
+    디렉토리 전체를 멀티프로세스로 분석하고 결과를 스트리밍 저장
+
+    Args:
+        root: 촬영 이미지 최상위 디렉토리
+        output: 출력 파일 경로
+        workers: 워커 프로세스 수 (None이면 CPU 코어 수)
+        output_format: 'csv' 또는 'parquet' (None이면 확장자로 판단)
+        chunksize: 워커에 한 번에 전달할 대상자 수
+
+    Returns:
+        (처리한 대상자 수, 워커 검출기 통계를 합친 딕셔너리 (spine_detector.merge_metric_snapshots))
+    """
+    subjects = find_subjects(root)
+    workers = workers or os.cpu_count() or 1
+
+    writer = open_result_writer(output, output_format)
+    count = 0
+    # 워커 프로세스별 마지막 검출기 통계 (누적값이므로 마지막 것만 유지)
+    worker_metrics = {}
+    try:
+        with multiprocessing.Pool(workers, initializer=_init_worker) as pool:
+            # 완료되는 순서대로 결과를 받아 바로 기록 (메모리에 모으지 않음)
+            for row, pid, metrics in pool.imap_unordered(_analyze_subject_with_metrics, subjects, chunksize=chunksize):
+                writer.write(row)
+                worker_metrics[pid] = metrics
+                count += 1
+    finally:
+        writer.close()
+
+    return count, merge_metric_snapshots(worker_metrics.values())
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="SpineCheck 오프라인 일괄 진단")
+    parser.add_argument('root', help="촬영 이미지 최상위 디렉토리")
+    parser.add_argument('-o', '--output', default='results.csv', help="출력 파일 경로 (.csv 또는 .parquet)")
+    parser.add_argument('-w', '--workers', type=int, default=None, help="워커 프로세스 수 (기본값: CPU 코어 수)")
+    parser.add_argument('--format', choices=['csv', 'parquet'], default=None, help="출력 형식 (기본값: 확장자로 판단)")
+    parser.add_argument('--chunksize', type=int, default=16, help="워커에 한 번에 전달할 대상자 수")
+    args = parser.parse_args(argv)
+
+    if not os.path.isdir(args.root):
+        parser.error(f"디렉토리를 찾을 수 없습니다: {args.root}")
+
+    start = time.perf_counter()
+    count, metrics = run_batch(args.root, args.output, args.workers, args.format, args.chunksize)
+    elapsed = time.perf_counter() - start
+
+    print(f"{count}명 분석 완료 ({elapsed:.1f}초) → {args.output}", file=sys.stderr)
+    print(f"검출 모델: {format_metrics(metrics)}", file=sys.stderr)
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
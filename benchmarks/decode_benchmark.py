@@ -0,0 +1,111 @@
+"""
+이미지 디코딩 벤치마크
+
+휴대폰 사진을 분석 해상도로 읽을 때의 디코딩 시간과 최대 메모리(RSS)를 비교한다.
+    full:  기존 방식 (원본 크기 디코딩 + RGB→BGR 변환)
+    draft: JPEG 축소 디코딩 (load_image(target_size=...))
+    gray:  JPEG 축소 디코딩 + 밝기 채널만 사용 (load_image(target_size=..., grayscale=True))
+
+각 방식은 별도 프로세스에서 실행하여 최대 RSS가 서로 섞이지 않도록 한다.
+
+사용 예:
+    python benchmarks/decode_benchmark.py photos/*.jpg
+
+사진을 지정하지 않으면 12메가픽셀 합성 JPEG을 만들어 사용한다.
+"""
+import argparse
+import json
+import os
+import resource
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+MODES = ('full', 'draft', 'gray')
+
+# 분석 이미지 크기 (높이, 너비)
+TARGET_SIZE = (480, 640)
+
+def _max_rss_kb():
+    # Linux에서는 KB 단위, macOS에서는 바이트 단위
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return rss // 1024 if sys.platform == 'darwin' else rss
+
+def run_worker(mode, paths, repeat):
+    """한 가지 방식으로 모든 사진을 디코딩하고 측정값을 JSON으로 출력 (자식 프로세스)"""
+    from image_processing import load_image, preprocess_image
+
+    images = []
+    for path in paths:
+        with open(path, 'rb') as f:
+            images.append(f.read())
+
+    baseline_rss = _max_rss_kb()
+    timings = []
+    for _ in range(repeat):
+        for data in images:
+            start = time.perf_counter()
+            if mode == 'full':
+                image = load_image(data)
+            elif mode == 'draft':
+                image = load_image(data, target_size=TARGET_SIZE)
+            else:
+                image = load_image(data, target_size=TARGET_SIZE, grayscale=True)
+            preprocess_image(image, TARGET_SIZE)
+            timings.append(time.perf_counter() - start)
+            del image
+
+    print(json.dumps({
+        'mode': mode,
+        'median_ms': statistics.median(timings) * 1000,
+        'baseline_rss_mb': baseline_rss / 1024,
+        'peak_rss_mb': _max_rss_kb() / 1024
+    }))
+
+def make_sample_photo(directory):
+    """12메가픽셀(4000x3000) 합성 JPEG 생성"""
+    import numpy as np
+    from PIL import Image
+
+    rng = np.random.default_rng(0)
+    # 사진처럼 부드러운 변화가 있도록 저해상도 노이즈를 확대
+    small = rng.integers(0, 255, (300, 400, 3), dtype=np.uint8)
+    image = Image.fromarray(small).resize((4000, 3000), Image.BICUBIC)
+
+    path = os.path.join(directory, 'sample_12mp.jpg')
+    image.save(path, format='JPEG', quality=90)
+    return path
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="이미지 디코딩 벤치마크")
+    parser.add_argument('photos', nargs='*', help="측정할 JPEG 사진 경로")
+    parser.add_argument('--repeat', type=int, default=5, help="사진당 반복 횟수")
+    parser.add_argument('--worker', choices=MODES, help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.worker:
+        run_worker(args.worker, args.photos, args.repeat)
+        return 0
+
+    with tempfile.TemporaryDirectory() as tmp:
+        photos = args.photos or [make_sample_photo(tmp)]
+
+        print(f"사진 {len(photos)}장, 사진당 {args.repeat}회 (디코딩 + preprocess_image)")
+        print(f"{'방식':<8}{'중앙값(ms)':>12}{'최대 RSS(MB)':>14}{'디코딩 전 RSS(MB)':>20}")
+        for mode in MODES:
+            output = subprocess.run(
+                [sys.executable, os.path.abspath(__file__), '--worker', mode, '--repeat', str(args.repeat), *photos],
+                check=True, capture_output=True, text=True
+            ).stdout
+            result = json.loads(output.strip().splitlines()[-1])
+            print(f"{mode:<8}{result['median_ms']:>12.1f}{result['peak_rss_mb']:>14.1f}{result['baseline_rss_mb']:>20.1f}")
+
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,56 @@
+"""
+척추 검출기 벤치마크
+
+공유 검출기(SPINECHECK_DETECTOR로 선택)로 합성 분석 이미지를 한 장씩, 그리고 배치로 검출하고
+검출기가 누적한 통계(get_detector().metrics.snapshot())를 출력한다.
+모델 로드 시간, 이미지당/배치당 추론 시간을 운영 환경 모델로 확인할 때 사용한다.
+
+사용 예:
+    python benchmarks/detector_benchmark.py --images 64 --batch-size 16
+    SPINECHECK_DETECTOR=tensorflow SPINECHECK_MODEL_PATH=model/ python benchmarks/detector_benchmark.py
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from spine_detector import format_metrics, get_detector
+
+# 분석 이미지 크기 (높이, 너비)
+TARGET_SIZE = (480, 640)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="척추 검출기 벤치마크")
+    parser.add_argument('--images', type=int, default=64, help="검출할 이미지 수")
+    parser.add_argument('--batch-size', type=int, default=16, help="배치 검출 크기")
+    args = parser.parse_args(argv)
+
+    rng = np.random.default_rng(0)
+    images = rng.integers(0, 256, (args.images, *TARGET_SIZE), dtype=np.uint8)
+
+    start = time.perf_counter()
+    detector = get_detector()
+    print(f"검출기: {detector.name} ({detector.cache_token}), 생성 + 로드 {(time.perf_counter() - start) * 1000:.1f} ms")
+
+    start = time.perf_counter()
+    for image in images:
+        detector.detect(image)
+    print(f"한 장씩 ({args.images}장): {(time.perf_counter() - start) * 1000 / args.images:.2f} ms/장")
+
+    start = time.perf_counter()
+    for i in range(0, args.images, args.batch_size):
+        detector.detect_batch(images[i:i + args.batch_size])
+    print(f"배치 {args.batch_size}장씩 ({args.images}장): {(time.perf_counter() - start) * 1000 / args.images:.2f} ms/장")
+
+    snapshot = detector.metrics.snapshot()
+    print(f"검출기 통계: {format_metrics(snapshot)}")
+    print(f"마지막 배치: {snapshot['last_batch_size']}장, {snapshot['last_batch_ms']:.2f} ms")
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
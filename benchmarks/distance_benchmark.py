@@ -0,0 +1,75 @@
+"""
+대원 거리 계산 벤치마크
+
+병원별 파이썬 반복(math 모듈 haversine)과 geo_distance의 벡터 계산을 비교하고,
+사용자 × 병원 거리 행렬과 사용자별 최근접 k곳 배치 계산 시간을 측정한다.
+평면 근사(1도 = 111km)의 오차도 함께 출력한다.
+
+사용 예:
+    python benchmarks/distance_benchmark.py --hospitals 100000 --users 2000
+"""
+import argparse
+import math
+import os
+import sys
+import time
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from geo_distance import EARTH_RADIUS_KM, distance_matrix, haversine_km, nearest_k
+
+def python_haversine(lat1, lon1, lat2, lon2):
+    """비교용 스칼라 구현"""
+    lat1, lon1, lat2, lon2 = map(math.radians, (lat1, lon1, lat2, lon2))
+    a = math.sin((lat2 - lat1) / 2) ** 2 + math.cos(lat1) * math.cos(lat2) * math.sin((lon2 - lon1) / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * math.asin(math.sqrt(a))
+
+def timed(label, func, repeat=3):
+    func()
+    start = time.perf_counter()
+    for _ in range(repeat):
+        value = func()
+    print(f"{label:<40}{(time.perf_counter() - start) / repeat * 1000:>10.2f} ms")
+    return value
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="대원 거리 계산 벤치마크")
+    parser.add_argument('--hospitals', type=int, default=100000, help="병원 수")
+    parser.add_argument('--users', type=int, default=2000, help="배치 사용자 수")
+    parser.add_argument('-k', type=int, default=5, help="사용자별 최근접 병원 수")
+    args = parser.parse_args(argv)
+
+    rng = np.random.default_rng(0)
+    lats = rng.uniform(34.5, 38.3, args.hospitals)
+    lons = rng.uniform(126.3, 129.4, args.hospitals)
+    user_lats = rng.uniform(34.5, 38.3, args.users)
+    user_lons = rng.uniform(126.3, 129.4, args.users)
+    lat, lon = 37.498095, 127.027610
+
+    loop = timed(f"파이썬 반복 (1명 × {args.hospitals}곳)",
+                 lambda: [python_haversine(lat, lon, a, b) for a, b in zip(lats.tolist(), lons.tolist())], repeat=1)
+    vector = timed(f"벡터 계산 (1명 × {args.hospitals}곳)", lambda: haversine_km(lat, lon, lats, lons))
+    print(f"{'':<40}최대 차이 {np.abs(np.array(loop) - vector).max():.2e} km")
+
+    flat = np.sqrt((lats - lat) ** 2 + (lons - lon) ** 2) * 111
+    error = np.abs(flat - vector) / np.maximum(vector, 1e-9)
+    print(f"{'평면 근사 상대 오차 (중앙값/최대)':<40}{np.median(error) * 100:>8.1f}% / {error.max() * 100:.1f}%")
+
+    timed(f"거리 행렬 ({args.users} × {args.hospitals}, float32)",
+          lambda: distance_matrix(user_lats, user_lons, lats, lons, dtype=np.float32), repeat=1)
+    indices, distances = timed(f"최근접 {args.k}곳 ({args.users}명)",
+                               lambda: nearest_k(user_lats, user_lons, lats, lons, args.k), repeat=1)
+
+    # 결과 검증 (앞 20명)
+    for user in range(min(20, args.users)):
+        expected = np.argsort(haversine_km(user_lats[user], user_lons[user], lats, lons))[:args.k]
+        assert np.allclose(distances[user], haversine_km(user_lats[user], user_lons[user],
+                                                         lats[expected], lons[expected])), "최근접 결과 불일치"
+    print("결과 검증 완료")
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
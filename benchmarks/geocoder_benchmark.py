@@ -0,0 +1,63 @@
+"""
+오프라인 지오코더 벤치마크
+
+주소 파일을 읽어 트라이를 만드는 시간과, 주소 파일의 주소를 변형한 질의
+(시도 약칭, 번호 보간, 도로명 중심)의 캐시 없는/캐시된 변환 시간을 측정한다.
+
+사용 예:
+    python benchmarks/geocoder_benchmark.py --queries 5000
+"""
+import argparse
+import csv
+import os
+import sys
+import time
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from geocoder import DEFAULT_ADDRESSES_PATH, OfflineGeocoder
+
+def make_queries(addresses, count, rng):
+    """주소 파일의 주소를 변형한 질의"""
+    queries = []
+    for index in rng.integers(0, len(addresses), count):
+        tokens = addresses[index].split()
+        variant = rng.integers(0, 3)
+        if variant == 0:
+            tokens[0] = '서울'
+        elif variant == 1 and tokens[-1].isdigit():
+            tokens[-1] = str(int(tokens[-1]) + int(rng.integers(1, 20)))
+        else:
+            tokens = tokens[:-1]
+        queries.append(' '.join(tokens))
+    return queries
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="오프라인 지오코더 벤치마크")
+    parser.add_argument('--addresses', default=DEFAULT_ADDRESSES_PATH, help="주소 파일 경로")
+    parser.add_argument('--queries', type=int, default=5000, help="질의 수")
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    geocoder = OfflineGeocoder.from_csv(args.addresses, cache_size=args.queries)
+    print(f"트라이 생성: {(time.perf_counter() - start) * 1000:.1f} ms")
+
+    with open(args.addresses, encoding='utf-8', newline='') as f:
+        addresses = [row['address'] for row in csv.DictReader(f)]
+    queries = make_queries(addresses, args.queries, np.random.default_rng(0))
+
+    for label in ("캐시 없음", "캐시됨"):
+        start = time.perf_counter()
+        results = [geocoder.geocode(query) for query in queries]
+        elapsed = (time.perf_counter() - start) / len(queries) * 1000
+        print(f"{label:<12}{elapsed:>8.4f} ms/질의")
+
+    found = sum(result is not None for result in results)
+    print(f"변환 성공: {found}/{len(queries)}")
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,87 @@
+"""
+진단 이력 저장소 벤치마크
+
+임시 데이터베이스에 여러 사용자의 결과를 배치로 저장한 뒤
+사용자 한 명의 목록 페이지 조회, 전체 페이지 순회, 각도 추이 조회 시간을 측정한다.
+
+사용 예:
+    python benchmarks/history_benchmark.py --users 100 --per-user 5000
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from history_store import HistoryStore
+
+def make_result(rng, index):
+    """결과 페이지 형식의 합성 결과"""
+    points = [(320 + int(rng.integers(-10, 10)), 144 + 40 * i) for i in range(7)]
+    angle = float(rng.uniform(0, 30))
+    return {
+        'id': f'bench-{index}',
+        'angle': round(angle, 1),
+        'risk_level': '낮음' if angle < 10 else '중간' if angle < 20 else '높음',
+        'risk_color': 'low' if angle < 10 else 'medium' if angle < 20 else 'high',
+        'views': {view: {'points': points, 'angle': round(angle, 1)} for view in ('back', 'side', 'front')}
+    }
+
+def timed(label, func, repeat=20):
+    func()
+    start = time.perf_counter()
+    for _ in range(repeat):
+        value = func()
+    print(f"{label:<32}{(time.perf_counter() - start) / repeat * 1000:>10.2f} ms")
+    return value
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="진단 이력 저장소 벤치마크")
+    parser.add_argument('--users', type=int, default=100, help="사용자 수")
+    parser.add_argument('--per-user', type=int, default=5000, help="사용자당 결과 수")
+    parser.add_argument('--batch', type=int, default=1000, help="한 트랜잭션에 저장할 결과 수")
+    args = parser.parse_args(argv)
+
+    rng = np.random.default_rng(0)
+    with tempfile.TemporaryDirectory() as directory:
+        store = HistoryStore(os.path.join(directory, 'history.db'))
+
+        total = args.users * args.per_user
+        start = time.perf_counter()
+        batch = []
+        base = time.time() - total
+        for index in range(total):
+            batch.append((f'user-{index % args.users}', make_result(rng, index), base + index))
+            if len(batch) >= args.batch:
+                store.save_many(batch)
+                batch = []
+        if batch:
+            store.save_many(batch)
+        elapsed = time.perf_counter() - start
+        print(f"결과 {total}개 저장: {elapsed:.1f}초 ({total / elapsed:.0f}개/초, 배치 {args.batch})")
+
+        user = 'user-0'
+        timed("첫 페이지 (50개)", lambda: store.list_results(user))
+
+        def walk():
+            pages, cursor = 0, None
+            while True:
+                page = store.list_results(user, limit=200, cursor=cursor)
+                pages += 1
+                if page.next_cursor is None:
+                    return pages
+                cursor = page.next_cursor
+
+        pages = timed(f"전체 순회 ({args.per_user}개, 200개씩)", walk, repeat=3)
+        print(f"{'':<32}{pages}페이지")
+        timed(f"각도 추이 ({args.per_user}개)", lambda: store.angle_trend(user))
+        timed("결과 수", lambda: store.count(user))
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
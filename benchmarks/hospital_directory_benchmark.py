@@ -0,0 +1,64 @@
+"""
+병원 디렉토리 적재 벤치마크
+
+전국 규모(기본 10만 곳)의 합성 병원 데이터를 CSV와 디렉토리 형식(ingest_hospitals.py 출력)으로 저장한 뒤
+CSV를 읽어 정규화하는 시간과 디렉토리를 메모리 매핑으로 여는 시간, 인덱스 생성과 첫 검색 시간을 비교한다.
+
+사용 예:
+    python benchmarks/hospital_directory_benchmark.py --hospitals 100000
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from hospital_directory import HOURS_COLUMNS, SPECIALTIES, HospitalDirectory
+from hospital_index import HospitalIndex
+from ingest_hospitals import read_hospitals
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from hospital_search_benchmark import make_hospitals
+
+def timed(label, func):
+    start = time.perf_counter()
+    value = func()
+    print(f"{label:<32}{(time.perf_counter() - start) * 1000:>10.1f} ms")
+    return value
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="병원 디렉토리 적재 벤치마크")
+    parser.add_argument('--hospitals', type=int, default=100000, help="병원 수")
+    args = parser.parse_args(argv)
+
+    rng = np.random.default_rng(0)
+    frame = make_hospitals(args.hospitals, rng)
+    frame['address'] = [f'서울특별시 강남구 테헤란로 {index % 700 + 1}' for index in range(len(frame))]
+    frame['phone'] = '02-000-0000'
+    frame['specialties'] = [';'.join(name for bit, name in enumerate(SPECIALTIES) if mask & (1 << bit))
+                            for mask in frame['specialty_mask']]
+    for name in HOURS_COLUMNS:
+        frame[name] = [f'{value // 60:02d}:{value % 60:02d}' if value >= 0 else '' for value in frame[name]]
+
+    with tempfile.TemporaryDirectory() as directory:
+        csv_path = os.path.join(directory, 'hospitals.csv')
+        output = os.path.join(directory, 'hospitals')
+        frame.drop(columns=['specialty_mask']).to_csv(csv_path, index=False)
+
+        hospitals, _ = timed("CSV 읽기 + 정규화", lambda: read_hospitals(csv_path))
+        hospitals.save(output)
+        size = sum(os.path.getsize(os.path.join(output, name)) for name in os.listdir(output))
+        print(f"{'':<32}디렉토리 크기 {size / 1024 / 1024:.1f}MB")
+
+        opened = timed("디렉토리 열기 (메모리 매핑)", lambda: HospitalDirectory.open(output))
+        index = timed("인덱스 생성", lambda: HospitalIndex(opened))
+        timed("첫 검색 (반경 3km, 30곳)", lambda: index.search(37.5665, 126.9780, 3, limit=30))
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,82 @@
+"""
+병원 검색 조건(패싯) 비트맵 인덱스 벤치마크
+
+전국 규모(기본 10만 곳)의 합성 병원 데이터로 진료과목 + 평점 + 진료 중 조건을 건 반경 검색을
+DataFrame 조건 스캔(전체 행 조건 비교 후 거리 계산)과 비트맵 인덱스(반경 후보 ∩ 조건 비트맵)로 비교하고,
+두 결과가 같은지 검증한다.
+
+사용 예:
+    python benchmarks/hospital_facet_benchmark.py --hospitals 100000 --queries 1000
+"""
+import argparse
+import os
+import sys
+import time
+from datetime import datetime
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from geo_distance import haversine_km
+from hospital_directory import SPECIALTIES, HospitalDirectory
+from hospital_facets import KST
+from hospital_index import HospitalIndex
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from hospital_search_benchmark import make_hospitals, timed
+
+# 검색 조건 (평일 오후, 정형외과 또는 척추전문, 평점 4.0 이상)
+FACETS = {
+    'specialties': ["정형외과", "척추전문"],
+    'min_rating': 4.0,
+    'open_at': datetime(2026, 10, 14, 15, 10, tzinfo=KST)
+}
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="병원 패싯 비트맵 인덱스 벤치마크")
+    parser.add_argument('--hospitals', type=int, default=100000, help="병원 수")
+    parser.add_argument('--queries', type=int, default=1000, help="검색 횟수")
+    parser.add_argument('--radius', type=float, default=3.0, help="반경 검색 반경 (km)")
+    args = parser.parse_args(argv)
+
+    rng = np.random.default_rng(0)
+    hospitals = make_hospitals(args.hospitals, rng)
+    directory = HospitalDirectory.from_records(hospitals)
+
+    start = time.perf_counter()
+    index = HospitalIndex(directory)
+    print(f"인덱스 + 조건 비트맵 생성 ({args.hospitals}곳): {(time.perf_counter() - start) * 1000:.1f} ms")
+
+    sample = make_hospitals(args.queries, rng)
+    queries = list(zip(sample['lat'], sample['lon']))
+
+    bits = sum(1 << SPECIALTIES.index(name) for name in FACETS['specialties'])
+    minutes = FACETS['open_at'].hour * 60 + FACETS['open_at'].minute
+
+    def scan(lat, lon):
+        matched = hospitals[((hospitals['specialty_mask'] & bits) != 0)
+                            & (hospitals['rating'] >= FACETS['min_rating'])
+                            & (hospitals['weekday_open'] >= 0)
+                            & (hospitals['weekday_open'] <= minutes // 30 * 30)
+                            & (hospitals['weekday_close'] >= minutes // 30 * 30 + 30)]
+        distances = haversine_km(lat, lon, matched['lat'].to_numpy(), matched['lon'].to_numpy())
+        inside = np.nonzero(distances <= args.radius)[0]
+        return matched.index.to_numpy()[inside[np.argsort(distances[inside])]]
+
+    timed(f"DataFrame 조건 스캔 반경 {args.radius}km", scan, queries)
+    timed(f"비트맵 인덱스 반경 {args.radius}km",
+          lambda lat, lon: index.query_radius(lat, lon, args.radius, **FACETS), queries)
+    timed(f"비트맵 인덱스 반경 {args.radius}km (조건 없음)",
+          lambda lat, lon: index.query_radius(lat, lon, args.radius), queries)
+
+    # 결과 검증
+    for lat, lon in queries[:50]:
+        indices, _ = index.query_radius(lat, lon, args.radius, **FACETS)
+        assert set(indices) == set(scan(lat, lon)), "조건 검색 결과 불일치"
+    print("결과 검증 완료 (50회)")
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,130 @@
+"""
+병원 공간 인덱스 벤치마크
+
+전국 규모(기본 10만 곳)의 합성 병원 좌표로 인덱스를 만들고
+반경 검색과 k-최근접 검색 시간을 전체 스캔(NumPy 거리 계산 후 정렬)과 비교한다.
+합성 좌표는 주요 도시 주변에 몰리도록 생성한다.
+
+사용 예:
+    python benchmarks/hospital_search_benchmark.py --hospitals 100000 --queries 1000
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from geo_distance import distances_from
+from hospital_directory import HospitalDirectory
+from hospital_index import HospitalIndex
+
+# 주요 도시 중심 (위도, 경도, 비중)
+CITIES = [
+    (37.5665, 126.9780, 0.40),  # 서울
+    (35.1796, 129.0756, 0.12),  # 부산
+    (35.8714, 128.6014, 0.09),  # 대구
+    (37.4563, 126.7052, 0.10),  # 인천
+    (35.1595, 126.8526, 0.06),  # 광주
+    (36.3504, 127.3845, 0.06),  # 대전
+    (35.5384, 129.3114, 0.04),  # 울산
+    (36.4800, 127.2890, 0.03),  # 세종
+    (33.4996, 126.5312, 0.03),  # 제주
+]
+
+def make_hospitals(count, rng):
+    """도시 주변 정규분포 + 전국 균등분포(10%) 합성 병원 좌표와 병원 정보"""
+    weights = np.array([city[2] for city in CITIES])
+    city = rng.choice(len(CITIES), size=count, p=weights / weights.sum())
+    centers = np.array([city[:2] for city in CITIES])[city]
+    coords = centers + rng.normal(0, 0.08, (count, 2))
+
+    uniform = rng.random(count) < 0.1
+    coords[uniform, 0] = rng.uniform(34.5, 38.3, uniform.sum())
+    coords[uniform, 1] = rng.uniform(126.3, 129.4, uniform.sum())
+
+    # 진료 시간 (자정 기준 분, 토요일은 85%가 오전 진료, 일요일은 10%만 진료)
+    weekday_open = rng.choice([540, 570, 600], count)
+    saturday = rng.random(count) < 0.85
+    sunday = rng.random(count) < 0.1
+    hours = {
+        'weekday_open': weekday_open,
+        'weekday_close': rng.choice([1080, 1110, 1140, 1260], count),
+        'saturday_open': np.where(saturday, weekday_open, -1),
+        'saturday_close': np.where(saturday, rng.choice([780, 840], count), -1),
+        'sunday_open': np.where(sunday, 600, -1),
+        'sunday_close': np.where(sunday, 840, -1)
+    }
+    return pd.DataFrame({
+        'id': [f'H{index}' for index in range(count)],
+        'name': [f'병원{index}' for index in range(count)],
+        'address': '',
+        'phone': '',
+        'lat': coords[:, 0],
+        'lon': coords[:, 1],
+        'rating': rng.uniform(3.0, 5.0, count).round(1),
+        'reviews': rng.integers(0, 400, count),
+        'specialty_mask': rng.integers(1, 32, count),
+        **hours
+    })
+
+def timed(label, func, queries):
+    start = time.perf_counter()
+    for lat, lon in queries:
+        func(lat, lon)
+    elapsed = (time.perf_counter() - start) / len(queries) * 1000
+    print(f"{label:<36}{elapsed:>10.3f} ms")
+    return elapsed
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="병원 공간 인덱스 벤치마크")
+    parser.add_argument('--hospitals', type=int, default=100000, help="병원 수")
+    parser.add_argument('--queries', type=int, default=1000, help="검색 횟수")
+    parser.add_argument('--radius', type=float, default=3.0, help="반경 검색 반경 (km)")
+    parser.add_argument('-k', type=int, default=10, help="k-최근접 검색 결과 수")
+    args = parser.parse_args(argv)
+
+    rng = np.random.default_rng(0)
+    hospitals = make_hospitals(args.hospitals, rng)
+
+    directory = HospitalDirectory.from_records(hospitals)
+
+    start = time.perf_counter()
+    index = HospitalIndex(directory)
+    print(f"인덱스 생성 ({args.hospitals}곳): {(time.perf_counter() - start) * 1000:.1f} ms")
+
+    # 검색 위치는 병원 분포와 같은 분포에서 추출
+    sample = make_hospitals(args.queries, rng)
+    queries = list(zip(sample['lat'], sample['lon']))
+
+    lat_rad = np.radians(hospitals['lat'].to_numpy())
+    lon_rad = np.radians(hospitals['lon'].to_numpy())
+    cos_lat = np.cos(lat_rad)
+
+    def scan_radius(lat, lon):
+        distances = distances_from(lat, lon, lat_rad, lon_rad, cos_lat)
+        inside = np.nonzero(distances <= args.radius)[0]
+        return inside[np.argsort(distances[inside])]
+
+    def scan_nearest(lat, lon):
+        distances = distances_from(lat, lon, lat_rad, lon_rad, cos_lat)
+        return np.argsort(distances)[:args.k]
+
+    timed(f"전체 스캔 반경 {args.radius}km", scan_radius, queries)
+    timed(f"인덱스 반경 {args.radius}km", lambda lat, lon: index.query_radius(lat, lon, args.radius), queries)
+    timed(f"전체 스캔 최근접 {args.k}곳", scan_nearest, queries)
+    timed(f"인덱스 최근접 {args.k}곳", lambda lat, lon: index.query_nearest(lat, lon, args.k), queries)
+
+    # 결과 검증
+    for lat, lon in queries[:50]:
+        indices, _ = index.query_radius(lat, lon, args.radius)
+        assert set(indices) == set(scan_radius(lat, lon)), "반경 검색 결과 불일치"
+    print("결과 검증 완료 (50회)")
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
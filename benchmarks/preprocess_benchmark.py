@@ -0,0 +1,69 @@
+"""
+전처리 처리량 벤치마크
+
+프레임 묶음에 대해 preprocess_image(3채널 결과, 단계마다 새 배열)와
+preprocess_gray(단일 채널, 버퍼 재사용)의 처리량과 호출당 메모리 할당량을 비교한다.
+
+사용 예:
+    python benchmarks/preprocess_benchmark.py --frames 200 --width 1280 --height 720
+"""
+import argparse
+import os
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from image_processing import preprocess_image, preprocess_gray, get_preprocess_buffers
+
+TARGET_SIZE = (480, 640)
+
+def measure(label, frames, process):
+    """처리량(프레임/초)과 호출 중 최대 메모리 할당량 측정"""
+    # 첫 호출에서 버퍼/CLAHE 등 초기화 비용 제외
+    process(frames[0])
+
+    start = time.perf_counter()
+    for frame in frames:
+        process(frame)
+    elapsed = time.perf_counter() - start
+
+    # numpy 배열 할당은 tracemalloc으로 추적됨
+    # (호출 결과는 매번 버려지므로 최대값이 호출 한 번의 할당량에 해당)
+    tracemalloc.start()
+    for frame in frames[:20]:
+        process(frame)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    print(f"{label:<28}{len(frames) / elapsed:>12.1f}{peak / 1024:>20.1f}")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="전처리 처리량 벤치마크")
+    parser.add_argument('--frames', type=int, default=200, help="프레임 수")
+    parser.add_argument('--width', type=int, default=1280, help="프레임 너비")
+    parser.add_argument('--height', type=int, default=720, help="프레임 높이")
+    args = parser.parse_args(argv)
+
+    rng = np.random.default_rng(0)
+    frames = rng.integers(0, 255, (args.frames, args.height, args.width, 3), dtype=np.uint8)
+
+    buffers = get_preprocess_buffers(TARGET_SIZE)
+    out = np.empty(TARGET_SIZE, dtype=np.uint8)
+
+    print(f"프레임 {args.frames}개 ({args.width}x{args.height}) → {TARGET_SIZE[1]}x{TARGET_SIZE[0]}")
+    print(f"{'방식':<28}{'프레임/초':>12}{'호출 중 최대 할당(KB)':>20}")
+    measure("preprocess_image", frames, lambda f: preprocess_image(f, TARGET_SIZE))
+    measure("preprocess_gray", frames, lambda f: preprocess_gray(f, TARGET_SIZE, out=out, buffers=buffers))
+    measure("preprocess_gray (clahe)", frames,
+            lambda f: preprocess_gray(f, TARGET_SIZE, out=out, enhance='clahe', buffers=buffers))
+    measure("preprocess_gray (블러 없음)", frames,
+            lambda f: preprocess_gray(f, TARGET_SIZE, out=out, blur=False, buffers=buffers))
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
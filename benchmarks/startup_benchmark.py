@@ -0,0 +1,98 @@
+"""
+페이지 시작 시간 벤치마크
+
+각 페이지를 새 프로세스에서 AppTest로 처음 실행하여 cold import + 첫 렌더링 시간을 측정하고,
+Streamlit 자체 import 이후 페이지가 추가로 불러온 무거운 라이브러리를 확인한다.
+시간이 예산을 넘거나 지연 로드해야 할 라이브러리를 시작 시 import하면 0이 아닌 코드로 종료한다.
+(페이지 실행 중 발생한 오류는 함께 표시하지만 실패로 처리하지 않는다.)
+
+사용 예:
+    python benchmarks/startup_benchmark.py
+    python benchmarks/startup_benchmark.py --budget-scale 1.5   # 느린 CI 장비에서 예산 완화
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# 페이지별 첫 실행 시간 예산 (초, Streamlit import 제외)
+PAGE_BUDGETS = {
+    'app.py': 0.3,
+    '01_diagnosis.py': 0.5,
+    '02_results.py': 0.5,
+    '02_results_example.py': 0.5,
+    '03_hospitals.py': 0.5
+}
+
+# 페이지 시작 시 import되면 안 되는 라이브러리 (첫 실제 사용 시 지연 로드)
+LAZY_MODULES = ('cv2', 'tensorflow', 'keras', 'skimage', 'folium', 'geopy', 'requests', 'reportlab', 'av', 'streamlit_webrtc')
+
+def run_worker(page):
+    """새 프로세스에서 페이지를 한 번 실행하고 측정값을 JSON으로 출력"""
+    from streamlit.testing.v1 import AppTest
+
+    # streamlit run과 같이 앱 디렉토리의 모듈을 import할 수 있도록 경로 추가
+    sys.path.insert(0, ROOT)
+
+    # Streamlit과 그 의존성(numpy, pandas 등)은 모든 페이지가 공통으로 지불하므로 제외
+    before = set(sys.modules)
+
+    start = time.perf_counter()
+    at = AppTest.from_file(os.path.join(ROOT, page), default_timeout=60)
+    at.run()
+    elapsed = time.perf_counter() - start
+
+    loaded = sorted({name.split('.')[0] for name in set(sys.modules) - before})
+    print(json.dumps({
+        'page': page,
+        'seconds': elapsed,
+        'errors': [str(e.message) for e in at.exception],
+        'lazy_violations': [name for name in LAZY_MODULES if name in loaded],
+        'loaded': loaded
+    }))
+
+def measure(page):
+    output = subprocess.run(
+        [sys.executable, os.path.abspath(__file__), '--worker', page],
+        check=True, capture_output=True, text=True, cwd=ROOT
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="페이지 시작 시간 벤치마크")
+    parser.add_argument('pages', nargs='*', default=list(PAGE_BUDGETS), help="측정할 페이지")
+    parser.add_argument('--budget-scale', type=float, default=1.0, help="예산 배율")
+    parser.add_argument('--worker', help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.worker:
+        run_worker(args.worker)
+        return 0
+
+    failed = False
+    print(f"{'페이지':<24}{'첫 실행(ms)':>12}{'예산(ms)':>10}  결과")
+    for page in args.pages:
+        result = measure(page)
+        budget = PAGE_BUDGETS.get(page, 0.5) * args.budget_scale
+
+        problems = []
+        if result['seconds'] > budget:
+            problems.append("예산 초과")
+        if result['lazy_violations']:
+            problems.append(f"시작 시 import: {', '.join(result['lazy_violations'])}")
+        failed = failed or bool(problems)
+
+        status = '; '.join(problems) if problems else "통과"
+        if result['errors']:
+            # 페이지 자체 오류는 시작 시간과 무관하므로 표시만 함
+            status += f" (페이지 오류: {result['errors'][0][:60]})"
+        print(f"{page:<24}{result['seconds'] * 1000:>12.0f}{budget * 1000:>10.0f}  {status}")
+
+    return 1 if failed else 0
+
+if __name__ == '__main__':
+    sys.exit(main())
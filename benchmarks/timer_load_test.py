@@ -0,0 +1,123 @@
+"""
+타이머 촬영 부하 테스트
+
+여러 세션이 동시에 타이머 촬영을 진행할 때 세션당 서버 스크립트 실행에 묶이는 시간과
+워커(스크립트 실행 스레드) 하나가 분당 처리하는 세션 수를 측정한다. 각 세션은
+Streamlit AppTest로 진단 페이지를 실제로 실행하며, 클라이언트 측 대기 시간은 워커를 점유하지 않는다.
+
+사용 예:
+    python benchmarks/timer_load_test.py --sessions 40
+
+변경 전 페이지와 비교하려면 이전 버전을 파일로 꺼내 --page로 지정한다.
+    git show <커밋>:01_diagnosis.py > /tmp/01_diagnosis_before.py
+    python benchmarks/timer_load_test.py --page /tmp/01_diagnosis_before.py
+"""
+import argparse
+import heapq
+import math
+import os
+import statistics
+import sys
+import time
+
+from streamlit.testing.v1 import AppTest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_PAGE = os.path.join(ROOT, '01_diagnosis.py')
+
+def start_session(page, duration):
+    """
+    후면 촬영 단계에서 타이머를 시작한 세션을 만들고 첫 실행 수행
+
+    Returns:
+        (AppTest, 서버 스크립트 실행 시간(초))
+    """
+    at = AppTest.from_file(page, default_timeout=duration + 30)
+    at.session_state.diagnosis_step = 2
+    at.session_state.timer_duration = duration
+    at.session_state.timer_active = True
+    at.session_state.timer_deadline = time.time() + duration
+
+    start = time.perf_counter()
+    at.run()
+    return at, time.perf_counter() - start
+
+def resume_session(at):
+    """
+    카운트다운이 끝난 뒤 클라이언트가 요청하는 재실행 수행
+
+    Returns:
+        (AppTest, 서버 스크립트 실행 시간(초))
+    """
+    start = time.perf_counter()
+    at.run()
+    return at, time.perf_counter() - start
+
+def session_finished(at):
+    return bool(at.session_state.images['back']) and not at.session_state.timer_active
+
+def run_load_test(page, sessions, duration):
+    """
+    워커 하나(스크립트 실행 스레드 하나)로 여러 세션의 타이머 촬영을 처리하고 측정값 반환
+
+    AppTest는 동시 실행을 지원하지 않으므로 서버 실행은 한 번에 하나씩 수행하고,
+    각 세션의 클라이언트 카운트다운이 끝나는 시각에 맞춰 재실행을 예약한다.
+
+    Returns:
+        측정 결과 딕셔너리
+    """
+    busy = [0.0] * sessions
+    pending = []  # (재실행 시각, 세션 번호, AppTest)
+    completed = 0
+
+    def collect(i, at, elapsed):
+        nonlocal completed
+        busy[i] += elapsed
+        if session_finished(at):
+            completed += 1
+        else:
+            # 클라이언트 카운트다운 동안은 워커를 점유하지 않음
+            deadline = at.session_state.timer_deadline or time.time()
+            heapq.heappush(pending, (deadline, i, at))
+
+    start = time.perf_counter()
+    for i in range(sessions):
+        collect(i, *start_session(page, duration))
+
+    while pending:
+        deadline, i, at = heapq.heappop(pending)
+        time.sleep(max(0.0, deadline - time.time()))
+        collect(i, *resume_session(at))
+    wall = time.perf_counter() - start
+
+    busy_times = sorted(busy)
+    return {
+        'sessions': sessions,
+        'completed': completed,
+        'wall_seconds': wall,
+        'busy_p50': statistics.median(busy_times),
+        'busy_p95': busy_times[min(len(busy_times) - 1, math.ceil(0.95 * len(busy_times)) - 1)],
+        # 워커 하나가 1분 동안 완료한 타이머 촬영 세션 수
+        'sessions_per_worker_minute': completed * 60.0 / wall
+    }
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="타이머 촬영 부하 테스트")
+    parser.add_argument('--page', default=DEFAULT_PAGE, help="테스트할 진단 페이지 파일")
+    parser.add_argument('--sessions', type=int, default=20, help="동시 세션 수")
+    parser.add_argument('--duration', type=int, default=3, help="타이머 시간 (초)")
+    args = parser.parse_args(argv)
+
+    # 페이지가 같은 디렉토리의 모듈을 import할 수 있도록 경로 추가
+    sys.path.insert(0, ROOT)
+
+    result = run_load_test(args.page, args.sessions, args.duration)
+
+    print(f"페이지: {args.page}")
+    print(f"세션 {result['completed']}/{result['sessions']}개 완료, 총 {result['wall_seconds']:.2f}초")
+    print(f"세션당 서버 점유 시간: p50 {result['busy_p50'] * 1000:.1f}ms, p95 {result['busy_p95'] * 1000:.1f}ms")
+    print(f"워커당 분당 처리 세션 수: {result['sessions_per_worker_minute']:.1f}")
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,106 @@
+"""
+실시간 영상 분석 벤치마크
+
+정해진 프레임 속도로 합성 프레임을 VideoSpineAnalyzer에 공급하여
+처리 속도, 버린 프레임/검출 재사용 수, 평활화 전후 각도 흔들림을 측정한다.
+검출 좌표에는 실제 모델처럼 프레임마다 잡음을 더한다.
+
+사용 예:
+    python benchmarks/video_benchmark.py --fps 30 --seconds 5 --noise 3
+"""
+import argparse
+import os
+import sys
+import threading
+import time
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from image_processing import calculate_cobb_angle
+from spine_detector import StubSpineDetector, set_detector
+from video_analysis import VideoSpineAnalyzer
+
+class NoisyStubDetector(StubSpineDetector):
+    """스텁 검출 좌표에 가우시안 잡음을 더하는 검출기 (원시 각도도 기록)"""
+
+    def __init__(self, noise, seed=0):
+        super().__init__()
+        self.noise = noise
+        self.rng = np.random.default_rng(seed)
+        self.raw_angles = []
+
+    def _predict(self, images):
+        points = super()._predict(images) + self.rng.normal(0, self.noise, (len(images), 7, 2))
+        self.raw_angles.extend(calculate_cobb_angle(p) for p in points)
+        return points
+
+def make_frames(count, width, height, moving_every):
+    """
+    사람 대신 밝은 사각형이 있는 프레임 (moving_every 프레임마다 사각형이 옆으로 이동)
+    프레임마다 센서 잡음 수준의 작은 변화를 더한다.
+    """
+    rng = np.random.default_rng(1)
+    frames = []
+    offset = 0
+    for i in range(count):
+        if moving_every and i and i % moving_every == 0:
+            offset = (offset + width // 10) % (width // 2)
+        frame = np.full((height, width, 3), 60, dtype=np.uint8)
+        left = width // 4 + offset
+        frame[height // 6:height * 5 // 6, left:left + width // 4] = 200
+        frame += rng.integers(0, 4, (height, width, 1), dtype=np.uint8)
+        frames.append(frame)
+    return frames
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="실시간 영상 분석 벤치마크")
+    parser.add_argument('--fps', type=float, default=30.0, help="입력 프레임 속도")
+    parser.add_argument('--seconds', type=float, default=5.0, help="측정 시간")
+    parser.add_argument('--width', type=int, default=1280, help="프레임 너비")
+    parser.add_argument('--height', type=int, default=720, help="프레임 높이")
+    parser.add_argument('--noise', type=float, default=3.0, help="검출 좌표 잡음 (픽셀)")
+    parser.add_argument('--moving-every', type=int, default=10, help="장면이 바뀌는 프레임 간격 (0이면 정지)")
+    args = parser.parse_args(argv)
+
+    detector = NoisyStubDetector(args.noise)
+    set_detector(detector)
+
+    count = int(args.fps * args.seconds)
+    frames = make_frames(count, args.width, args.height, args.moving_every)
+    analyzer = VideoSpineAnalyzer()
+    smoothed_angles = []
+
+    def on_frame(frame):
+        result = analyzer.process(frame)
+        if result is not None:
+            smoothed_angles.append(result['angle'])
+
+    # webrtc처럼 프레임마다 별도 스레드에서 콜백 호출 (처리가 밀리면 버려짐)
+    interval = 1.0 / args.fps
+    threads = []
+    start = time.perf_counter()
+    for i, frame in enumerate(frames):
+        delay = start + i * interval - time.perf_counter()
+        if delay > 0:
+            time.sleep(delay)
+        thread = threading.Thread(target=on_frame, args=(frame,))
+        thread.start()
+        threads.append(thread)
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+
+    stats = analyzer.stats()
+    analyzed = stats['detections'] + stats['reused']
+    print(f"입력 {count}프레임 ({args.fps:.0f}fps, {args.width}x{args.height}), {elapsed:.1f}초")
+    print(f"분석 {analyzed}프레임 ({analyzed / elapsed:.1f}fps): 검출 {stats['detections']}, "
+          f"재사용 {stats['reused']}, 버림 {stats['dropped']}, 품질 미달 {stats['rejected']}")
+    print(f"각도 표준편차: 원시 {np.std(detector.raw_angles):.2f}°, "
+          f"평활화 {np.std(smoothed_angles[len(smoothed_angles) // 5:]):.2f}°")
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,173 @@
+"""
+정적 이미지 에셋 생성
+
+페이지에서 쓰는 안내 그림을 외부 이미지 대신 로컬에서 그려서 static/ 디렉토리에 저장한다.
+    - 표시 크기에 맞춰 미리 축소 (2배 크기로 그린 뒤 LANCZOS 축소로 경계를 부드럽게 처리)
+    - 파일 이름에 내용 해시를 붙여 그림이 바뀌면 URL도 바뀜 (브라우저 캐시 무효화)
+    - 이름 → 파일 매핑은 static/manifest.json에 기록 (assets.py가 읽음)
+
+Streamlit 정적 파일 서빙(.streamlit/config.toml의 server.enableStaticServing)으로 제공되며,
+URL에 버전 인자(?v=해시)가 있으면 Tornado가 긴 Cache-Control 헤더를 붙인다.
+
+사용 예:
+    python build_assets.py
+"""
+import argparse
+import hashlib
+import io
+import json
+import os
+import sys
+
+import numpy as np
+from PIL import Image, ImageDraw
+
+from assets import MANIFEST_NAME, STATIC_DIR
+
+# 그림을 그리는 배율 (축소 시 안티에일리어싱)
+SUPERSAMPLE = 2
+
+# 위험도별 그림의 척추 휨 정도(픽셀)와 강조 색상
+RISK_STYLES = {
+    'spine_low': (6, (76, 175, 80)),
+    'spine_medium': (22, (255, 152, 0)),
+    'spine_high': (42, (244, 67, 54))
+}
+
+def _canvas(size, top, bottom):
+    """세로 그라데이션 배경 (배율 적용 크기)"""
+    width, height = size[0] * SUPERSAMPLE, size[1] * SUPERSAMPLE
+    ramp = np.linspace(0.0, 1.0, height)[:, None, None]
+    gradient = (1 - ramp) * np.array(top) + ramp * np.array(bottom)
+    pixels = np.broadcast_to(gradient, (height, width, 3)).astype(np.uint8)
+    return Image.fromarray(pixels)
+
+def _draw_back(draw, center_x, top, scale, curve, accent, body=(236, 239, 241)):
+    """
+    후면 실루엣과 척추 포인트 그리기
+
+    Args:
+        draw: ImageDraw
+        center_x: 몸 중심 x 좌표
+        top: 머리 위쪽 y 좌표
+        scale: 크기 배율
+        curve: 척추 최대 좌우 편향 (scale 적용 전 픽셀)
+        accent: 척추 포인트 색상
+        body: 실루엣 색상
+    """
+    s = scale
+    draw.ellipse((center_x - 32 * s, top, center_x + 32 * s, top + 70 * s), fill=body)  # 머리
+    draw.rectangle((center_x - 14 * s, top + 66 * s, center_x + 14 * s, top + 86 * s), fill=body)  # 목
+    draw.rounded_rectangle((center_x - 78 * s, top + 84 * s, center_x + 78 * s, top + 300 * s),
+                           radius=40 * s, fill=body)  # 몸통
+    for side in (-1, 1):
+        draw.line((center_x + side * 70 * s, top + 110 * s, center_x + side * 108 * s, top + 280 * s),
+                  fill=body, width=int(26 * s))  # 팔
+        draw.line((center_x + side * 36 * s, top + 290 * s, center_x + side * 46 * s, top + 470 * s),
+                  fill=body, width=int(40 * s))  # 다리
+
+    # 척추 (C자형 편향)
+    count = 17
+    ys = np.linspace(top + 96 * s, top + 290 * s, count)
+    xs = center_x + curve * s * np.sin(np.linspace(0, np.pi, count))
+    draw.line(list(zip(xs.tolist(), ys.tolist())), fill=(120, 144, 156), width=int(4 * s))
+    radius = 6 * s
+    for x, y in zip(xs, ys):
+        draw.ellipse((x - radius, y - radius, x + radius, y + radius), fill=accent)
+
+def draw_hero():
+    """홈 화면 대표 그림 (800x420)"""
+    size = (800, 420)
+    image = _canvas(size, (227, 242, 253), (144, 202, 249))
+    draw = ImageDraw.Draw(image)
+    s = SUPERSAMPLE
+
+    # 배경 원
+    draw.ellipse((250 * s, 10 * s, 550 * s, 310 * s), fill=(187, 222, 251))
+    _draw_back(draw, 400 * s, 20 * s, 0.8 * s, 10, (30, 136, 229))
+
+    # 스마트폰
+    phone = (600 * s, 130 * s, 700 * s, 310 * s)
+    draw.rounded_rectangle(phone, radius=14 * s, fill=(38, 50, 56))
+    draw.rounded_rectangle((608 * s, 142 * s, 692 * s, 292 * s), radius=8 * s, fill=(224, 247, 250))
+    draw.line((620 * s, 270 * s, 650 * s, 180 * s, 680 * s, 250 * s), fill=(30, 136, 229), width=4 * s)
+    return image.resize(size, Image.LANCZOS)
+
+def draw_risk(name):
+    """위험도별 척추 그림 (600x600)"""
+    curve, accent = RISK_STYLES[name]
+    size = (600, 600)
+    image = _canvas(size, (250, 250, 250), (236, 239, 241))
+    draw = ImageDraw.Draw(image)
+    s = SUPERSAMPLE
+
+    draw.ellipse((150 * s, 40 * s, 450 * s, 340 * s), fill=tuple(int(c * 0.25 + 255 * 0.75) for c in accent))
+    _draw_back(draw, 300 * s, 40 * s, 1.05 * s, curve, accent, body=(207, 216, 220))
+    # 정상 척추 기준선
+    draw.line((300 * s, 140 * s, 300 * s, 350 * s), fill=(46, 125, 50), width=2 * s)
+    return image.resize(size, Image.LANCZOS)
+
+# 에셋 이름 → 그리기 함수
+ASSETS = {
+    'hero': draw_hero,
+    'spine_low': lambda: draw_risk('spine_low'),
+    'spine_medium': lambda: draw_risk('spine_medium'),
+    'spine_high': lambda: draw_risk('spine_high')
+}
+
+def build_assets(static_dir=STATIC_DIR):
+    """
+    모든 에셋을 그려 해시 파일 이름으로 저장하고 매니페스트 작성
+
+    이전 빌드의 파일 중 매니페스트에서 빠진 파일은 삭제한다.
+
+    Args:
+        static_dir: 출력 디렉토리
+
+    Returns:
+        매니페스트 딕셔너리 {이름: {'file', 'hash', 'width', 'height'}}
+    """
+    os.makedirs(static_dir, exist_ok=True)
+    manifest_path = os.path.join(static_dir, MANIFEST_NAME)
+    previous = {}
+    if os.path.exists(manifest_path):
+        with open(manifest_path, encoding='utf-8') as f:
+            previous = json.load(f)
+
+    manifest = {}
+    for name, draw in ASSETS.items():
+        image = draw()
+        buffer = io.BytesIO()
+        image.save(buffer, format='PNG', optimize=True)
+        data = buffer.getvalue()
+        digest = hashlib.sha1(data).hexdigest()[:10]
+
+        filename = f'{name}.{digest}.png'
+        with open(os.path.join(static_dir, filename), 'wb') as f:
+            f.write(data)
+        manifest[name] = {'file': filename, 'hash': digest, 'width': image.width, 'height': image.height}
+
+    current = {entry['file'] for entry in manifest.values()}
+    for entry in previous.values():
+        path = os.path.join(static_dir, entry['file'])
+        if entry['file'] not in current and os.path.exists(path):
+            os.remove(path)
+
+    with open(manifest_path, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+        f.write('\n')
+    return manifest
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="SpineCheck 정적 이미지 에셋 생성")
+    parser.add_argument('-o', '--output', default=STATIC_DIR, help="출력 디렉토리 (기본값: static/)")
+    args = parser.parse_args(argv)
+
+    manifest = build_assets(args.output)
+    for name, entry in sorted(manifest.items()):
+        size = os.path.getsize(os.path.join(args.output, entry['file']))
+        print(f"{name:<14}{entry['file']:<32}{entry['width']}x{entry['height']}  {size / 1024:.1f}KB")
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,190 @@
+"""
+다중 구간 Cobb 각도 계산
+
+척추 랜드마크(개수 제한 없음)에 부드러운 곡선을 맞추고, 각 척추 위치의 기울기를 구한 뒤
+기울기가 극값이 되는 지점(곡선의 변곡점)을 끝 척추로 삼아 구간별 Cobb 각도를 계산한다.
+S자 측만처럼 곡선이 여러 개인 경우에도 모든 구간을 찾으며,
+모든 계산은 (N, K) 배열 연산으로 곡선 여러 개를 한 번에 처리한다 (K에 대해 O(K)).
+"""
+from typing import NamedTuple
+
+import numpy as np
+
+# 계산 방식이 바뀌면 올려서 이전 버전의 캐시된 분석 결과를 무효화
+SOLVER_VERSION = 2
+
+class CobbSolution(NamedTuple):
+    """
+    solve_cobb_angles 결과 (N: 곡선 수, K: 랜드마크 수)
+
+    Attributes:
+        tilts: 각 척추 위치의 기울기 (N, K), 수직 기준 도 단위
+        inflections: 곡선 내부 변곡점 여부 (N, K)
+        segment_angles: 구간별 Cobb 각도 (N, K - 1), 위에서부터 채우고 나머지는 NaN
+        segment_bounds: 구간의 상부/하부 끝 척추 인덱스 (N, K - 1, 2), 빈 칸은 -1
+        segment_counts: 곡선별 구간 수 (N,)
+        major_angle: 곡선별 최대 Cobb 각도 (N,)
+    """
+    tilts: np.ndarray
+    inflections: np.ndarray
+    segment_angles: np.ndarray
+    segment_bounds: np.ndarray
+    segment_counts: np.ndarray
+    major_angle: np.ndarray
+
+def smooth_spine_curve(points, passes=None):
+    """
+    랜드마크 곡선 평활화 ([1, 2, 1] / 4 이항 필터 반복, 양 끝점은 유지)
+
+    Args:
+        points: 척추 포인트 배열 (N, K, 2)
+        passes: 필터 반복 횟수 (None이면 K // 8, 랜드마크가 촘촘할수록 많이 평활화)
+
+    Returns:
+        평활화된 포인트 배열 (N, K, 2), float64
+    """
+    smoothed = np.array(points, dtype=np.float64)
+    if passes is None:
+        passes = smoothed.shape[1] // 8
+
+    for _ in range(passes):
+        smoothed[:, 1:-1] = 0.25 * smoothed[:, :-2] + 0.5 * smoothed[:, 1:-1] + 0.25 * smoothed[:, 2:]
+
+    return smoothed
+
+def vertebra_tilts(points):
+    """
+    각 척추 위치의 기울기 (곡선 접선과 수직선 사이의 각도)
+
+    Args:
+        points: 척추 포인트 배열 (N, K, 2), 위에서 아래 순서
+
+    Returns:
+        기울기 배열 (N, K), 도 단위 (오른쪽 아래로 기울면 양수)
+    """
+    # 내부는 중앙 차분, 양 끝은 한쪽 차분
+    dx = np.gradient(points[..., 0], axis=1)
+    dy = np.gradient(points[..., 1], axis=1)
+    return np.degrees(np.arctan2(dx, dy))
+
+def _fill_zero_signs(signs):
+    """
+    0인 부호를 직전(없으면 직후) 부호로 채움 - 기울기가 평평한 구간을 극값으로 보지 않기 위함
+
+    Args:
+        signs: 부호 배열 (N, M), 값은 -1, 0, 1
+
+    Returns:
+        0이 채워진 부호 배열 (N, M)
+    """
+    count, length = signs.shape
+    positions = np.arange(length)
+    nonzero = signs != 0
+
+    # 직전 비영 부호 (앞으로 채우기)
+    last = np.maximum.accumulate(np.where(nonzero, positions, -1), axis=1)
+    filled = np.where(last >= 0, np.take_along_axis(signs, np.maximum(last, 0), axis=1), 0)
+
+    # 앞부분에 남은 0은 첫 비영 부호로 채우기
+    first = np.argmax(nonzero, axis=1)
+    first_sign = signs[np.arange(count), first]
+    return np.where(filled == 0, first_sign[:, np.newaxis], filled)
+
+def solve_cobb_angles(points, smooth_passes=None, tolerance=0.5):
+    """
+    척추 곡선들의 구간별 Cobb 각도 계산
+
+    끝 척추(기울기가 가장 큰 척추)는 기울기의 극값 위치, 즉 곡선의 변곡점과 양 끝점이다.
+    이웃한 두 끝 척추 사이가 하나의 곡선 구간이며, 구간의 Cobb 각도는 두 끝 척추 기울기의 차이다.
+
+    Args:
+        points: 척추 포인트 배열 (N, K, 2) 또는 곡선 하나 (K, 2), 위에서 아래 순서
+        smooth_passes: 평활화 반복 횟수 (None이면 K // 8)
+        tolerance: 이보다 작은 기울기 변화(도)는 평평한 것으로 보고 극값 판단에서 제외
+
+    Returns:
+        CobbSolution (곡선 하나를 넣어도 N = 1인 배치로 반환)
+    """
+    points = np.asarray(points, dtype=np.float64)
+    if points.ndim == 2:
+        points = points[np.newaxis]
+    if points.ndim != 3 or points.shape[-1] != 2:
+        raise ValueError(f"points는 (N, K, 2) 형태여야 합니다: {points.shape}")
+
+    count, length = points.shape[:2]
+    if length < 2:
+        return CobbSolution(
+            tilts=np.zeros((count, length)),
+            inflections=np.zeros((count, length), dtype=bool),
+            segment_angles=np.full((count, 0), np.nan),
+            segment_bounds=np.full((count, 0, 2), -1, dtype=np.int64),
+            segment_counts=np.zeros(count, dtype=np.int64),
+            major_angle=np.zeros(count)
+        )
+
+    tilts = vertebra_tilts(smooth_spine_curve(points, smooth_passes))
+
+    # 기울기 변화의 부호가 바뀌는 곳이 기울기 극값 (곡선의 변곡점)
+    deltas = np.diff(tilts, axis=1)
+    signs = np.where(np.abs(deltas) < tolerance, 0, np.sign(deltas)).astype(np.int8)
+    signs = _fill_zero_signs(signs)
+
+    inflections = np.zeros((count, length), dtype=bool)
+    inflections[:, 1:-1] = signs[:, :-1] * signs[:, 1:] < 0
+
+    # 끝 척추 = 변곡점 + 양 끝점
+    ends = inflections.copy()
+    ends[:, 0] = True
+    ends[:, -1] = True
+
+    # 각 끝 척추의 직전 끝 척추 인덱스
+    positions = np.arange(length)
+    last_end = np.maximum.accumulate(np.where(ends, positions, -1), axis=1)
+    previous_end = np.empty_like(last_end)
+    previous_end[:, 0] = -1
+    previous_end[:, 1:] = last_end[:, :-1]
+
+    # 구간은 끝 척추마다 (첫 끝점 제외) 하나씩
+    is_segment_end = ends.copy()
+    is_segment_end[:, 0] = False
+    angles = np.abs(tilts - np.take_along_axis(tilts, np.maximum(previous_end, 0), axis=1))
+
+    # 구간을 위에서부터 왼쪽 정렬하여 (N, K - 1) 배열로 모음
+    rows, cols = np.nonzero(is_segment_end)
+    slots = np.cumsum(is_segment_end, axis=1)[rows, cols] - 1
+
+    segment_angles = np.full((count, length - 1), np.nan)
+    segment_bounds = np.full((count, length - 1, 2), -1, dtype=np.int64)
+    segment_angles[rows, slots] = angles[rows, cols]
+    segment_bounds[rows, slots, 0] = previous_end[rows, cols]
+    segment_bounds[rows, slots, 1] = cols
+
+    return CobbSolution(
+        tilts=tilts,
+        inflections=inflections,
+        segment_angles=segment_angles,
+        segment_bounds=segment_bounds,
+        segment_counts=is_segment_end.sum(axis=1),
+        major_angle=np.nanmax(segment_angles, axis=1)
+    )
+
+def curve_segments(solution, index=0):
+    """
+    곡선 하나의 구간 목록
+
+    Args:
+        solution: CobbSolution
+        index: 배치 내 곡선 번호
+
+    Returns:
+        [{'upper': 상부 끝 척추 인덱스, 'lower': 하부 끝 척추 인덱스, 'angle': Cobb 각도}, ...]
+    """
+    count = solution.segment_counts[index]
+    return [
+        {
+            'upper': int(solution.segment_bounds[index, i, 0]),
+            'lower': int(solution.segment_bounds[index, i, 1]),
+            'angle': float(solution.segment_angles[index, i])
+        }
+        for i in range(count)
+    ]
@@ -0,0 +1,108 @@
+"""
+촬영 이미지/분석 결과 ZIP 내보내기
+
+촬영 이미지(수집 시 인코딩된 JPEG), 분석 오버레이, 결과 JSON을 ZIP 파일 하나로 묶는다.
+이미 압축된 JPEG은 다시 압축하지 않고(ZIP_STORED) 그대로 기록하며,
+ZIP은 사용자가 요청할 때만 만들고 입력(방향별 분석 키, 결과 id)이 같으면 만든 바이트를 재사용한다.
+"""
+import io
+import json
+import zipfile
+
+from lazy_import import lazy_import
+
+cv2 = lazy_import('cv2')
+
+# 오버레이 JPEG 품질
+OVERLAY_JPEG_QUALITY = 90
+
+def export_fingerprint(analysis, view_results, result=None):
+    """
+    ZIP 내용을 결정하는 입력의 지문
+
+    Args:
+        analysis: ViewAnalysisOrchestrator (방향별 이미지 키)
+        view_results: ZIP에 넣을 방향별 분석 결과 {촬영 방향: 분석 결과}
+        result: 병합 결과 딕셔너리 (없으면 None)
+
+    Returns:
+        비교 가능한 튜플
+    """
+    return (
+        tuple(sorted(analysis.dependencies().items())),
+        tuple(sorted(view_results)),
+        result['id'] if result is not None else None
+    )
+
+def build_export_zip(images, view_results, result=None):
+    """
+    ZIP 파일 생성
+
+    Args:
+        images: {촬영 방향: IngestedImage 또는 None}
+        view_results: {촬영 방향: 분석 결과 (points, angle, segments, overlay)}
+        result: 병합 결과 딕셔너리 (없으면 방향별 분석 결과만 JSON으로 저장)
+
+    Returns:
+        ZIP 바이트
+    """
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, 'w') as archive:
+        for view, image in images.items():
+            if image is not None:
+                archive.writestr(f'spine_{view}.jpg', image.encoded, compress_type=zipfile.ZIP_STORED)
+
+        for view, view_result in view_results.items():
+            overlay = view_result.get('overlay')
+            if overlay is None:
+                continue
+            ok, encoded = cv2.imencode('.jpg', overlay, [cv2.IMWRITE_JPEG_QUALITY, OVERLAY_JPEG_QUALITY])
+            if ok:
+                archive.writestr(f'spine_{view}_analysis.jpg', encoded.tobytes(), compress_type=zipfile.ZIP_STORED)
+
+        if result is None:
+            result = {
+                'views': {
+                    view: {key: value for key, value in view_result.items() if key != 'overlay'}
+                    for view, view_result in view_results.items()
+                }
+            }
+        archive.writestr(
+            'result.json',
+            json.dumps(result, ensure_ascii=False, indent=2),
+            compress_type=zipfile.ZIP_DEFLATED
+        )
+
+    return buffer.getvalue()
+
+class ExportCache:
+    """
+    세션별 ZIP 캐시 (마지막으로 만든 ZIP 하나만 보관)
+
+    같은 지문으로 다시 요청하면 ZIP을 다시 만들지 않는다.
+    """
+
+    def __init__(self):
+        self.fingerprint = None
+        self.data = None
+
+    def get(self, fingerprint):
+        """
+        캐시된 ZIP
+
+        Returns:
+            지문이 같으면 ZIP 바이트, 아니면 None
+        """
+        return self.data if self.fingerprint == fingerprint else None
+
+    def build(self, fingerprint, images, view_results, result=None):
+        """
+        ZIP을 만들어 캐시 (지문이 같으면 캐시된 바이트 반환)
+
+        Returns:
+            ZIP 바이트
+        """
+        if self.fingerprint != fingerprint:
+            self.data = build_export_zip(images, view_results, result)
+            self.fingerprint = fingerprint
+        return self.data
@@ -0,0 +1,135 @@
+"""
+대원 거리(haversine) 계산
+
+위경도(도) 좌표 사이의 구면 거리를 NumPy로 한 번에 계산한다.
+    - haversine_km: 브로드캐스팅 가능한 일반 형태 (한 지점 ↔ 여러 지점 포함)
+    - distances_from: 라디안 좌표와 위도 코사인을 미리 계산해 둔 여러 지점까지의 거리 (인덱스 검색용)
+    - distance_matrix: 사용자 여러 명 × 병원 여러 곳 거리 행렬 (행 단위로 나눠 계산하여 임시 메모리 제한)
+    - nearest_k: 사용자별 가장 가까운 병원 k곳 (전체 행렬을 만들지 않음)
+
+평면 근사(위도·경도 1도 = 111km)는 국내 위도에서 경도 1도(약 88km)를 25% 이상 길게 잡으므로 사용하지 않는다.
+"""
+import numpy as np
+
+# 지구 평균 반지름 (km)
+EARTH_RADIUS_KM = 6371.0088
+
+# distance_matrix/nearest_k가 한 번에 계산하는 최대 원소 수 (행 수 × 병원 수)
+DEFAULT_CHUNK_ELEMENTS = 4_000_000
+
+def haversine_km(lat1, lon1, lat2, lon2):
+    """
+    두 좌표 사이의 대원 거리
+
+    Args:
+        lat1, lon1: 출발 위도/경도 (도, 스칼라 또는 배열)
+        lat2, lon2: 도착 위도/경도 (도, 스칼라 또는 배열, 출발 좌표와 브로드캐스팅 가능한 모양)
+
+    Returns:
+        거리 (km, 브로드캐스팅된 모양의 배열)
+    """
+    lat1, lon1, lat2, lon2 = (np.radians(np.asarray(value, dtype=np.float64)) for value in (lat1, lon1, lat2, lon2))
+    a = np.sin((lat2 - lat1) / 2) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.minimum(a, 1.0)))
+
+def distances_from(lat, lon, lat_rad, lon_rad, cos_lat):
+    """
+    한 지점에서 여러 지점까지의 대원 거리 (도착 좌표는 미리 변환된 값 사용)
+
+    Args:
+        lat, lon: 출발 위도/경도 (도)
+        lat_rad, lon_rad: 도착 위도/경도 배열 (라디안)
+        cos_lat: 도착 위도의 코사인 배열
+
+    Returns:
+        거리 배열 (km)
+    """
+    lat0, lon0 = np.radians(lat), np.radians(lon)
+    a = np.sin((lat_rad - lat0) / 2) ** 2 + np.cos(lat0) * cos_lat * np.sin((lon_rad - lon0) / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.minimum(a, 1.0)))
+
+def _row_chunks(rows, columns, chunk_elements):
+    """행 단위 계산 구간 (한 구간의 원소 수가 chunk_elements 이하)"""
+    step = max(1, chunk_elements // max(columns, 1))
+    for start in range(0, rows, step):
+        yield start, min(start + step, rows)
+
+def _half_angles(lat, lon):
+    """
+    행렬 계산용 좌표 변환 (위도/경도 반각의 사인·코사인, 위도 코사인)
+
+    sin((b - a) / 2) = sin(b/2)cos(a/2) - cos(b/2)sin(a/2)로 전개하면
+    행렬 원소마다 삼각함수를 다시 계산하지 않고 곱셈만으로 haversine 항을 구할 수 있다.
+    """
+    lat = np.radians(np.asarray(lat, dtype=np.float64))
+    lon = np.radians(np.asarray(lon, dtype=np.float64))
+    return np.sin(lat / 2), np.cos(lat / 2), np.sin(lon / 2), np.cos(lon / 2), np.cos(lat)
+
+def _distance_block(rows, columns, start, end):
+    """rows[start:end] × columns 거리 블록 (km, float64)"""
+    sin_lat1, cos_lat1_half, sin_lon1, cos_lon1, cos_lat1 = (value[start:end, None] for value in rows)
+    sin_lat2, cos_lat2_half, sin_lon2, cos_lon2, cos_lat2 = (value[None, :] for value in columns)
+
+    a = sin_lat2 * cos_lat1_half
+    a -= cos_lat2_half * sin_lat1
+    a *= a
+    b = sin_lon2 * cos_lon1
+    b -= cos_lon2 * sin_lon1
+    b *= b
+    b *= cos_lat1
+    b *= cos_lat2
+    a += b
+    np.minimum(a, 1.0, out=a)
+    np.sqrt(a, out=a)
+    np.arcsin(a, out=a)
+    a *= 2 * EARTH_RADIUS_KM
+    return a
+
+def distance_matrix(lat1, lon1, lat2, lon2, dtype=np.float64, chunk_elements=DEFAULT_CHUNK_ELEMENTS):
+    """
+    여러 출발지 × 여러 도착지 거리 행렬
+
+    Args:
+        lat1, lon1: 출발 위도/경도 배열 (도, 길이 M)
+        lat2, lon2: 도착 위도/경도 배열 (도, 길이 N)
+        dtype: 결과 행렬 자료형 (대규모 배치 작업은 np.float32로 메모리 절반)
+        chunk_elements: 한 번에 계산하는 최대 원소 수
+
+    Returns:
+        (M, N) 거리 행렬 (km)
+    """
+    rows, columns = _half_angles(lat1, lon1), _half_angles(lat2, lon2)
+    result = np.empty((len(rows[0]), len(columns[0])), dtype=dtype)
+    for start, end in _row_chunks(len(rows[0]), len(columns[0]), chunk_elements):
+        result[start:end] = _distance_block(rows, columns, start, end)
+    return result
+
+def nearest_k(lat1, lon1, lat2, lon2, k, chunk_elements=DEFAULT_CHUNK_ELEMENTS):
+    """
+    출발지별 가장 가까운 도착지 k곳 (배치 의뢰 작업용, 전체 거리 행렬을 만들지 않음)
+
+    Args:
+        lat1, lon1: 출발 위도/경도 배열 (도, 길이 M)
+        lat2, lon2: 도착 위도/경도 배열 (도, 길이 N)
+        k: 출발지별 결과 수 (N보다 크면 N)
+        chunk_elements: 한 번에 계산하는 최대 원소 수
+
+    Returns:
+        (도착지 번호 (M, k) 배열, 거리 (M, k) 배열), 각 행은 거리순
+    """
+    rows, columns = _half_angles(lat1, lon1), _half_angles(lat2, lon2)
+    count, k = len(rows[0]), min(k, len(columns[0]))
+
+    indices = np.empty((count, k), dtype=np.int64)
+    distances = np.empty((count, k), dtype=np.float64)
+    for start, end in _row_chunks(count, len(columns[0]), chunk_elements):
+        block = _distance_block(rows, columns, start, end)
+        if k < block.shape[1]:
+            nearest = np.argpartition(block, k - 1, axis=1)[:, :k]
+        else:
+            nearest = np.broadcast_to(np.arange(block.shape[1]), block.shape)
+        nearest_distances = np.take_along_axis(block, nearest, axis=1)
+        order = np.argsort(nearest_distances, axis=1, kind='stable')
+        indices[start:end] = np.take_along_axis(nearest, order, axis=1)
+        distances[start:end] = np.take_along_axis(nearest_distances, order, axis=1)
+    return indices, distances
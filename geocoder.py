@@ -0,0 +1,306 @@
+"""
+오프라인 주소 지오코더
+
+로컬 주소 파일(도로명 주소와 지번 주소별 좌표)을 주소 단위(시도 → 시군구 → 도로명/법정동 → 번호) 트라이로 읽어
+외부 지오코딩 서비스 없이 주소를 좌표로 바꾼다.
+    - 번호까지 일치하면 해당 좌표, 같은 도로의 번호 사이면 앞뒤 번호 좌표를 선형 보간
+    - 도로명/동이나 시군구까지만 일치하면 그 아래 모든 주소의 중심 좌표 (노드마다 합계를 저장하여 바로 계산)
+    - '서울', '서울시' 같은 시도 약칭, '번지' 접미사, 괄호 속 참고 항목, 붙여 쓴 번호('테헤란로123')를 정규화
+    - 시도/시군구를 생략하고 도로명/동부터 입력해도('테헤란로 152') 도로명 색인으로 찾음
+    - 정규화한 질의 문자열 기준 LRU 캐시
+
+SPINECHECK_ADDRESSES 환경 변수로 주소 파일을 지정한다 (기본값 data/addresses.csv).
+"""
+import csv
+import os
+import re
+import threading
+from collections import OrderedDict
+from typing import NamedTuple
+
+import numpy as np
+
+DEFAULT_ADDRESSES_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'addresses.csv')
+
+# 질의 캐시 크기
+DEFAULT_CACHE_SIZE = 1024
+
+# 시도 약칭 → 정식 명칭
+SIDO_ALIASES = {
+    '서울': '서울특별시', '서울시': '서울특별시',
+    '부산': '부산광역시', '부산시': '부산광역시',
+    '대구': '대구광역시', '대구시': '대구광역시',
+    '인천': '인천광역시', '인천시': '인천광역시',
+    '광주': '광주광역시', '광주시': '광주광역시',
+    '대전': '대전광역시', '대전시': '대전광역시',
+    '울산': '울산광역시', '울산시': '울산광역시',
+    '세종': '세종특별자치시', '세종시': '세종특별자치시',
+    '경기': '경기도', '강원': '강원특별자치도', '강원도': '강원특별자치도',
+    '충북': '충청북도', '충남': '충청남도', '전북': '전북특별자치도', '전라북도': '전북특별자치도',
+    '전남': '전라남도', '경북': '경상북도', '경남': '경상남도',
+    '제주': '제주특별자치도', '제주도': '제주특별자치도'
+}
+
+# 건물 번호/지번 ('396', '123-4', '123-4번지')
+_NUMBER_PATTERN = re.compile(r'^(\d+)(?:-(\d+))?(?:번지)?$')
+
+# 도로명에 번호를 붙여 쓴 경우 ('테헤란로123')
+_ROAD_NUMBER_PATTERN = re.compile(r'^(.+(?:로|길))(\d+(?:-\d+)?)$')
+
+class GeocodeResult(NamedTuple):
+    """
+    지오코딩 결과
+
+    Attributes:
+        lat, lon: 좌표 (도)
+        address: 일치한 주소 (정규화된 형태)
+        precision: 'exact'(번호 일치), 'interpolated'(번호 보간), 'street'(도로/동 중심), 'area'(시도/시군구 중심)
+    """
+    lat: float
+    lon: float
+    address: str
+    precision: str
+
+class _Node:
+    __slots__ = ('children', 'count', 'lat_sum', 'lon_sum', 'point', 'numbers')
+
+    def __init__(self):
+        self.children = {}
+        self.count = 0
+        self.lat_sum = 0.0
+        self.lon_sum = 0.0
+        self.point = None
+        self.numbers = None  # 보간용 (번호 배열, 위도 배열, 경도 배열)
+
+    def centroid(self):
+        return self.lat_sum / self.count, self.lon_sum / self.count
+
+def normalize_address(query):
+    """
+    주소 질의 정규화
+
+    Args:
+        query: 주소 문자열
+
+    Returns:
+        토큰 목록
+    """
+    query = re.sub(r'\(.*?\)', ' ', query).replace(',', ' ')
+    tokens = query.split()
+    if tokens:
+        tokens[0] = SIDO_ALIASES.get(tokens[0], tokens[0])
+    return tokens
+
+def _parse_number(token):
+    match = _NUMBER_PATTERN.match(token)
+    if match is None:
+        return None
+    return int(match.group(1)), int(match.group(2) or 0)
+
+class OfflineGeocoder:
+    """
+    주소 트라이 기반 지오코더
+
+    Args:
+        entries: (주소 문자열, 위도, 경도) 목록
+        cache_size: 질의 캐시 크기
+    """
+
+    def __init__(self, entries, cache_size=DEFAULT_CACHE_SIZE):
+        self._root = _Node()
+        for address, lat, lon in entries:
+            self._insert(normalize_address(address), float(lat), float(lon))
+        # 도로명/동 이름 → [(상위 주소 토큰 목록, 상위 노드)] (시군구를 생략한 질의용)
+        self._streets = {}
+        self._build_numbers(self._root, [], None)
+
+        self.cache_size = cache_size
+        self._cache = OrderedDict()
+        self._cache_lock = threading.Lock()
+
+    @classmethod
+    def from_csv(cls, path=DEFAULT_ADDRESSES_PATH, **kwargs):
+        """address, lat, lon 열이 있는 CSV 파일로 생성"""
+        with open(path, encoding='utf-8', newline='') as f:
+            reader = csv.DictReader(f)
+            return cls(((row['address'], row['lat'], row['lon']) for row in reader), **kwargs)
+
+    def _insert(self, tokens, lat, lon):
+        node = self._root
+        for token in [None] + tokens:
+            if token is not None:
+                node = node.children.setdefault(token, _Node())
+            node.count += 1
+            node.lat_sum += lat
+            node.lon_sum += lon
+        node.point = (lat, lon)
+
+    def _build_numbers(self, node, path, parent):
+        """번호 자식이 있는 노드(도로/동)마다 본번 순 좌표 배열과 도로명 색인 생성"""
+        numbered = []
+        for token, child in node.children.items():
+            number = _parse_number(token)
+            if number is not None and number[1] == 0 and child.point is not None:
+                numbered.append((number[0],) + child.point)
+            else:
+                self._build_numbers(child, path + [token], node)
+        if numbered:
+            numbered.sort()
+            node.numbers = tuple(np.array(column, dtype=np.float64) for column in zip(*numbered))
+            if parent is not None:
+                self._streets.setdefault(path[-1], []).append((path[:-1], parent))
+
+    def _find_street(self, tokens):
+        """
+        시군구를 생략한 질의의 도로명/동 찾기
+
+        같은 이름의 도로가 여러 시군구에 있으면 다음 토큰(번호)을 가진 도로, 없으면 주소가 가장 많은 도로
+
+        Returns:
+            (상위 주소 토큰 목록, 상위 노드), 없으면 None
+        """
+        name = tokens[0]
+        if name not in self._streets:
+            split = _ROAD_NUMBER_PATTERN.match(name)
+            if split is None or split.group(1) not in self._streets:
+                return None
+            name, tokens = split.group(1), [split.group(1), split.group(2)]
+        candidates = self._streets[name]
+        following = tokens[1] if len(tokens) > 1 else None
+        return max(candidates, key=lambda candidate: (following in candidate[1].children[name].children,
+                                                      candidate[1].children[name].count))
+
+    def _locate(self, tokens):
+        """
+        토큰을 트라이에서 최대한 따라가기
+
+        Returns:
+            (마지막 노드, 일치한 토큰 목록, 목록에 없는 번호 (본번, 부번) 또는 None, 모든 토큰 일치 여부)
+        """
+        node, matched = self._root, []
+        tokens = list(tokens)
+
+        # 시도를 생략한 경우 두 번째 단계(시군구)에서, 시군구까지 생략한 경우 도로명 색인에서 찾음
+        if tokens and tokens[0] not in node.children:
+            for sido, child in node.children.items():
+                if tokens[0] in child.children:
+                    node = child
+                    matched.append(sido)
+                    break
+            else:
+                street = self._find_street(tokens)
+                if street is not None:
+                    matched, node = list(street[0]), street[1]
+
+        for token in tokens:
+            child = node.children.get(token)
+            if child is None:
+                split = _ROAD_NUMBER_PATTERN.match(token)
+                if split is not None and split.group(1) in node.children:
+                    node = node.children[split.group(1)]
+                    matched.append(split.group(1))
+                    token = split.group(2)
+                    child = node.children.get(token)
+                if child is None:
+                    # 번호가 목록에 없으면 보간, 그 밖의 토큰(건물명, 층 등)부터는 무시
+                    number = _parse_number(token) if node.numbers is not None else None
+                    return node, matched, number, False
+            node = child
+            matched.append(token)
+        return node, matched, None, True
+
+    def _resolve(self, tokens):
+        node, matched, number, _ = self._locate(tokens)
+        if node is self._root:
+            return None
+
+        if number is not None:
+            numbers, lats, lons = node.numbers
+            main, sub = number
+            address = ' '.join(matched + [f'{main}-{sub}' if sub else str(main)])
+            exact = node.children.get(str(main))
+            if exact is not None and exact.point is not None:
+                # 부번이 목록에 없으면 본번 좌표로 추정
+                return GeocodeResult(exact.point[0], exact.point[1], address, 'exact' if sub == 0 else 'interpolated')
+            if numbers[0] <= main <= numbers[-1]:
+                return GeocodeResult(float(np.interp(main, numbers, lats)), float(np.interp(main, numbers, lons)),
+                                     address, 'interpolated')
+            # 도로의 번호 범위 밖이면 도로 중심 (마지막 건물 좌표로 고정하지 않음)
+            lat, lon = node.centroid()
+            return GeocodeResult(lat, lon, ' '.join(matched), 'street')
+
+        if node.point is not None:
+            return GeocodeResult(node.point[0], node.point[1], ' '.join(matched), 'exact')
+        lat, lon = node.centroid()
+        precision = 'street' if node.numbers is not None else 'area'
+        return GeocodeResult(lat, lon, ' '.join(matched), precision)
+
+    def geocode(self, query):
+        """
+        주소를 좌표로 변환
+
+        Args:
+            query: 주소 문자열 (도로명 주소 또는 지번 주소, 일부만 입력해도 됨)
+
+        Returns:
+            GeocodeResult, 일치하는 주소가 없으면 None
+        """
+        key = ' '.join(normalize_address(query))
+        with self._cache_lock:
+            if key in self._cache:
+                self._cache.move_to_end(key)
+                return self._cache[key]
+
+        result = self._resolve(key.split())
+
+        with self._cache_lock:
+            self._cache[key] = result
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        return result
+
+    def suggest(self, query, limit=5):
+        """
+        주소 자동 완성 (마지막 토큰은 접두어로 검색, 주소가 많은 순)
+
+        Args:
+            query: 입력 중인 주소 문자열
+            limit: 최대 후보 수
+
+        Returns:
+            주소 문자열 목록
+        """
+        tokens = normalize_address(query)
+        if not tokens:
+            return []
+        partial = '' if query.endswith(' ') else tokens.pop()
+
+        node, matched, _, complete = self._locate(tokens)
+        if not complete:
+            return []
+        candidates = [(child.count, ' '.join(matched + [token]))
+                      for token, child in node.children.items() if token.startswith(partial)]
+        if not tokens and partial:
+            # 첫 토큰 입력 중이면 도로명/동 이름도 후보 ('테헤란' → '서울특별시 강남구 테헤란로')
+            candidates += [(parent.children[name].count, ' '.join(path + [name]))
+                           for name, streets in self._streets.items() if name.startswith(partial)
+                           for path, parent in streets]
+        candidates.sort(key=lambda item: (-item[0], item[1]))
+        return [address for _, address in candidates[:limit]]
+
+_geocoder = None
+_geocoder_lock = threading.Lock()
+
+def get_geocoder():
+    """
+    프로세스 전체에서 공유하는 지오코더 반환 (처음 호출할 때 주소 파일을 읽어 생성)
+
+    Returns:
+        OfflineGeocoder (SPINECHECK_ADDRESSES 경로)
+    """
+    global _geocoder
+
+    with _geocoder_lock:
+        if _geocoder is None:
+            _geocoder = OfflineGeocoder.from_csv(os.environ.get('SPINECHECK_ADDRESSES', DEFAULT_ADDRESSES_PATH))
+        return _geocoder
@@ -0,0 +1,228 @@
+"""
+진단 이력 저장소
+
+진단 결과(각도, 위험도, 방향별 척추 포인트, 저장 시각)를 로컬 SQLite 파일에 저장한다.
+    - (user_id, created_at) 인덱스로 사용자별 최신순 조회, 각도 추이는 인덱스만 읽어서 처리
+    - 여러 결과는 한 트랜잭션의 executemany로 저장
+    - 목록 조회는 키셋 페이지네이션 (OFFSET 없이 마지막 행 기준으로 다음 페이지 조회)
+
+SPINECHECK_HISTORY_DB 환경 변수로 파일 위치를 지정한다 (기본값 data/history.db).
+"""
+import json
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from typing import NamedTuple
+
+import numpy as np
+
+DEFAULT_HISTORY_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'history.db')
+
+# 목록 조회 기본 페이지 크기
+DEFAULT_PAGE_SIZE = 50
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS diagnoses (
+    id INTEGER PRIMARY KEY,
+    result_id TEXT NOT NULL UNIQUE,
+    user_id TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    angle REAL NOT NULL,
+    risk_level TEXT NOT NULL,
+    risk_color TEXT,
+    views TEXT NOT NULL
+);
+-- 사용자별 최신순 목록 (인덱스 끝의 rowid가 같은 시각의 순서를 정함)
+CREATE INDEX IF NOT EXISTS idx_diagnoses_user_time ON diagnoses (user_id, created_at);
+-- 각도 추이 (angle까지 포함하여 테이블을 읽지 않음)
+CREATE INDEX IF NOT EXISTS idx_diagnoses_user_trend ON diagnoses (user_id, created_at, angle);
+"""
+
+_COLUMNS = 'id, result_id, user_id, created_at, angle, risk_level, risk_color, views'
+
+class HistoryPage(NamedTuple):
+    """
+    이력 목록 한 페이지
+
+    Attributes:
+        records: 결과 딕셔너리 목록 (최신순)
+        next_cursor: 다음 페이지 조회에 넘길 커서 (마지막 페이지면 None)
+    """
+    records: list
+    next_cursor: tuple
+
+class HistoryStore:
+    """
+    SQLite 진단 이력 저장소
+
+    연결은 스레드별로 만들며(Streamlit 세션마다 스레드가 다름), WAL 모드로 읽기와 쓰기가 서로 막지 않는다.
+
+    Args:
+        path: 데이터베이스 파일 경로 (':memory:'이면 메모리, 스레드 간 공유 안 됨)
+    """
+
+    def __init__(self, path=DEFAULT_HISTORY_PATH):
+        self.path = path
+        self._local = threading.local()
+        if path != ':memory:':
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._connection().executescript(_SCHEMA)
+
+    def _connection(self):
+        connection = getattr(self._local, 'connection', None)
+        if connection is None:
+            connection = sqlite3.connect(self.path, timeout=10)
+            connection.execute('PRAGMA journal_mode=WAL')
+            connection.execute('PRAGMA synchronous=NORMAL')
+            self._local.connection = connection
+        return connection
+
+    def save(self, user_id, result, created_at=None):
+        """
+        진단 결과 하나 저장 (같은 결과 id는 한 번만 저장)
+
+        Args:
+            user_id: 사용자 ID
+            result: st.session_state.result 형식의 결과 딕셔너리
+            created_at: 저장 시각 (Unix 초, None이면 현재 시각)
+
+        Returns:
+            새로 저장되었으면 True (이미 저장된 결과면 False)
+        """
+        return self.save_many([(user_id, result, created_at)]) == 1
+
+    def save_many(self, entries):
+        """
+        여러 진단 결과를 한 트랜잭션으로 저장
+
+        Args:
+            entries: (user_id, 결과 딕셔너리, created_at 또는 None) 목록
+
+        Returns:
+            새로 저장된 결과 수
+        """
+        now = time.time()
+        rows = [
+            (
+                result.get('id') or uuid.uuid4().hex,
+                str(user_id),
+                created_at if created_at is not None else now,
+                float(result['angle']),
+                result['risk_level'],
+                result.get('risk_color'),
+                json.dumps(result.get('views', {}), separators=(',', ':'))
+            )
+            for user_id, result, created_at in entries
+        ]
+
+        connection = self._connection()
+        with connection:
+            before = connection.total_changes
+            connection.executemany(
+                'INSERT OR IGNORE INTO diagnoses '
+                '(result_id, user_id, created_at, angle, risk_level, risk_color, views) '
+                'VALUES (?, ?, ?, ?, ?, ?, ?)',
+                rows
+            )
+            return connection.total_changes - before
+
+    def list_results(self, user_id, limit=DEFAULT_PAGE_SIZE, cursor=None):
+        """
+        사용자의 진단 이력 최신순 조회
+
+        Args:
+            user_id: 사용자 ID
+            limit: 페이지 크기
+            cursor: 이전 페이지의 next_cursor (None이면 첫 페이지)
+
+        Returns:
+            HistoryPage
+        """
+        query = f'SELECT {_COLUMNS} FROM diagnoses WHERE user_id = ?'
+        params = [str(user_id)]
+        if cursor is not None:
+            # (created_at, id)가 이전 페이지 마지막 행보다 앞선 행부터
+            query += ' AND (created_at, id) < (?, ?)'
+            params.extend(cursor)
+        query += ' ORDER BY created_at DESC, id DESC LIMIT ?'
+        params.append(limit + 1)
+
+        rows = self._connection().execute(query, params).fetchall()
+        has_more = len(rows) > limit
+        rows = rows[:limit]
+
+        next_cursor = (rows[-1][3], rows[-1][0]) if has_more else None
+        return HistoryPage([_row_to_record(row) for row in rows], next_cursor)
+
+    def get(self, result_id):
+        """
+        결과 id로 조회
+
+        Returns:
+            결과 딕셔너리, 없으면 None
+        """
+        row = self._connection().execute(
+            f'SELECT {_COLUMNS} FROM diagnoses WHERE result_id = ?', (result_id,)
+        ).fetchone()
+        return _row_to_record(row) if row is not None else None
+
+    def angle_trend(self, user_id, since=None):
+        """
+        사용자의 각도 추이 (오래된 순, 인덱스만 읽음)
+
+        Args:
+            user_id: 사용자 ID
+            since: 이 시각(Unix 초) 이후만 조회 (None이면 전체)
+
+        Returns:
+            (저장 시각 배열, 각도 배열)
+        """
+        query = 'SELECT created_at, angle FROM diagnoses WHERE user_id = ?'
+        params = [str(user_id)]
+        if since is not None:
+            query += ' AND created_at >= ?'
+            params.append(since)
+        query += ' ORDER BY created_at'
+
+        rows = self._connection().execute(query, params).fetchall()
+        if not rows:
+            return np.empty(0), np.empty(0)
+        trend = np.array(rows, dtype=np.float64)
+        return trend[:, 0], trend[:, 1]
+
+    def count(self, user_id):
+        """사용자의 저장된 결과 수"""
+        return self._connection().execute(
+            'SELECT COUNT(*) FROM diagnoses WHERE user_id = ?', (str(user_id),)
+        ).fetchone()[0]
+
+def _row_to_record(row):
+    row_id, result_id, user_id, created_at, angle, risk_level, risk_color, views = row
+    return {
+        'id': result_id,
+        'user_id': user_id,
+        'created_at': created_at,
+        'angle': angle,
+        'risk_level': risk_level,
+        'risk_color': risk_color,
+        'views': json.loads(views)
+    }
+
+_default_store = None
+_default_store_lock = threading.Lock()
+
+def get_history_store():
+    """
+    프로세스 전체에서 공유하는 이력 저장소 반환
+
+    Returns:
+        HistoryStore (SPINECHECK_HISTORY_DB 경로)
+    """
+    global _default_store
+
+    with _default_store_lock:
+        if _default_store is None:
+            _default_store = HistoryStore(os.environ.get('SPINECHECK_HISTORY_DB', DEFAULT_HISTORY_PATH))
+        return _default_store
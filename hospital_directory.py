@@ -0,0 +1,175 @@
+"""
+병원 디렉토리 (열 단위 디스크 형식)
+
+ingest_hospitals.py가 만든 디렉토리를 열 단위 .npy 파일로 메모리 매핑하여 읽는다.
+    - 숫자 열(위도, 경도, 평점, 리뷰 수, 진료과목 비트마스크, 요일 구분별 진료 시작/종료 시각)은 .npy 배열 하나씩
+    - 문자열 열(id, 이름, 주소, 전화번호)은 UTF-8 바이트를 이어 붙인 배열과 시작 위치 배열
+    - meta.json에 병원 수, 진료과목 목록, 형식 버전 기록
+
+파싱 없이 메모리 매핑만 하므로 전국 데이터도 여는 시간이 거의 없고,
+여러 워커 프로세스가 같은 파일을 열면 운영체제 페이지 캐시를 공유한다.
+문자열은 검색 결과로 보여 줄 행만 디코딩한다.
+"""
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+# 디렉토리 형식 버전
+DIRECTORY_FORMAT_VERSION = 2
+
+# 앱에서 다루는 진료과목 (비트마스크의 비트 순서)
+SPECIALTIES = ["정형외과", "척추전문", "재활의학과", "통증의학과", "신경외과"]
+
+# 진료 시간 요일 구분 (평일, 토요일, 일요일·공휴일)
+DAY_TYPES = ('weekday', 'saturday', 'sunday')
+
+# 진료 시작/종료 시각 열 (자정 기준 분, 휴진이거나 정보가 없으면 -1)
+HOURS_COLUMNS = tuple(f'{day}_{edge}' for day in DAY_TYPES for edge in ('open', 'close'))
+
+# 숫자 열 이름과 자료형
+NUMERIC_COLUMNS = {
+    'lat': np.float64,
+    'lon': np.float64,
+    'rating': np.float32,
+    'reviews': np.int32,
+    'specialty_mask': np.uint8,
+    **{name: np.int16 for name in HOURS_COLUMNS}
+}
+
+# 문자열 열 이름
+STRING_COLUMNS = ('id', 'name', 'address', 'phone')
+
+_META_NAME = 'meta.json'
+
+class StringColumn:
+    """
+    UTF-8 바이트 + 시작 위치 배열로 저장한 문자열 열
+
+    Args:
+        data: uint8 배열 (모든 문자열의 UTF-8 바이트를 이어 붙인 것)
+        offsets: int64 배열 (길이 N+1, i번째 문자열은 data[offsets[i]:offsets[i+1]])
+    """
+
+    def __init__(self, data, offsets):
+        self.data = data
+        self.offsets = offsets
+
+    @classmethod
+    def from_strings(cls, values):
+        encoded = [str(value).encode('utf-8') for value in values]
+        offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+        np.cumsum([len(value) for value in encoded], out=offsets[1:])
+        return cls(np.frombuffer(b''.join(encoded), dtype=np.uint8), offsets)
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def __getitem__(self, index):
+        return self.data[self.offsets[index]:self.offsets[index + 1]].tobytes().decode('utf-8')
+
+    def take(self, indices):
+        return [self[index] for index in indices]
+
+class HospitalDirectory:
+    """
+    병원 디렉토리
+
+    Args:
+        columns: {숫자 열 이름: 배열} + {문자열 열 이름: StringColumn}
+        specialties: 비트마스크 비트 순서의 진료과목 목록
+    """
+
+    def __init__(self, columns, specialties=SPECIALTIES):
+        self.columns = columns
+        self.specialties = list(specialties)
+
+    @classmethod
+    def open(cls, path):
+        """
+        ingest_hospitals.py가 만든 디렉토리를 메모리 매핑으로 열기
+
+        Args:
+            path: 디렉토리 경로
+        """
+        with open(os.path.join(path, _META_NAME), encoding='utf-8') as f:
+            meta = json.load(f)
+        if meta.get('version') != DIRECTORY_FORMAT_VERSION:
+            raise ValueError(f"지원하지 않는 병원 디렉토리 형식입니다: {meta.get('version')} (다시 생성 필요)")
+
+        columns = {name: np.load(os.path.join(path, f'{name}.npy'), mmap_mode='r') for name in NUMERIC_COLUMNS}
+        for name in STRING_COLUMNS:
+            columns[name] = StringColumn(
+                np.load(os.path.join(path, f'{name}.bytes.npy'), mmap_mode='r'),
+                np.load(os.path.join(path, f'{name}.offsets.npy'), mmap_mode='r')
+            )
+        return cls(columns, meta['specialties'])
+
+    @classmethod
+    def from_records(cls, records):
+        """
+        정규화된 병원 DataFrame으로 메모리 디렉토리 생성
+
+        Args:
+            records: id, name, address, phone, lat, lon, rating, reviews, specialty_mask, 진료 시각(HOURS_COLUMNS) 열이 있는 DataFrame
+        """
+        columns = {name: records[name].to_numpy(dtype=dtype) for name, dtype in NUMERIC_COLUMNS.items()}
+        for name in STRING_COLUMNS:
+            columns[name] = StringColumn.from_strings(records[name].fillna(''))
+        return cls(columns)
+
+    def save(self, path, source=None):
+        """
+        디렉토리 형식으로 저장
+
+        Args:
+            path: 출력 디렉토리 경로
+            source: 원본 데이터 파일 이름 (meta.json에 기록)
+        """
+        os.makedirs(path, exist_ok=True)
+        for name in NUMERIC_COLUMNS:
+            np.save(os.path.join(path, f'{name}.npy'), np.ascontiguousarray(self.columns[name]))
+        for name in STRING_COLUMNS:
+            np.save(os.path.join(path, f'{name}.bytes.npy'), np.ascontiguousarray(self.columns[name].data))
+            np.save(os.path.join(path, f'{name}.offsets.npy'), np.ascontiguousarray(self.columns[name].offsets))
+
+        # 메타데이터는 마지막에 기록 (중간에 실패하면 열 수 없는 디렉토리로 남음)
+        meta = {'version': DIRECTORY_FORMAT_VERSION, 'count': len(self),
+                'specialties': self.specialties, 'source': source}
+        with open(os.path.join(path, _META_NAME), 'w', encoding='utf-8') as f:
+            json.dump(meta, f, ensure_ascii=False, indent=2)
+
+    def __len__(self):
+        return len(self.columns['lat'])
+
+    @property
+    def lat(self):
+        return self.columns['lat']
+
+    @property
+    def lon(self):
+        return self.columns['lon']
+
+    def specialty_names(self, mask):
+        """비트마스크 → 진료과목 이름 목록"""
+        return [name for bit, name in enumerate(self.specialties) if int(mask) & (1 << bit)]
+
+    def records(self, indices):
+        """
+        지정한 행의 병원 정보 (문자열은 이 행들만 디코딩)
+
+        Args:
+            indices: 행 번호 배열
+
+        Returns:
+            DataFrame (id, name, address, phone, lat, lon, specialties, rating, reviews, 진료 시각 열)
+        """
+        indices = np.asarray(indices, dtype=np.int64)
+        frame = pd.DataFrame({name: pd.Series(self.columns[name].take(indices), dtype=object)
+                              for name in STRING_COLUMNS})
+        for name in ('lat', 'lon', 'rating', 'reviews') + HOURS_COLUMNS:
+            frame[name] = np.asarray(self.columns[name][indices])
+        frame['specialties'] = [", ".join(self.specialty_names(mask))
+                                for mask in np.asarray(self.columns['specialty_mask'][indices])]
+        return frame
@@ -0,0 +1,126 @@
+"""
+병원 검색 조건(패싯) 비트맵 인덱스
+
+조건 값마다 그 조건을 만족하는 병원 집합을 비트맵(np.packbits, 병원 1곳 = 1비트)으로 미리 만들어 둔다.
+    - 진료과목: 진료과목마다 비트맵 (여러 진료과목을 고르면 OR)
+    - 평점: 기준 평점(RATING_THRESHOLDS) 이상인 병원 비트맵 (평점 정보가 없는 병원은 제외)
+    - 진료 중: 요일 구분(평일/토요일/일요일·공휴일) × 30분 구간마다 그 구간 내내 진료하는 병원 비트맵
+
+여러 조건 검색은 비트맵 AND로 합치고, 반경 검색과는 반경 후보 위치의 비트만 확인하여 교집합을 구한다.
+비트 순서는 공간 인덱스의 정렬 순서를 따르므로 후보 위치로 바로 확인할 수 있다.
+병원 10만 곳이면 비트맵 하나가 12.5KB이다.
+"""
+from datetime import timedelta, timezone
+
+import numpy as np
+
+from hospital_directory import DAY_TYPES
+
+# 평점 조건 기준값
+RATING_THRESHOLDS = (3.0, 3.5, 4.0, 4.5)
+
+# 진료 중 비트맵 시간 구간 (분)
+OPEN_SLOT_MINUTES = 30
+
+# 진료 시간 기준 시간대 (한국 표준시, 일광 절약 시간 없음)
+KST = timezone(timedelta(hours=9))
+
+def day_type(moment):
+    """datetime → 요일 구분 번호 (DAY_TYPES 순서, 공휴일은 구분하지 않음)"""
+    return 0 if moment.weekday() < 5 else moment.weekday() - 4
+
+class FacetIndex:
+    """
+    병원 패싯 비트맵 인덱스
+
+    Args:
+        directory: HospitalDirectory
+        order: 비트 순서 (병원 행 번호 배열, None이면 디렉토리 순서)
+    """
+
+    def __init__(self, directory, order=None):
+        order = np.arange(len(directory)) if order is None else np.asarray(order)
+        self.size = len(order)
+
+        masks = np.asarray(directory.columns['specialty_mask'])[order]
+        self._specialties = {name: np.packbits(masks & (1 << bit) != 0)
+                             for bit, name in enumerate(directory.specialties)}
+
+        ratings = np.asarray(directory.columns['rating'])[order]
+        self.has_ratings = bool(np.isfinite(ratings).any())
+        self._ratings = {threshold: np.packbits(ratings >= threshold) for threshold in RATING_THRESHOLDS}
+
+        # 진료 중: [요일 구분, 30분 구간] → 비트맵
+        # 병원마다 진료 시작 구간(시작 시각 올림)과 종료 구간(종료 시각 내림)을 int8로 구해 구간 번호와 비교
+        n_slots = 24 * 60 // OPEN_SLOT_MINUTES
+        slots = np.arange(n_slots, dtype=np.int8)[:, None]
+        self._open = []
+        for day in DAY_TYPES:
+            opens = np.asarray(directory.columns[f'{day}_open'])[order]
+            closes = np.asarray(directory.columns[f'{day}_close'])[order]
+            known = (opens >= 0) & (closes >= 0)
+            first = np.where(known, -(-opens // OPEN_SLOT_MINUTES), n_slots).astype(np.int8)
+            # 자정을 넘겨 진료하면 당일 자정까지만 반영
+            end = np.where(closes <= opens, n_slots, closes // OPEN_SLOT_MINUTES).astype(np.int8)
+            self._open.append(np.packbits((first <= slots) & (slots < end), axis=1))
+        self.has_hours = bool(any(bitmap.any() for bitmap in self._open))
+
+    def specialty_bitmap(self, specialties):
+        """진료과목 중 하나라도 있는 병원 비트맵"""
+        bitmap = np.zeros((self.size + 7) // 8, dtype=np.uint8)
+        for name in specialties:
+            if name not in self._specialties:
+                raise ValueError(f"알 수 없는 진료과목: {name} (사용 가능: {', '.join(self._specialties)})")
+            bitmap |= self._specialties[name]
+        return bitmap
+
+    def rating_bitmap(self, min_rating):
+        """평점이 min_rating 이상인 병원 비트맵"""
+        if min_rating not in self._ratings:
+            raise ValueError(f"지원하지 않는 평점 기준: {min_rating} (사용 가능: {RATING_THRESHOLDS})")
+        return self._ratings[min_rating]
+
+    def open_bitmap(self, moment):
+        """
+        moment가 속한 30분 구간 내내 진료하는 병원 비트맵
+
+        Args:
+            moment: datetime (시간대가 없으면 한국 시각으로 봄)
+        """
+        if moment.tzinfo is not None:
+            moment = moment.astimezone(KST)
+        slot = (moment.hour * 60 + moment.minute) // OPEN_SLOT_MINUTES
+        return self._open[day_type(moment)][slot]
+
+    def bitmap(self, specialties=None, min_rating=None, open_at=None):
+        """
+        조건을 모두 만족하는 병원 비트맵
+
+        Args:
+            specialties: 진료과목 목록 (하나라도 있으면 만족, None이나 빈 목록이면 조건 없음)
+            min_rating: 최소 평점 (RATING_THRESHOLDS 중 하나, None이면 조건 없음)
+            open_at: 진료 중이어야 하는 시각 (datetime, None이면 조건 없음)
+
+        Returns:
+            packbits 비트맵, 조건이 하나도 없으면 None
+        """
+        bitmaps = []
+        if specialties:
+            bitmaps.append(self.specialty_bitmap(specialties))
+        if min_rating is not None:
+            bitmaps.append(self.rating_bitmap(min_rating))
+        if open_at is not None:
+            bitmaps.append(self.open_bitmap(open_at))
+        if not bitmaps:
+            return None
+        return np.bitwise_and.reduce(bitmaps) if len(bitmaps) > 1 else bitmaps[0]
+
+    @staticmethod
+    def contains(bitmap, positions):
+        """positions(비트 순서 위치 배열) 중 비트맵에 있는 위치 여부"""
+        return (bitmap[positions >> 3] >> (7 - (positions & 7)) & 1).astype(bool)
+
+    @staticmethod
+    def count(bitmap):
+        """비트맵의 병원 수"""
+        return int(np.unpackbits(bitmap).sum())
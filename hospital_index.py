@@ -0,0 +1,206 @@
+"""
+병원 공간 인덱스
+
+병원 좌표를 위경도 격자 셀로 나누고 셀 번호 순으로 정렬한 CSR(압축 행) 구조로 저장한다.
+    - 셀 번호 = 행 * 열 수 + 열 이므로 같은 행에서 이웃한 셀의 병원은 배열에서 연속 구간
+    - 반경 검색은 반경을 덮는 격자 행마다 연속 구간 하나만 잘라 후보로 모은 뒤
+      후보에 대해서만 대원 거리(haversine)를 계산
+    - k-최근접 검색은 반경을 두 배씩 늘리며 k개 이상 찾을 때까지 반경 검색 반복
+    - 진료과목/평점/진료 중 조건은 hospital_facets 비트맵으로 반경 후보를 먼저 거른 뒤 거리 계산
+
+검색 시간은 전체 병원 수가 아니라 반경 안 셀의 병원 수에 비례한다.
+경도 180도를 넘는 영역(날짜 변경선)은 고려하지 않는다 (국내 데이터 전용).
+
+SPINECHECK_HOSPITALS 환경 변수로 병원 데이터를 지정한다.
+ingest_hospitals.py로 만든 디렉토리(기본값 data/hospitals)는 메모리 매핑으로 열고,
+CSV/XLSX 파일을 지정하거나 디렉토리가 없으면(샘플 data/hospitals_sample.csv) 실행 시 메모리로 적재한다.
+"""
+import os
+import threading
+
+import numpy as np
+
+from geo_distance import EARTH_RADIUS_KM, distances_from
+from hospital_directory import HospitalDirectory
+from hospital_facets import FacetIndex
+
+_DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data')
+DEFAULT_HOSPITALS_PATH = os.path.join(_DATA_DIR, 'hospitals')
+SAMPLE_HOSPITALS_PATH = os.path.join(_DATA_DIR, 'hospitals_sample.csv')
+
+# 격자 셀 크기 (도, 위도 방향 약 2.2km)
+DEFAULT_CELL_SIZE = 0.02
+
+def load_hospitals(path=DEFAULT_HOSPITALS_PATH):
+    """
+    병원 데이터 열기
+
+    Args:
+        path: ingest_hospitals.py 출력 디렉토리(메모리 매핑) 또는 CSV/XLSX 파일(메모리로 적재)
+
+    Returns:
+        HospitalDirectory
+    """
+    if os.path.isdir(path):
+        return HospitalDirectory.open(path)
+
+    from ingest_hospitals import read_hospitals
+    directory, _ = read_hospitals(path)
+    return directory
+
+class HospitalIndex:
+    """
+    병원 격자 공간 인덱스
+
+    Args:
+        directory: HospitalDirectory
+        cell_size: 격자 셀 크기 (도)
+    """
+
+    def __init__(self, directory, cell_size=DEFAULT_CELL_SIZE):
+        self.directory = directory
+        self.cell_size = cell_size
+
+        lat = np.asarray(directory.lat, dtype=np.float64)
+        lon = np.asarray(directory.lon, dtype=np.float64)
+        # 격자 원점을 셀 크기의 배수로 맞춤 (적재 시 정렬한 셀 순서와 같은 격자)
+        self._origin = tuple(np.floor(np.array([lat.min(), lon.min()]) / cell_size) * cell_size) if len(lat) else (0.0, 0.0)
+
+        rows = ((lat - self._origin[0]) // cell_size).astype(np.int64)
+        cols = ((lon - self._origin[1]) // cell_size).astype(np.int64)
+        self._n_rows = int(rows.max()) + 1 if len(rows) else 0
+        self._n_cols = int(cols.max()) + 1 if len(cols) else 0
+
+        # 셀 번호 순으로 정렬 (같은 셀의 병원이 연속 구간, ingest_hospitals.py 출력은 이미 셀 순서)
+        keys = rows * self._n_cols + cols
+        self._order = np.argsort(keys, kind='stable')
+        self._cell_keys, starts = np.unique(keys[self._order], return_index=True)
+        self._offsets = np.append(starts, len(keys))
+
+        # 거리 계산용 좌표 (정렬 순서, 라디안)
+        self._lat_rad = np.radians(lat[self._order])
+        self._lon_rad = np.radians(lon[self._order])
+        self._cos_lat = np.cos(self._lat_rad)
+
+        # 검색 조건 비트맵 (비트 순서 = 정렬 순서)
+        self.facets = FacetIndex(directory, self._order)
+
+    def __len__(self):
+        return len(self._order)
+
+    def _candidates(self, lat, lon, radius_km):
+        """반경을 덮는 격자 셀의 병원 위치 (정렬 순서 기준)"""
+        if len(self) == 0:
+            return np.empty(0, dtype=np.int64)
+
+        dlat = np.degrees(radius_km / EARTH_RADIUS_KM)
+        # 반경 안에서 위도가 가장 높은(경도 1도가 가장 짧은) 지점 기준으로 경도 범위 계산
+        max_lat = min(abs(lat) + dlat, 89.9)
+        dlon = min(dlat / np.cos(np.radians(max_lat)), 180.0)
+
+        row0 = max(int((lat - dlat - self._origin[0]) // self.cell_size), 0)
+        row1 = min(int((lat + dlat - self._origin[0]) // self.cell_size), self._n_rows - 1)
+        col0 = max(int((lon - dlon - self._origin[1]) // self.cell_size), 0)
+        col1 = min(int((lon + dlon - self._origin[1]) // self.cell_size), self._n_cols - 1)
+        if row0 > row1 or col0 > col1:
+            return np.empty(0, dtype=np.int64)
+
+        # 행마다 [row*열 수 + col0, row*열 수 + col1] 셀 범위가 정렬 배열의 연속 구간
+        row_keys = np.arange(row0, row1 + 1, dtype=np.int64) * self._n_cols
+        lo = self._offsets[np.searchsorted(self._cell_keys, row_keys + col0, side='left')]
+        hi = self._offsets[np.searchsorted(self._cell_keys, row_keys + col1, side='right')]
+        return np.concatenate([np.arange(a, b) for a, b in zip(lo, hi) if b > a] or [np.empty(0, dtype=np.int64)])
+
+    def _query_radius(self, lat, lon, radius_km, limit, bitmap):
+        candidates = self._candidates(lat, lon, radius_km)
+        if bitmap is not None:
+            # 반경 후보 ∩ 조건 비트맵 (거리는 조건을 만족하는 후보만 계산)
+            candidates = candidates[FacetIndex.contains(bitmap, candidates)]
+        distances = distances_from(lat, lon, self._lat_rad[candidates], self._lon_rad[candidates],
+                                  self._cos_lat[candidates])
+        inside = distances <= radius_km
+        candidates, distances = candidates[inside], distances[inside]
+
+        if limit is not None and limit < len(distances):
+            nearest = np.argpartition(distances, limit)[:limit]
+            candidates, distances = candidates[nearest], distances[nearest]
+        order = np.argsort(distances, kind='stable')
+        return self._order[candidates[order]], distances[order]
+
+    def query_radius(self, lat, lon, radius_km, limit=None, **facets):
+        """
+        반경 검색
+
+        Args:
+            lat, lon: 검색 중심 (도)
+            radius_km: 검색 반경 (km)
+            limit: 최대 결과 수 (None이면 전체)
+            **facets: 검색 조건 (FacetIndex.bitmap의 specialties, min_rating, open_at)
+
+        Returns:
+            (병원 행 번호 배열, 거리(km) 배열), 거리순
+        """
+        return self._query_radius(lat, lon, radius_km, limit, self.facets.bitmap(**facets))
+
+    def query_nearest(self, lat, lon, k=10, **facets):
+        """
+        k-최근접 검색
+
+        Args:
+            lat, lon: 검색 중심 (도)
+            k: 결과 수
+            **facets: 검색 조건 (FacetIndex.bitmap의 specialties, min_rating, open_at)
+
+        Returns:
+            (병원 행 번호 배열, 거리(km) 배열), 거리순
+        """
+        bitmap = self.facets.bitmap(**facets)
+        k = min(k, len(self) if bitmap is None else FacetIndex.count(bitmap))
+        radius = self.cell_size * 111.0
+        while True:
+            indices, distances = self._query_radius(lat, lon, radius, k, bitmap)
+            # 반경 안에서 k개를 찾았으면 반경 밖 병원은 더 멀기 때문에 결과가 확정됨
+            if len(indices) >= k or radius >= np.pi * EARTH_RADIUS_KM:
+                return indices, distances
+            radius *= 2
+
+    def _frame(self, indices, distances):
+        frame = self.directory.records(indices)
+        frame['distance'] = np.round(distances, 2)
+        return frame
+
+    def search(self, lat, lon, radius_km, limit=None, **facets):
+        """
+        반경 안 병원 (거리순 DataFrame, distance 열 추가)
+
+        Args:
+            lat, lon: 검색 중심 (도)
+            radius_km: 검색 반경 (km)
+            limit: 최대 결과 수 (None이면 전체)
+            **facets: 검색 조건 (FacetIndex.bitmap의 specialties, min_rating, open_at)
+        """
+        return self._frame(*self.query_radius(lat, lon, radius_km, limit, **facets))
+
+    def nearest(self, lat, lon, k=10, **facets):
+        """가장 가까운 병원 k개 (거리순 DataFrame, distance 열 추가)"""
+        return self._frame(*self.query_nearest(lat, lon, k, **facets))
+
+_hospital_index = None
+_hospital_index_lock = threading.Lock()
+
+def get_hospital_index():
+    """
+    프로세스 전체에서 공유하는 병원 인덱스 반환 (처음 호출할 때 병원 데이터를 열어 생성)
+
+    Returns:
+        HospitalIndex (SPINECHECK_HOSPITALS 경로, 없으면 적재된 디렉토리 또는 샘플 파일)
+    """
+    global _hospital_index
+
+    with _hospital_index_lock:
+        if _hospital_index is None:
+            path = os.environ.get('SPINECHECK_HOSPITALS')
+            if path is None:
+                path = DEFAULT_HOSPITALS_PATH if os.path.isdir(DEFAULT_HOSPITALS_PATH) else SAMPLE_HOSPITALS_PATH
+            _hospital_index = HospitalIndex(load_hospitals(path))
+        return _hospital_index
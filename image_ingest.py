@@ -0,0 +1,167 @@
+"""
+촬영/업로드 이미지 수집
+
+카메라 또는 업로드 이미지를 한 번만 디코딩하여 분석 해상도로 축소하고,
+세션에는 화면 표시용 압축 JPEG과 분석용 배열만 보관한다.
+세션별 이미지 메모리 한도를 적용하고 사용량을 보고한다.
+"""
+import hashlib
+import io
+import os
+from collections.abc import MutableMapping
+
+import numpy as np
+from PIL import Image, ImageOps
+
+from analysis import VIEW_TYPES, TARGET_SIZE
+from image_processing import exif_swaps_axes
+from lazy_import import lazy_import
+
+cv2 = lazy_import('cv2')
+
+# 화면 표시용 이미지의 최대 변 길이와 JPEG 품질
+DISPLAY_MAX_SIDE = 960
+DISPLAY_JPEG_QUALITY = 85
+
+# 세션당 이미지 메모리 한도 (기본 8MB)
+DEFAULT_SESSION_BUDGET = int(os.environ.get('SPINECHECK_SESSION_IMAGE_BUDGET', 8 * 1024 * 1024))
+
+class MemoryBudgetExceeded(Exception):
+    """세션 이미지 메모리 한도 초과"""
+
+class IngestedImage:
+    """
+    수집된 이미지
+
+    Attributes:
+        encoded: 화면 표시/다운로드용 JPEG 바이트 (비율 유지, 최대 DISPLAY_MAX_SIDE)
+        array: 분석 해상도의 OpenCV(BGR) 이미지 배열
+        original_size: 원본 이미지 크기 (너비, 높이)
+        source_digest: 원본 바이트 해시 (같은 업로드 재수집 방지용, 원본이 PIL 이미지면 None)
+    """
+
+    __slots__ = ('encoded', 'array', 'original_size', 'source_digest')
+
+    def __init__(self, encoded, array, original_size, source_digest=None):
+        self.encoded = encoded
+        self.array = array
+        self.original_size = original_size
+        self.source_digest = source_digest
+
+    @property
+    def nbytes(self):
+        """세션에 보관되는 바이트 수"""
+        return len(self.encoded) + self.array.nbytes
+
+def source_digest(data):
+    """원본 바이트 해시"""
+    return hashlib.sha1(data).hexdigest()
+
+def ingest_image(source, target_size=TARGET_SIZE):
+    """
+    이미지를 한 번 디코딩하여 분석용 배열과 표시용 JPEG으로 변환
+
+    Args:
+        source: PIL 이미지, 이미지 바이트 또는 파일 객체 (st.camera_input/st.file_uploader 결과)
+        target_size: 분석 이미지 크기 (높이, 너비)
+
+    Returns:
+        IngestedImage
+    """
+    digest = None
+    if isinstance(source, Image.Image):
+        pil_image = source
+    else:
+        data = source if isinstance(source, bytes) else source.getvalue()
+        digest = source_digest(data)
+        pil_image = Image.open(io.BytesIO(data))
+        
+        # JPEG은 분석/표시에 필요한 크기 이상으로만 축소 디코딩
+        pil_image.draft('RGB', _draft_request(pil_image, target_size))
+
+    # 휴대폰 사진의 EXIF 회전 정보 반영
+    pil_image = ImageOps.exif_transpose(pil_image).convert('RGB')
+    original_size = pil_image.size
+
+    # 분석 해상도 배열 (preprocess_image와 같은 크기이므로 이후 크기 조정이 필요 없음)
+    analysis_image = pil_image.resize((target_size[1], target_size[0]), Image.BILINEAR, reducing_gap=2.0)
+    array = cv2.cvtColor(np.asarray(analysis_image), cv2.COLOR_RGB2BGR)
+
+    # 비율을 유지한 표시용 JPEG
+    display_image = pil_image.copy()
+    display_image.thumbnail((DISPLAY_MAX_SIDE, DISPLAY_MAX_SIDE), Image.BILINEAR, reducing_gap=2.0)
+    buffered = io.BytesIO()
+    display_image.save(buffered, format="JPEG", quality=DISPLAY_JPEG_QUALITY)
+
+    return IngestedImage(buffered.getvalue(), array, original_size, digest)
+
+def _draft_request(pil_image, target_size):
+    """
+    축소 디코딩 요청 크기 (저장된 방향 기준 너비, 높이)
+
+    회전 후 분석 크기(target_size) 이상이고, 긴 변이 DISPLAY_MAX_SIDE 이상이 되도록 한다.
+    """
+    width, height = pil_image.size
+    swapped = exif_swaps_axes(pil_image)
+    if swapped:
+        width, height = height, width
+
+    scale = DISPLAY_MAX_SIDE / max(width, height)
+    request = (max(target_size[1], width * scale), max(target_size[0], height * scale))
+    request = (int(np.ceil(request[0])), int(np.ceil(request[1])))
+
+    return request[::-1] if swapped else request
+
+class SessionImageStore(MutableMapping):
+    """
+    촬영 방향별 수집 이미지 저장소 (st.session_state.images)
+
+    dict처럼 store['back']으로 읽고 쓰며, 비어 있는 방향은 None을 반환한다.
+    저장 시 전체 사용량이 한도를 넘으면 MemoryBudgetExceeded를 발생시킨다.
+
+    Args:
+        budget_bytes: 세션 이미지 메모리 한도
+    """
+
+    def __init__(self, budget_bytes=DEFAULT_SESSION_BUDGET):
+        self.budget_bytes = budget_bytes
+        self._images = {view: None for view in VIEW_TYPES}
+
+    def __getitem__(self, view):
+        return self._images[view]
+
+    def __setitem__(self, view, image):
+        if image is not None:
+            current = self._images.get(view)
+            usage = self.usage() - (current.nbytes if current is not None else 0) + image.nbytes
+            if usage > self.budget_bytes:
+                raise MemoryBudgetExceeded(
+                    f"세션 이미지 메모리 한도 초과: {usage / 1024:.0f}KB > {self.budget_bytes / 1024:.0f}KB"
+                )
+        self._images[view] = image
+
+    def __delitem__(self, view):
+        self._images[view] = None
+
+    def __iter__(self):
+        return iter(self._images)
+
+    def __len__(self):
+        return len(self._images)
+
+    def usage(self):
+        """현재 보관 중인 이미지 바이트 수"""
+        return sum(image.nbytes for image in self._images.values() if image is not None)
+
+    def report(self):
+        """
+        메모리 사용량 보고
+
+        Returns:
+            딕셔너리 (used_bytes, budget_bytes, views: {촬영 방향: 바이트 수})
+        """
+        return {
+            'used_bytes': self.usage(),
+            'budget_bytes': self.budget_bytes,
+            'views': {view: image.nbytes if image is not None else 0 for view, image in self._images.items()}
+        }
@@ -1,33 +1,77 @@
-import cv2
 import numpy as np
-from PIL import Image
+from PIL import Image, ImageOps
 import io
+import threading
 
-def load_image(image_bytes):
+from cobb_angle import solve_cobb_angles, curve_segments
+from lazy_import import lazy_import
+from spine_detector import get_detector
+
+# OpenCV는 첫 이미지 처리 시 import (페이지 시작 시간 단축)
+cv2 = lazy_import('cv2')
+
+def load_image(image_bytes, target_size=None, grayscale=False):
     """
     이미지 바이트 스트림을 OpenCV 이미지로 변환
     
+    target_size를 지정하면 JPEG을 DCT 단계에서 축소 디코딩(1/2, 1/4, 1/8)하여
+    타겟 크기 이상인 가장 작은 크기로 읽는다. 이후 preprocess_image가
+    어차피 타겟 크기로 줄이므로 버려질 픽셀을 디코딩하지 않는다.
+    
     Args:
         image_bytes: 이미지 바이트 데이터
+        target_size: 분석 이미지 크기 (높이, 너비), None이면 원본 크기로 디코딩
+        grayscale: True이면 색 변환 없이 밝기 채널만 읽어 단일 채널 이미지로 반환
         
     Returns:
-        OpenCV 형식의 이미지
+        OpenCV 형식의 이미지 (grayscale이면 (H, W), 아니면 (H, W, 3) BGR)
     """
     try:
         # PIL 이미지로 변환
         pil_image = Image.open(io.BytesIO(image_bytes))
+        
+        # JPEG 축소 디코딩 (JPEG이 아니면 무시됨)
+        if target_size is not None:
+            request = (target_size[1], target_size[0])
+            if exif_swaps_axes(pil_image):
+                request = request[::-1]
+            pil_image.draft('L' if grayscale else 'RGB', request)
+        
+        # EXIF 회전 정보대로 픽셀을 바로 세움 (image_ingest와 같은 방향)
+        pil_image = ImageOps.exif_transpose(pil_image)
+        
+        # 다음 단계가 그레이스케일이면 RGB/BGR 변환 없이 밝기만 사용
+        if grayscale:
+            return np.array(pil_image.convert('L'))
+        
         # RGB to BGR (OpenCV 형식)
-        return cv2.cvtColor(np.array(pil_image), cv2.COLOR_RGB2BGR)
+        return cv2.cvtColor(np.array(pil_image.convert('RGB')), cv2.COLOR_RGB2BGR)
     except Exception as e:
         print(f"이미지 로드 오류: {e}")
         return None
 
+def exif_swaps_axes(pil_image):
+    """
+    EXIF 회전 정보가 가로/세로를 바꾸는지 확인 (디코딩 전에 호출 가능)
+    
+    Args:
+        pil_image: 열린 PIL 이미지
+        
+    Returns:
+        90도/270도 회전이면 True
+    """
+    try:
+        orientation = pil_image.getexif().get(0x0112)
+    except Exception:
+        return False
+    return orientation in (5, 6, 7, 8)
+
 def preprocess_image(image, target_size=(480, 640)):
     """
     이미지 전처리 (크기 조정, 대비 향상 등)
     
     Args:
-        image: OpenCV 이미지
+        image: OpenCV 이미지 (BGR 또는 단일 채널)
         target_size: 타겟 이미지 크기 (높이, 너비)
         
     Returns:
@@ -39,8 +83,8 @@ def preprocess_image(image, target_size=(480, 640)):
     # 이미지 크기 조정
     resized = cv2.resize(image, (target_size[1], target_size[0]))
     
-    # 그레이스케일 변환
-    gray = cv2.cvtColor(resized, cv2.COLOR_BGR2GRAY)
+    # 그레이스케일 변환 (load_image(grayscale=True)로 읽은 단일 채널 이미지는 그대로 사용)
+    gray = resized if resized.ndim == 2 else cv2.cvtColor(resized, cv2.COLOR_BGR2GRAY)
     
     # 히스토그램 평활화 (대비 향상)
     enhanced = cv2.equalizeHist(gray)
@@ -53,10 +97,136 @@ def preprocess_image(image, target_size=(480, 640)):
     
     return processed
 
+class PreprocessBuffers:
+    """
+    preprocess_gray에서 재사용하는 중간/출력 버퍼
+    
+    한 인스턴스를 여러 스레드가 동시에 사용하면 안 되므로
+    get_preprocess_buffers로 스레드별 인스턴스를 받아 사용한다.
+    
+    Args:
+        target_size: 타겟 이미지 크기 (높이, 너비)
+    """
+    
+    def __init__(self, target_size):
+        height, width = target_size
+        self.target_size = (height, width)
+        # 컬러 입력을 타겟 크기로 줄인 결과
+        self.resized = np.empty((height, width, 3), dtype=np.uint8)
+        # out을 지정하지 않았을 때 사용하는 출력
+        self.output = np.empty((height, width), dtype=np.uint8)
+        self._clahe = None
+    
+    @property
+    def clahe(self):
+        # CLAHE 객체는 스레드 간에 공유하지 않도록 버퍼와 함께 보관
+        if self._clahe is None:
+            self._clahe = cv2.createCLAHE(clipLimit=2.0, tileGridSize=(8, 8))
+        return self._clahe
+
+_buffer_pool = threading.local()
+
+def get_preprocess_buffers(target_size=(480, 640)):
+    """
+    현재 스레드 전용 전처리 버퍼 반환 (타겟 크기별로 한 번만 할당)
+    
+    Args:
+        target_size: 타겟 이미지 크기 (높이, 너비)
+        
+    Returns:
+        PreprocessBuffers
+    """
+    pool = getattr(_buffer_pool, 'buffers', None)
+    if pool is None:
+        pool = _buffer_pool.buffers = {}
+    
+    target_size = tuple(target_size)
+    if target_size not in pool:
+        pool[target_size] = PreprocessBuffers(target_size)
+    return pool[target_size]
+
+def preprocess_gray(image, target_size=(480, 640), out=None, enhance='equalize', blur=True, buffers=None):
+    """
+    단일 채널 이미지 전처리 (크기 조정 → 그레이스케일 → 대비 향상 → 블러)
+    
+    preprocess_image와 같은 처리를 하되 3채널로 되돌리지 않고,
+    모든 단계를 out 버퍼 안에서 수행하여 호출당 새 배열을 할당하지 않는다.
+    
+    Args:
+        image: OpenCV 이미지 (BGR 또는 단일 채널)
+        target_size: 타겟 이미지 크기 (높이, 너비)
+        out: 결과를 기록할 (높이, 너비) uint8 배열 (None이면 스레드별 풀 버퍼에 기록)
+        enhance: 대비 향상 방식 ('equalize', 'clahe', None)
+        blur: 가우시안 블러 적용 여부
+        buffers: 사용할 PreprocessBuffers (None이면 현재 스레드 전용 버퍼)
+        
+    Returns:
+        전처리된 단일 채널 이미지 (out 또는 풀 버퍼, 다음 호출에서 덮어써질 수 있음)
+    """
+    if image is None:
+        return None
+    
+    height, width = target_size
+    if buffers is None:
+        buffers = get_preprocess_buffers(target_size)
+    if out is None:
+        out = buffers.output
+    
+    # 크기 조정과 그레이스케일 변환 (크기가 같으면 조정 생략)
+    if image.ndim == 2:
+        if image.shape == (height, width):
+            np.copyto(out, image)
+        else:
+            cv2.resize(image, (width, height), dst=out)
+    elif image.shape[:2] == (height, width):
+        cv2.cvtColor(image, cv2.COLOR_BGR2GRAY, dst=out)
+    else:
+        cv2.resize(image, (width, height), dst=buffers.resized)
+        cv2.cvtColor(buffers.resized, cv2.COLOR_BGR2GRAY, dst=out)
+    
+    # 대비 향상 (제자리 연산)
+    if enhance == 'equalize':
+        cv2.equalizeHist(out, dst=out)
+    elif enhance == 'clahe':
+        buffers.clahe.apply(out, dst=out)
+    elif enhance is not None:
+        raise ValueError(f"지원하지 않는 대비 향상 방식: {enhance}")
+    
+    # 가우시안 블러로 노이즈 제거 (제자리 연산)
+    if blur:
+        cv2.GaussianBlur(out, (5, 5), 0, dst=out)
+    
+    return out
+
+def preprocess_gray_batch(images, target_size=(480, 640), out=None, enhance='equalize', blur=True):
+    """
+    여러 이미지를 단일 채널로 전처리하여 하나의 배열에 기록
+    
+    Args:
+        images: OpenCV 이미지 배열 (N, H, W, 3) 또는 이미지 목록
+        target_size: 타겟 이미지 크기 (높이, 너비)
+        out: 결과를 기록할 (N, 높이, 너비) uint8 배열 (None이면 새로 할당)
+        enhance: 대비 향상 방식 ('equalize', 'clahe', None)
+        blur: 가우시안 블러 적용 여부
+        
+    Returns:
+        전처리된 이미지 배열 (N, 높이, 너비)
+    """
+    if out is None:
+        out = np.empty((len(images), target_size[0], target_size[1]), dtype=np.uint8)
+    
+    buffers = get_preprocess_buffers(target_size)
+    for i in range(len(images)):
+        preprocess_gray(images[i], target_size, out=out[i], enhance=enhance, blur=blur, buffers=buffers)
+    
+    return out
+
 def detect_spine_points(image):
     """
-    척추 포인트 감지 (이 예제에서는 가상의 랜덤 포인트 생성)
-    실제 구현에서는 PoseNet이나 다른 AI 모델 사용
+    척추 포인트 감지
+    
+    프로세스에서 공유하는 검출기(spine_detector.get_detector)를 사용한다.
+    기본 검출기는 모델 없이 S자 형태 포인트를 생성하는 스텁이다.
     
     Args:
         image: 처리할 이미지
@@ -67,30 +237,122 @@ def detect_spine_points(image):
     if image is None:
         return []
     
-    height, width = image.shape[:2]
+    points = get_detector().detect(image)
+    return [(int(x), int(y)) for x, y in points]
+
+def analyze_image(image, target_size=(480, 640), with_overlay=False, on_stage=None):
+    """
+    단일 이미지에 대해 전처리, 척추 포인트 감지, Cobb 각도 계산을 수행
+    
+    Args:
+        image: OpenCV 이미지
+        target_size: 타겟 이미지 크기 (높이, 너비)
+        with_overlay: True이면 분석 결과를 그린 오버레이 이미지도 생성
+        on_stage: 단계(전처리, 검출, 각도, 오버레이)를 마칠 때마다 완료한 단계 수로 호출할 함수
+        
+    Returns:
+        분석 결과 딕셔너리 ({'points': 척추 포인트 리스트, 'angle': Cobb 각도,
+        'segments': 곡선 구간별 Cobb 각도, with_overlay인 경우 'overlay': 시각화된 이미지})
+        이미지가 없으면 None
+    """
+    on_stage = on_stage or (lambda completed: None)
+    
+    processed = preprocess_gray(image, target_size)
+    if processed is None:
+        return None
+    on_stage(1)
+    
+    points = detect_spine_points(processed)
+    on_stage(2)
+    
+    segments = calculate_cobb_segments(points)
+    angle = max((segment['angle'] for segment in segments), default=0.0)
+    on_stage(3)
     
-    # 가상의 척추 포인트 생성 (실제로는 AI 모델 사용)
-    # 예시: 7개의 척추 포인트 생성
-    spine_points = []
-    center_x = width // 2
+    result = {'points': points, 'angle': angle, 'segments': segments}
+    if with_overlay:
+        # 컬러 시각화가 필요할 때만 3채널로 변환
+        overlay = cv2.cvtColor(processed, cv2.COLOR_GRAY2BGR)
+        result['overlay'] = draw_spine_analysis(overlay, points, angle)
+        on_stage(4)
     
-    # 실제로는 모델에서 예측한 값을 사용해야 함
-    # 여기서는 약간의 S자 형태로 포인트 생성
-    for i in range(7):
-        y = int(height * 0.3 + (height * 0.5 / 6) * i)
+    return result
+
+def assess_risk(angle):
+    """
+    Cobb 각도로부터 위험도와 권장사항 결정
+    
+    Args:
+        angle: Cobb 각도 (도 단위)
         
-        # S자 형태로 x 좌표 계산
-        offset = int(10 * np.sin((i / 6) * np.pi))
-        x = center_x + offset
+    Returns:
+        위험도 딕셔너리 (risk_level, risk_color, recommendations)
+    """
+    if angle < 10:
+        return {
+            'risk_level': '낮음',
+            'risk_color': 'low',
+            'recommendations': [
+                '자세 교정 운동 권장',
+                '척추 건강을 위한 스트레칭 유지',
+                '12개월 이내 재검사 고려'
+            ]
+        }
+    elif angle < 20:
+        return {
+            'risk_level': '중간',
+            'risk_color': 'medium',
+            'recommendations': [
+                '정형외과 전문의 상담 권장',
+                '자세 교정 운동 시작 고려',
+                '6개월 내 재검사 권장'
+            ]
+        }
+    else:
+        return {
+            'risk_level': '높음',
+            'risk_color': 'high',
+            'recommendations': [
+                '즉시 척추 전문의 진료 필요',
+                '전문적인 치료 계획 수립 필요',
+                '정기적인 모니터링 요망'
+            ]
+        }
+
+def detect_spine_points_batch(images):
+    """
+    여러 이미지의 척추 포인트를 한 번의 배치 추론으로 감지
+    
+    Args:
+        images: 처리할 이미지 배열 (N, H, W, ...)
         
-        spine_points.append((x, y))
+    Returns:
+        척추 포인트 좌표 배열 (N, K, 2), (x, y) 순서
+    """
+    return get_detector().detect_batch(images)
+
+def analyze_batch(images, target_size=(480, 640)):
+    """
+    여러 이미지에 대해 전처리, 척추 포인트 감지, Cobb 각도 계산을 한 번에 수행
     
-    return spine_points
+    Args:
+        images: OpenCV 이미지 배열 (N, H, W, 3)
+        target_size: 타겟 이미지 크기 (높이, 너비)
+        
+    Returns:
+        (척추 포인트 배열 (N, K, 2), Cobb 각도 배열 (N,))
+    """
+    processed = preprocess_gray_batch(images, target_size)
+    points = detect_spine_points_batch(processed)
+    angles = calculate_cobb_angle_batch(points)
+    return points, angles
 
 def calculate_cobb_angle(points):
     """
     척추 포인트로부터 Cobb 각도 계산
     
+    랜드마크 곡선의 모든 변곡점을 찾아 구간별 Cobb 각도를 구하고 그중 최대값(주 곡선)을 반환한다.
+    
     Args:
         points: 척추 포인트 좌표 리스트
         
@@ -100,16 +362,44 @@ def calculate_cobb_angle(points):
     if len(points) < 4:
         return 0.0
     
-    # 상부 척추 기울기 계산
-    upper_slope = calculate_slope(points[0], points[2])
+    return float(solve_cobb_angles(points).major_angle[0])
+
+def calculate_cobb_segments(points):
+    """
+    척추 포인트로부터 곡선 구간별 Cobb 각도 계산 (S자 측만의 각 곡선)
+    
+    Args:
+        points: 척추 포인트 좌표 리스트
+        
+    Returns:
+        구간 리스트 [{'upper': 상부 끝 척추 인덱스, 'lower': 하부 끝 척추 인덱스, 'angle': Cobb 각도}, ...]
+    """
+    if len(points) < 4:
+        return []
+    
+    return curve_segments(solve_cobb_angles(points))
+
+def calculate_cobb_angle_batch(points):
+    """
+    여러 척추 포인트 세트의 Cobb 각도를 한 번에 계산 (벡터화)
+    
+    calculate_cobb_angle과 같은 기준(구간별 Cobb 각도 중 최대값)을
+    (N, K) 배열 연산으로 계산한다.
     
-    # 하부 척추 기울기 계산
-    lower_slope = calculate_slope(points[-3], points[-1])
+    Args:
+        points: 척추 포인트 배열 (N, K, 2)
+        
+    Returns:
+        Cobb 각도 배열 (N,) (도 단위)
+    """
+    points = np.asarray(points, dtype=np.float64)
+    if points.ndim != 3 or points.shape[-1] != 2:
+        raise ValueError(f"points는 (N, K, 2) 형태여야 합니다: {points.shape}")
     
-    # 두 기울기 사이의 각도 계산
-    angle = calculate_angle_between_slopes(upper_slope, lower_slope)
+    if points.shape[1] < 4:
+        return np.zeros(points.shape[0], dtype=np.float64)
     
-    return angle
+    return solve_cobb_angles(points).major_angle
 
 def calculate_slope(point1, point2):
     """
@@ -164,7 +454,7 @@ def draw_spine_analysis(image, spine_points, angle):
     Args:
         image: 원본 이미지
         spine_points: 감지된 척추 포인트
-        angle: 계산된 Cobb 각도
+        angle: 계산된 Cobb 각도 (끝 척추 선은 solve_cobb_angles의 구간 끝 척추에 그림)
         
     Returns:
         시각화된 이미지
@@ -183,15 +473,16 @@ def draw_spine_analysis(image, spine_points, angle):
     for i in range(len(spine_points) - 1):
         cv2.line(result, spine_points[i], spine_points[i + 1], (0, 255, 0), 2)
     
-    # 상부 척추선 연장
-    if len(spine_points) >= 3:
-        p1, p2 = spine_points[0], spine_points[2]
-        extended_line(result, p1, p2, (255, 0, 0), 2)
-    
-    # 하부 척추선 연장
-    if len(spine_points) >= 3:
-        p1, p2 = spine_points[-3], spine_points[-1]
-        extended_line(result, p1, p2, (255, 0, 0), 2)
+    # 곡선 구간의 끝 척추마다 Cobb 각도 계산에 쓴 기울기 방향으로 선 연장
+    # (S자 측만이면 위, 변곡점, 아래 끝 척추에 선이 그려져 구간별 각도와 일치)
+    if len(spine_points) >= 4:
+        solution = solve_cobb_angles(spine_points)
+        tilts = np.radians(solution.tilts[0])
+        ends = sorted({index for segment in curve_segments(solution) for index in (segment['upper'], segment['lower'])})
+        for index in ends:
+            x, y = spine_points[index]
+            direction = (int(round(x + 100 * np.sin(tilts[index]))), int(round(y + 100 * np.cos(tilts[index]))))
+            extended_line(result, (int(x), int(y)), direction, (255, 0, 0), 2)
     
     # 각도 표시
     height, width = result.shape[:2]
@@ -230,6 +521,11 @@ def extended_line(img, pt1, pt2, color, thickness):
         cv2.line(img, (x1, 0), (x1, height), color, thickness)
         return
     
+    # y 차이가 0인 경우 (수평선, 끝 척추 기울기가 ±90도)
+    if y2 - y1 == 0:
+        cv2.line(img, (0, y1), (width, y1), color, thickness)
+        return
+    
     slope = (y2 - y1) / (x2 - x1)
     
     # y = m(x - x1) + y1
@@ -0,0 +1,288 @@
+"""
+병원 데이터 적재 CLI
+
+공공 병원 데이터(CSV/XLSX, 건강보험심사평가원 병원정보서비스 형식 또는 앱 샘플 형식)를 한 번 읽어
+    - 열 이름을 앱 형식(id, name, address, phone, lat, lon, specialties, rating, reviews)으로 통일
+    - 진료과목을 앱의 진료과목 목록으로 정규화하여 비트마스크로 저장 (관련 진료과목이 없는 기관은 제외)
+      진료과목 정보가 없는 기관은 기관명에 들어간 진료과목으로 추정 (정확한 결과는 --specialties 파일 필요)
+    - 진료 시간(평일/토요일/일요일·공휴일 시작·종료 시각)을 자정 기준 분으로 변환
+    - 좌표가 없거나 국내 범위를 벗어난 기관은 주소를 오프라인 지오코더로 변환
+    - 공간 인덱스 격자 셀 순서로 정렬 (가까운 병원이 파일에서도 가까워 메모리 매핑 시 읽는 페이지가 적음)
+한 뒤 hospital_directory.HospitalDirectory 디렉토리 형식(열 단위 .npy)으로 저장한다.
+
+사용 예:
+    python ingest_hospitals.py hospitals.csv -o data/hospitals
+    python ingest_hospitals.py 병원정보서비스.xlsx --specialties 진료과목정보.xlsx --hours 세부정보.xlsx -o data/hospitals
+
+XLSX 파일을 읽으려면 openpyxl이 필요하다.
+"""
+import argparse
+import os
+import re
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+from hospital_directory import HOURS_COLUMNS, SPECIALTIES, HospitalDirectory
+
+# 원본 열 이름 → 앱 열 이름 (앞쪽 이름 우선)
+COLUMN_ALIASES = {
+    'id': ['id', '암호화요양기호', '요양기호'],
+    'name': ['name', '요양기관명', '기관명', '병원명'],
+    'address': ['address', '주소', '도로명주소'],
+    'phone': ['phone', '전화번호'],
+    'lat': ['lat', '좌표(Y)', '좌표(y)', '위도'],
+    'lon': ['lon', '좌표(X)', '좌표(x)', '경도'],
+    'specialties': ['specialties', '진료과목', '진료과목코드명'],
+    'rating': ['rating', '평점'],
+    'reviews': ['reviews', '리뷰수'],
+    # 진료 시간 (심사평가원 상세정보는 요일별이므로 평일은 월요일 기준)
+    'weekday_open': ['weekday_open', 'trmtMonStart', '진료시작시간_월요일', '평일진료시작시간'],
+    'weekday_close': ['weekday_close', 'trmtMonEnd', '진료종료시간_월요일', '평일진료종료시간'],
+    'saturday_open': ['saturday_open', 'trmtSatStart', '진료시작시간_토요일', '토요일진료시작시간'],
+    'saturday_close': ['saturday_close', 'trmtSatEnd', '진료종료시간_토요일', '토요일진료종료시간'],
+    'sunday_open': ['sunday_open', 'trmtSunStart', '진료시작시간_일요일', '일요일진료시작시간'],
+    'sunday_close': ['sunday_close', 'trmtSunEnd', '진료종료시간_일요일', '일요일진료종료시간']
+}
+
+# 진료과목 원본 이름 → 앱 진료과목
+SPECIALTY_ALIASES = {
+    '정형외과': '정형외과',
+    '신경외과': '신경외과',
+    '재활의학과': '재활의학과',
+    '마취통증의학과': '통증의학과',
+    '통증의학과': '통증의학과',
+    '척추전문': '척추전문',
+    '척추': '척추전문'
+}
+
+# 진료과목 구분자
+_SPECIALTY_SEPARATORS = re.compile(r'[;,/|·]')
+
+# 국내 좌표 범위 (이 범위 밖이면 좌표 없음으로 처리)
+KOREA_BOUNDS = ((33.0, 39.0), (124.0, 132.0))
+
+# 지오코딩 결과로 인정하는 정밀도 (지역 중심 좌표는 제외)
+ACCEPTED_GEOCODE_PRECISION = ('exact', 'interpolated', 'street')
+
+def read_table(path):
+    """
+    CSV/XLSX 파일 읽기 (CSV는 UTF-8, 실패하면 CP949로 읽음)
+
+    Returns:
+        DataFrame (모든 열 문자열)
+    """
+    if path.lower().endswith(('.xlsx', '.xls')):
+        try:
+            return pd.read_excel(path, dtype=str)
+        except ImportError as e:
+            raise ImportError("XLSX 파일을 읽으려면 openpyxl을 설치하세요 (pip install openpyxl)") from e
+
+    try:
+        return pd.read_csv(path, dtype=str, encoding='utf-8-sig')
+    except UnicodeDecodeError:
+        return pd.read_csv(path, dtype=str, encoding='cp949')
+
+def rename_columns(frame):
+    """원본 열 이름을 앱 열 이름으로 변경 (없는 열은 빈 값으로 추가)"""
+    frame.columns = [str(column).strip() for column in frame.columns]
+    renamed = pd.DataFrame(index=frame.index)
+    for name, aliases in COLUMN_ALIASES.items():
+        source = next((alias for alias in aliases if alias in frame.columns), None)
+        renamed[name] = frame[source] if source is not None else None
+    return renamed
+
+def specialty_mask(specialties, name=''):
+    """
+    진료과목 문자열 → 앱 진료과목 비트마스크
+
+    Args:
+        specialties: 구분자(; , / | ·)로 나열한 진료과목 (비어 있으면 기관명으로 추정)
+        name: 기관명 ('척추'가 들어가면 척추전문으로 봄)
+
+    Returns:
+        비트마스크 (SPECIALTIES 순서)
+    """
+    mask = 0
+    for value in _SPECIALTY_SEPARATORS.split(specialties or ''):
+        specialty = SPECIALTY_ALIASES.get(value.strip())
+        if specialty is not None:
+            mask |= 1 << SPECIALTIES.index(specialty)
+    if not specialties:
+        # 진료과목 정보가 없으면 기관명에 들어간 진료과목 ('가정형외과의원' → 정형외과)
+        for alias, specialty in SPECIALTY_ALIASES.items():
+            if alias in (name or ''):
+                mask |= 1 << SPECIALTIES.index(specialty)
+    if '척추' in (name or ''):
+        mask |= 1 << SPECIALTIES.index('척추전문')
+    return mask
+
+def merge_specialties(frame, specialties_frame):
+    """
+    기관별 진료과목 파일(기관 id, 진료과목 한 행씩) 병합
+
+    Args:
+        frame: rename_columns 결과
+        specialties_frame: 진료과목 파일 DataFrame
+    """
+    specialties_frame = rename_columns(specialties_frame)
+    grouped = specialties_frame.dropna(subset=['id']).groupby('id')['specialties'].agg(
+        lambda values: ';'.join(value for value in values if isinstance(value, str))
+    )
+    merged = frame['id'].map(grouped)
+    frame['specialties'] = np.where(frame['specialties'].notna(),
+                                    frame['specialties'].fillna('') + ';' + merged.fillna(''), merged)
+    return frame
+
+def merge_hours(frame, hours_frame):
+    """
+    기관별 진료 시간 파일(기관 id별 한 행, 심사평가원 의료기관별 상세정보) 병합
+
+    Args:
+        frame: rename_columns 결과
+        hours_frame: 진료 시간 파일 DataFrame
+    """
+    hours_frame = rename_columns(hours_frame).dropna(subset=['id']).drop_duplicates(subset=['id']).set_index('id')
+    for name in HOURS_COLUMNS:
+        frame[name] = frame[name].fillna(frame['id'].map(hours_frame[name]))
+    return frame
+
+def _parse_time(text):
+    digits = re.sub(r'\D', '', text)
+    if len(digits) == 6:  # '09:00:00'
+        digits = digits[:4]
+    if not 3 <= len(digits) <= 4:
+        return -1
+    hours, minutes = int(digits[:-2]), int(digits[-2:])
+    if minutes >= 60 or hours > 24 or (hours == 24 and minutes > 0):
+        return -1
+    return hours * 60 + minutes
+
+def parse_minutes(values):
+    """
+    진료 시각 문자열('0900', '09:00', '900', '09:00:00') → 자정 기준 분
+
+    Args:
+        values: 시각 문자열 Series
+
+    Returns:
+        int16 배열 (휴진이거나 형식이 맞지 않으면 -1, '2400'은 1440)
+    """
+    # 진료 시각은 종류가 적으므로 서로 다른 값만 변환
+    codes, uniques = pd.factorize(values.fillna('').astype(str))
+    parsed = np.array([_parse_time(text) for text in uniques] + [-1], dtype=np.int16)
+    return parsed[codes]
+
+def normalize_hospitals(frame, geocoder=None, keep_all=False):
+    """
+    원본 DataFrame을 앱 형식으로 정규화
+
+    Args:
+        frame: rename_columns 결과
+        geocoder: 좌표 없는 기관의 주소 변환용 OfflineGeocoder (None이면 좌표 없는 기관 제외)
+        keep_all: True면 관련 진료과목이 없는 기관도 유지
+
+    Returns:
+        (정규화된 DataFrame, 통계 딕셔너리)
+    """
+    from hospital_index import DEFAULT_CELL_SIZE
+
+    stats = {'source': len(frame)}
+    # id가 없는 행은 원본 행 번호로 채운 뒤 중복 제거 (id 없는 행끼리 합쳐지지 않도록)
+    frame = frame.reset_index(drop=True)
+    ids = frame['id'].fillna('').astype(str).str.strip()
+    frame['id'] = ids.where(ids != '', pd.Series([f'row-{index + 1}' for index in range(len(frame))]))
+    frame = frame.drop_duplicates(subset=['id']).reset_index(drop=True)
+
+    # 진료과목 (정보가 없는 기관은 기관명으로 추정하므로 치과, 한의원 등은 제외됨)
+    stats['inferred'] = int((frame['specialties'].fillna('').str.strip() == '').sum())
+    masks = np.array([specialty_mask(specialties.strip(), name) for specialties, name
+                      in zip(frame['specialties'].fillna(''), frame['name'].fillna(''))], dtype=np.uint8)
+    frame['specialty_mask'] = masks
+    if not keep_all:
+        frame = frame[masks != 0].reset_index(drop=True)
+    stats['specialty'] = len(frame)
+
+    # 좌표 (범위 밖이면 지오코딩)
+    lat = pd.to_numeric(frame['lat'], errors='coerce')
+    lon = pd.to_numeric(frame['lon'], errors='coerce')
+    (lat_min, lat_max), (lon_min, lon_max) = KOREA_BOUNDS
+    missing = ~(lat.between(lat_min, lat_max) & lon.between(lon_min, lon_max))
+    stats['geocoded'] = 0
+    if geocoder is not None:
+        for index in np.nonzero(missing.to_numpy())[0]:
+            address = frame.at[index, 'address']
+            result = geocoder.geocode(address) if isinstance(address, str) else None
+            if result is not None and result.precision in ACCEPTED_GEOCODE_PRECISION:
+                lat.iat[index], lon.iat[index] = result.lat, result.lon
+                missing.iat[index] = False
+                stats['geocoded'] += 1
+    frame['lat'], frame['lon'] = lat, lon
+    frame = frame[~missing.to_numpy()].reset_index(drop=True)
+    stats['count'] = len(frame)
+
+    frame['rating'] = pd.to_numeric(frame['rating'], errors='coerce')
+    frame['reviews'] = pd.to_numeric(frame['reviews'], errors='coerce').fillna(0).astype(np.int32)
+    for name in HOURS_COLUMNS:
+        frame[name] = parse_minutes(frame[name])
+    for name in ('name', 'address', 'phone'):
+        frame[name] = frame[name].fillna('').str.strip()
+
+    # 공간 인덱스 격자 셀 순서로 정렬
+    cells = np.floor(frame[['lat', 'lon']].to_numpy() / DEFAULT_CELL_SIZE).astype(np.int64)
+    order = np.lexsort((cells[:, 1], cells[:, 0]))
+    return frame.iloc[order].reset_index(drop=True), stats
+
+def read_hospitals(path, specialties_path=None, geocoder=None, keep_all=False, hours_path=None):
+    """
+    병원 데이터 파일을 읽어 메모리 HospitalDirectory 생성
+
+    Args:
+        path: 병원 데이터 파일 (CSV/XLSX)
+        specialties_path: 기관별 진료과목 파일 (없으면 None)
+        geocoder: 좌표 없는 기관의 주소 변환용 OfflineGeocoder
+        keep_all: True면 관련 진료과목이 없는 기관도 유지
+        hours_path: 기관별 진료 시간 파일 (없으면 None)
+
+    Returns:
+        (HospitalDirectory, 통계 딕셔너리)
+    """
+    frame = rename_columns(read_table(path))
+    if specialties_path is not None:
+        frame = merge_specialties(frame, read_table(specialties_path))
+    if hours_path is not None:
+        frame = merge_hours(frame, read_table(hours_path))
+    records, stats = normalize_hospitals(frame, geocoder, keep_all)
+    return HospitalDirectory.from_records(records), stats
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="SpineCheck 병원 데이터 적재")
+    parser.add_argument('source', help="병원 데이터 파일 (.csv 또는 .xlsx)")
+    parser.add_argument('-o', '--output', default=os.path.join('data', 'hospitals'), help="출력 디렉토리")
+    parser.add_argument('--specialties', default=None, help="기관별 진료과목 파일 (심사평가원 진료과목정보)")
+    parser.add_argument('--hours', default=None, help="기관별 진료 시간 파일 (심사평가원 의료기관별 상세정보)")
+    parser.add_argument('--no-geocode', action='store_true', help="좌표 없는 기관을 지오코딩하지 않고 제외")
+    parser.add_argument('--all', action='store_true', help="관련 진료과목이 없는 기관도 포함")
+    args = parser.parse_args(argv)
+
+    geocoder = None
+    if not args.no_geocode:
+        from geocoder import get_geocoder
+        geocoder = get_geocoder()
+
+    start = time.perf_counter()
+    directory, stats = read_hospitals(args.source, args.specialties, geocoder, args.all, args.hours)
+    directory.save(args.output, source=os.path.basename(args.source))
+
+    if stats['inferred']:
+        print(f"경고: {stats['inferred']}곳은 진료과목 정보가 없어 기관명으로 진료과목을 추정했습니다. "
+              f"정확한 필터를 위해 --specialties로 진료과목 파일을 지정하세요.", file=sys.stderr)
+    print(f"원본 {stats['source']}곳 → 관련 진료과목 {stats['specialty']}곳 → 저장 {stats['count']}곳 "
+          f"(지오코딩 {stats['geocoded']}곳)")
+    print(f"{args.output}에 저장 ({time.perf_counter() - start:.1f}초)")
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
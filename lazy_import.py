@@ -0,0 +1,67 @@
+"""
+지연 import
+
+무거운 라이브러리(cv2, tensorflow 등)를 모듈 상단에서 바로 import하지 않고,
+처음 속성에 접근할 때 import하여 페이지 시작 시간을 줄인다.
+
+    cv2 = lazy_import('cv2')   # 여기서는 import하지 않음
+    cv2.resize(...)            # 첫 사용 시 import
+"""
+import importlib
+import sys
+import types
+
+class LazyModule(types.ModuleType):
+    """첫 속성 접근 시 실제 모듈을 import하는 대리 모듈"""
+
+    def __init__(self, name):
+        super().__init__(name)
+        self.__dict__['_lazy_module'] = None
+
+    def _load(self):
+        module = self.__dict__['_lazy_module']
+        if module is None:
+            module = importlib.import_module(self.__name__)
+            # 이후 접근은 __getattr__을 거치지 않도록 실제 모듈의 속성을 복사
+            self.__dict__.update(module.__dict__)
+            self.__dict__['_lazy_module'] = module
+        return module
+
+    def __getattr__(self, attr):
+        return getattr(self._load(), attr)
+
+    def __dir__(self):
+        return dir(self._load())
+
+    def __repr__(self):
+        state = 'loaded' if self.__dict__['_lazy_module'] is not None else 'not loaded'
+        return f"<lazy module '{self.__name__}' ({state})>"
+
+def lazy_import(name):
+    """
+    모듈을 지연 import
+
+    Args:
+        name: 모듈 이름 (예: 'cv2', 'plotly.graph_objects')
+
+    Returns:
+        이미 import된 모듈이면 그 모듈, 아니면 첫 사용 시 import하는 LazyModule
+    """
+    module = sys.modules.get(name)
+    if module is not None:
+        return module
+    return LazyModule(name)
+
+def is_loaded(module):
+    """
+    모듈이 실제로 import되었는지 확인
+
+    Args:
+        module: lazy_import가 반환한 모듈
+
+    Returns:
+        import되었으면 True
+    """
+    if isinstance(module, LazyModule):
+        return module.__dict__['_lazy_module'] is not None
+    return True
@@ -0,0 +1,229 @@
+"""
+PDF 진단 보고서
+
+진단 결과(각도, 위험도, 권장사항), 방향별 분석 오버레이 이미지(draw_spine_analysis),
+척추 곡률 그래프를 담은 PDF를 만든다.
+보고서는 페이지 스크립트가 아닌 백그라운드 작업 큐에서 만들고 결과 id별로 캐시하므로,
+저장 버튼을 여러 번 누르거나 페이지가 다시 그려져도 다시 만들지 않는다.
+
+reportlab은 보고서를 처음 만들 때 import한다.
+한글은 reportlab 내장 CID 글꼴(HYSMyeongJo-Medium)을 사용하므로 별도 글꼴 파일이 필요 없다.
+"""
+import io
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+import numpy as np
+
+from lazy_import import lazy_import
+
+cv2 = lazy_import('cv2')
+
+# 한글 CID 글꼴
+REPORT_FONT = 'HYSMyeongJo-Medium'
+
+# 보관할 보고서 수 (결과 id 기준 LRU)
+DEFAULT_CACHE_SIZE = 32
+
+# 보고서 오버레이 이미지 순서와 제목
+VIEW_TITLES = {'back': "후면", 'side': "측면", 'front': "전면"}
+
+def generate_pdf_report(result, overlays=None, created_at=None):
+    """
+    진단 결과 PDF 생성
+
+    Args:
+        result: st.session_state.result 형식의 결과 딕셔너리
+        overlays: {촬영 방향: draw_spine_analysis 결과 BGR 이미지} (없으면 이미지 생략)
+        created_at: 보고서 시각 (None이면 현재 시각)
+
+    Returns:
+        PDF 바이트
+    """
+    from reportlab.lib import colors
+    from reportlab.lib.pagesizes import A4
+    from reportlab.lib.styles import ParagraphStyle
+    from reportlab.lib.units import mm
+    from reportlab.pdfbase import pdfmetrics
+    from reportlab.pdfbase.cidfonts import UnicodeCIDFont
+    from reportlab.platypus import Image, Paragraph, SimpleDocTemplate, Spacer, Table, TableStyle
+
+    if REPORT_FONT not in pdfmetrics.getRegisteredFontNames():
+        pdfmetrics.registerFont(UnicodeCIDFont(REPORT_FONT))
+
+    title_style = ParagraphStyle('title', fontName=REPORT_FONT, fontSize=20, leading=26, spaceAfter=6)
+    heading_style = ParagraphStyle('heading', fontName=REPORT_FONT, fontSize=14, leading=20,
+                                   spaceBefore=10, spaceAfter=4, textColor=colors.HexColor('#1E88E5'))
+    body_style = ParagraphStyle('body', fontName=REPORT_FONT, fontSize=10.5, leading=16)
+    note_style = ParagraphStyle('note', parent=body_style, fontSize=9, textColor=colors.grey)
+
+    created_at = created_at or datetime.now()
+    story = [
+        Paragraph("SpineCheck 척추측만증 자가진단 보고서", title_style),
+        Paragraph(f"진단 시각: {created_at.strftime('%Y-%m-%d %H:%M')}", note_style),
+        Spacer(1, 6 * mm)
+    ]
+
+    # 측정 결과 요약
+    story.append(Paragraph("측정 결과", heading_style))
+    summary = [["대표 Cobb 각도", f"{result['angle']}°"], ["위험도", result['risk_level']]]
+    for view, view_result in result.get('views', {}).items():
+        summary.append([f"{VIEW_TITLES.get(view, view)} 각도", f"{view_result['angle']}°"])
+    table = Table(summary, colWidths=[50 * mm, 40 * mm])
+    table.setStyle(TableStyle([
+        ('FONTNAME', (0, 0), (-1, -1), REPORT_FONT),
+        ('FONTSIZE', (0, 0), (-1, -1), 10.5),
+        ('BACKGROUND', (0, 0), (0, -1), colors.HexColor('#F5F5F5')),
+        ('GRID', (0, 0), (-1, -1), 0.5, colors.HexColor('#BDBDBD')),
+        ('BOTTOMPADDING', (0, 0), (-1, -1), 5)
+    ]))
+    story.append(table)
+
+    # 분석 이미지 (방향별 오버레이를 한 줄에 배치)
+    overlays = {view: image for view, image in (overlays or {}).items() if image is not None}
+    if overlays:
+        story.append(Paragraph("척추 분석 이미지", heading_style))
+        cell_width = 170 * mm / len(overlays)
+        cells = []
+        for view, image in overlays.items():
+            height, width = image.shape[:2]
+            cells.append([
+                Image(io.BytesIO(_encode_jpeg(image)), width=cell_width - 4 * mm,
+                      height=(cell_width - 4 * mm) * height / width),
+                Paragraph(VIEW_TITLES.get(view, view), body_style)
+            ])
+        story.append(Table([cells], colWidths=[cell_width] * len(cells)))
+
+    # 척추 곡률 그래프 (후면 랜드마크, 없으면 첫 방향)
+    views = result.get('views', {})
+    curve_view = 'back' if 'back' in views else next(iter(views), None)
+    if curve_view is not None and len(views[curve_view].get('points', [])) >= 2:
+        story.append(Paragraph("척추 곡률", heading_style))
+        story.append(_curvature_drawing(views[curve_view]['points'], 170 * mm, 60 * mm))
+
+    # 권장사항
+    story.append(Paragraph("권장사항", heading_style))
+    for recommendation in result.get('recommendations', []):
+        story.append(Paragraph(f"• {recommendation}", body_style))
+
+    story.append(Spacer(1, 8 * mm))
+    story.append(Paragraph(
+        "본 진단 결과는 참고용으로만 사용하시고, 정확한 진단은 반드시 전문의와 상담하세요.", note_style
+    ))
+
+    buffer = io.BytesIO()
+    document = SimpleDocTemplate(buffer, pagesize=A4, leftMargin=20 * mm, rightMargin=20 * mm,
+                                 topMargin=18 * mm, bottomMargin=18 * mm,
+                                 title="SpineCheck 진단 보고서", author="SpineCheck")
+    document.build(story)
+    return buffer.getvalue()
+
+def _encode_jpeg(image):
+    ok, encoded = cv2.imencode('.jpg', image, [cv2.IMWRITE_JPEG_QUALITY, 85])
+    if not ok:
+        raise ValueError("오버레이 이미지를 인코딩할 수 없습니다")
+    return encoded.tobytes()
+
+def _curvature_drawing(points, width, height):
+    """척추 포인트의 좌우 편향 그래프 (위→아래 위치별, 첫 점과 끝 점을 잇는 직선 기준)"""
+    from reportlab.graphics.charts.lineplots import LinePlot
+    from reportlab.graphics.shapes import Drawing
+    from reportlab.lib import colors
+
+    points = np.asarray(points, dtype=np.float64)
+    xs, ys = points[:, 0], points[:, 1]
+
+    # 양 끝 점을 잇는 기준선에서의 좌우 편향 (픽셀)
+    baseline = np.interp(ys, [ys[0], ys[-1]], [xs[0], xs[-1]])
+    deviation = xs - baseline
+    position = (ys - ys[0]) / max(ys[-1] - ys[0], 1.0) * 100
+
+    drawing = Drawing(width, height)
+    plot = LinePlot()
+    plot.x, plot.y = 30, 20
+    plot.width, plot.height = width - 50, height - 35
+    plot.data = [
+        list(zip(position.tolist(), deviation.tolist())),
+        [(0.0, 0.0), (100.0, 0.0)]
+    ]
+    plot.lines[0].strokeColor = colors.HexColor('#1E88E5')
+    plot.lines[0].strokeWidth = 2
+    plot.lines[1].strokeColor = colors.green
+    plot.lines[1].strokeDashArray = (4, 3)
+    limit = max(5.0, float(np.abs(deviation).max()) * 1.2)
+    plot.yValueAxis.valueMin, plot.yValueAxis.valueMax = -limit, limit
+    plot.xValueAxis.valueMin, plot.xValueAxis.valueMax = 0, 100
+    drawing.add(plot)
+    return drawing
+
+class ReportJobQueue:
+    """
+    백그라운드 PDF 생성 큐
+
+    워커 수를 제한한 스레드 풀에서 보고서를 만들고, 결과 id별 Future를 LRU로 보관한다.
+    같은 결과 id로 다시 제출하면 진행 중이거나 완성된 Future를 그대로 반환한다.
+
+    Args:
+        max_workers: 동시에 만들 수 있는 보고서 수
+        cache_size: 보관할 보고서 수
+    """
+
+    def __init__(self, max_workers=1, cache_size=DEFAULT_CACHE_SIZE):
+        self.cache_size = cache_size
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='spinecheck-report')
+        self._futures = OrderedDict()
+        self._lock = threading.Lock()
+
+    def submit(self, result, overlays=None):
+        """
+        보고서 생성 제출 (이미 제출된 결과 id면 기존 작업 반환)
+
+        Args:
+            result: 결과 딕셔너리 (id 필수)
+            overlays: {촬영 방향: 오버레이 이미지}
+
+        Returns:
+            PDF 바이트를 돌려주는 Future
+        """
+        result_id = result['id']
+        with self._lock:
+            future = self._futures.get(result_id)
+            # 실패한 작업은 다시 제출
+            if future is not None and not (future.done() and future.exception() is not None):
+                self._futures.move_to_end(result_id)
+                return future
+
+            future = self._executor.submit(generate_pdf_report, result, overlays, datetime.now())
+            self._futures[result_id] = future
+            while len(self._futures) > self.cache_size:
+                self._futures.popitem(last=False)
+            return future
+
+    def get(self, result_id):
+        """
+        제출된 보고서 작업
+
+        Returns:
+            Future, 제출된 적이 없으면 None
+        """
+        with self._lock:
+            return self._futures.get(result_id)
+
+_report_queue = None
+_report_queue_lock = threading.Lock()
+
+def get_report_queue():
+    """
+    프로세스 전체에서 공유하는 보고서 큐 반환
+
+    SPINECHECK_REPORT_WORKERS 환경 변수로 동시 생성 수를 지정한다 (기본값 1).
+    """
+    global _report_queue
+
+    with _report_queue_lock:
+        if _report_queue is None:
+            _report_queue = ReportJobQueue(max_workers=int(os.environ.get('SPINECHECK_REPORT_WORKERS', 1)))
+        return _report_queue
@@ -0,0 +1,335 @@
+"""
+척추 랜드마크 검출 백엔드
+
+검출 모델은 프로세스당 한 번만 로드하여 모든 세션/페이지가 공유한다.
+SPINECHECK_DETECTOR 환경 변수로 백엔드를 선택한다.
+    stub:       결정적인 S자 곡선을 반환하는 스텁 모델 (기본값, 오프라인 테스트용)
+    tensorflow: SPINECHECK_MODEL_PATH의 Keras/SavedModel 랜드마크 모델
+"""
+import os
+import threading
+import time
+
+import numpy as np
+
+from lazy_import import lazy_import
+
+# OpenCV는 TensorFlow 백엔드의 입력 변환에서만 사용
+cv2 = lazy_import('cv2')
+
+# 감지하는 척추 포인트 개수
+SPINE_POINT_COUNT = 7
+
+class DetectorMetrics:
+    """모델 로드 시간과 추론 지연 시간 누적 통계"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.load_seconds = None
+        self.images = 0
+        self.image_seconds = 0.0
+        self.batches = 0
+        self.batch_seconds = 0.0
+        self.last_batch_size = 0
+        self.last_batch_seconds = 0.0
+
+    def record_load(self, seconds):
+        with self._lock:
+            self.load_seconds = seconds
+
+    def record_batch(self, size, seconds):
+        with self._lock:
+            self.images += size
+            self.image_seconds += seconds
+            self.batches += 1
+            self.batch_seconds += seconds
+            self.last_batch_size = size
+            self.last_batch_seconds = seconds
+
+    def snapshot(self):
+        """
+        현재 통계
+
+        Returns:
+            딕셔너리 (load_ms, images, batches, per_image_ms, per_batch_ms, last_batch_size, last_batch_ms)
+        """
+        with self._lock:
+            return {
+                'load_ms': self.load_seconds * 1000 if self.load_seconds is not None else None,
+                'images': self.images,
+                'batches': self.batches,
+                'per_image_ms': self.image_seconds / self.images * 1000 if self.images else None,
+                'per_batch_ms': self.batch_seconds / self.batches * 1000 if self.batches else None,
+                'last_batch_size': self.last_batch_size,
+                'last_batch_ms': self.last_batch_seconds * 1000
+            }
+
+def merge_metric_snapshots(snapshots):
+    """
+    여러 검출기(예: 일괄 진단 워커 프로세스)의 snapshot을 하나로 합침
+
+    Args:
+        snapshots: DetectorMetrics.snapshot() 결과 목록
+
+    Returns:
+        딕셔너리 (load_ms는 가장 오래 걸린 로드, 나머지는 전체 이미지/배치 기준 평균)
+    """
+    snapshots = list(snapshots)
+    loads = [snapshot['load_ms'] for snapshot in snapshots if snapshot['load_ms'] is not None]
+    images = sum(snapshot['images'] for snapshot in snapshots)
+    batches = sum(snapshot['batches'] for snapshot in snapshots)
+    image_ms = sum(snapshot['per_image_ms'] * snapshot['images'] for snapshot in snapshots if snapshot['images'])
+    batch_ms = sum(snapshot['per_batch_ms'] * snapshot['batches'] for snapshot in snapshots if snapshot['batches'])
+    return {
+        'load_ms': max(loads) if loads else None,
+        'images': images,
+        'batches': batches,
+        'per_image_ms': image_ms / images if images else None,
+        'per_batch_ms': batch_ms / batches if batches else None
+    }
+
+def format_metrics(snapshot):
+    """검출기 통계 한 줄 요약 문구"""
+    parts = [f"모델 로드 {snapshot['load_ms']:.1f} ms" if snapshot['load_ms'] is not None else "모델 로드 전"]
+    if snapshot['images']:
+        parts.append(f"이미지당 {snapshot['per_image_ms']:.2f} ms ({snapshot['images']}장)")
+        parts.append(f"배치당 {snapshot['per_batch_ms']:.2f} ms ({snapshot['batches']}회)")
+    return ", ".join(parts)
+
+class SpineDetector:
+    """
+    척추 랜드마크 검출기 기본 클래스
+
+    하위 클래스는 _load()와 _predict(images)를 구현한다.
+    _predict는 같은 크기의 이미지 배열 (N, H, W[, C])을 받아
+    픽셀 좌표 (N, K, 2) 배열((x, y) 순서)을 반환한다.
+    """
+
+    name = None
+
+    def __init__(self):
+        self.metrics = DetectorMetrics()
+        self._loaded = False
+        self._load_lock = threading.Lock()
+
+    @property
+    def cache_token(self):
+        """분석 캐시 키에 넣는 검출기 식별자 (검출 결과가 달라질 수 있으면 달라야 함)"""
+        return self.name
+
+    def load(self):
+        """모델 로드 (여러 번 호출해도 한 번만 로드)"""
+        with self._load_lock:
+            if not self._loaded:
+                start = time.perf_counter()
+                self._load()
+                self.metrics.record_load(time.perf_counter() - start)
+                self._loaded = True
+        return self
+
+    def detect(self, image):
+        """
+        이미지 한 장의 척추 포인트 검출
+
+        Args:
+            image: OpenCV 이미지 (H, W[, C])
+
+        Returns:
+            척추 포인트 배열 (K, 2), (x, y) 정수 픽셀 좌표
+        """
+        return self.detect_batch(np.asarray(image)[np.newaxis])[0]
+
+    def detect_batch(self, images):
+        """
+        여러 이미지의 척추 포인트를 한 번의 추론으로 검출
+
+        Args:
+            images: 같은 크기의 이미지 배열 (N, H, W[, C])
+
+        Returns:
+            척추 포인트 배열 (N, K, 2), (x, y) 정수 픽셀 좌표
+        """
+        images = np.asarray(images)
+        if images.ndim < 3:
+            raise ValueError(f"images는 (N, H, W, ...) 형태여야 합니다: {images.shape}")
+
+        self.load()
+
+        start = time.perf_counter()
+        points = self._predict(images)
+        self.metrics.record_batch(len(images), time.perf_counter() - start)
+
+        return np.rint(points).astype(np.int64)
+
+    def _load(self):
+        raise NotImplementedError
+
+    def _predict(self, images):
+        raise NotImplementedError
+
+class StubSpineDetector(SpineDetector):
+    """
+    결정적인 스텁 검출기
+
+    모델 없이 이미지 크기만으로 약간 휘어진 척추 포인트를 생성한다.
+    네트워크나 모델 파일 없이 동작하므로 테스트와 데모에 사용한다.
+    """
+
+    name = 'stub'
+
+    def _load(self):
+        pass
+
+    def _predict(self, images):
+        count, height, width = images.shape[:3]
+        last = SPINE_POINT_COUNT - 1
+
+        # 가슴~허리 구간에 S자 형태로 포인트 배치 (정수 좌표로 절사)
+        i = np.arange(SPINE_POINT_COUNT)
+        ys = (height * 0.3 + (height * 0.5 / last) * i).astype(np.int64)
+        offsets = (10 * np.sin((i / last) * np.pi)).astype(np.int64)
+        xs = width // 2 + offsets
+
+        points = np.stack([xs, ys], axis=-1)
+        return np.broadcast_to(points, (count, SPINE_POINT_COUNT, 2))
+
+class TensorFlowSpineDetector(SpineDetector):
+    """
+    TensorFlow 랜드마크 모델 검출기 (CPU 배치 추론)
+
+    모델은 (N, input_height, input_width, 3) float32 [0, 1] 입력을 받아
+    (N, K, 2) 또는 (N, K * 2) 형태의 정규화 좌표 (x, y)를 출력해야 한다.
+
+    Args:
+        model_path: Keras 모델 파일 또는 SavedModel 디렉토리
+        input_size: 모델 입력 크기 (높이, 너비)
+    """
+
+    name = 'tensorflow'
+
+    def __init__(self, model_path, input_size=(256, 192)):
+        super().__init__()
+        self.model_path = model_path
+        self.input_size = tuple(input_size)
+        self._model = None
+        self._model_token = None
+        self._predict_lock = threading.Lock()
+
+    @property
+    def cache_token(self):
+        """백엔드 이름 + 모델 경로, 수정 시각, 크기 (로드 전이면 현재 파일 기준, 모델 파일을 바꾸면 달라짐)"""
+        return f"{self.name}|{self._model_token or self._stat_model()}|{self.input_size}"
+
+    def _stat_model(self):
+        if not self.model_path or not os.path.exists(self.model_path):
+            return str(self.model_path)
+        # SavedModel은 디렉토리 안의 모든 파일 기준
+        if os.path.isdir(self.model_path):
+            files = [os.path.join(root, name) for root, _, names in os.walk(self.model_path) for name in names]
+        else:
+            files = [self.model_path]
+        stats = [os.stat(path) for path in files]
+        return (f"{os.path.abspath(self.model_path)}|{max((s.st_mtime_ns for s in stats), default=0)}"
+                f"|{sum(s.st_size for s in stats)}")
+
+    def _load(self):
+        # TensorFlow는 무거우므로 이 백엔드를 사용할 때만 import
+        import tensorflow as tf
+
+        if not self.model_path or not os.path.exists(self.model_path):
+            raise FileNotFoundError(f"랜드마크 모델을 찾을 수 없습니다: {self.model_path}")
+        # 로드한 모델 기준으로 캐시 식별자 고정
+        self._model_token = self._stat_model()
+
+        if os.path.isdir(self.model_path):
+            # SavedModel: 기본 서빙 시그니처의 첫 번째 출력 사용
+            signature = tf.saved_model.load(self.model_path).signatures['serving_default']
+            self._model = lambda batch, training=False: next(iter(signature(tf.constant(batch)).values()))
+        else:
+            self._model = tf.keras.models.load_model(self.model_path, compile=False)
+
+    def _predict(self, images):
+        count, height, width = images.shape[:3]
+        input_height, input_width = self.input_size
+
+        batch = np.empty((count, input_height, input_width, 3), dtype=np.float32)
+        for i in range(count):
+            image = images[i]
+            if image.ndim == 2:
+                image = cv2.cvtColor(image, cv2.COLOR_GRAY2RGB)
+            else:
+                image = cv2.cvtColor(image, cv2.COLOR_BGR2RGB)
+            batch[i] = cv2.resize(image, (input_width, input_height))
+        batch /= 255.0
+
+        # 여러 세션이 같은 모델을 공유하므로 추론은 한 번에 하나씩
+        with self._predict_lock:
+            output = np.asarray(self._model(batch, training=False))
+
+        points = output.reshape(count, -1, 2)
+        return points * np.array([width, height], dtype=np.float32)
+
+# 사용 가능한 백엔드
+DETECTOR_BACKENDS = {
+    StubSpineDetector.name: StubSpineDetector,
+    TensorFlowSpineDetector.name: TensorFlowSpineDetector
+}
+
+_detector = None
+_detector_lock = threading.Lock()
+
+def create_detector(name=None, model_path=None):
+    """
+    검출기 생성 (로드는 하지 않음)
+
+    Args:
+        name: 백엔드 이름 (None이면 SPINECHECK_DETECTOR, 기본값 'stub')
+        model_path: 모델 경로 (None이면 SPINECHECK_MODEL_PATH)
+
+    Returns:
+        SpineDetector
+    """
+    name = name or os.environ.get('SPINECHECK_DETECTOR', StubSpineDetector.name)
+    if name not in DETECTOR_BACKENDS:
+        raise ValueError(f"지원하지 않는 검출 백엔드: {name} (사용 가능: {', '.join(DETECTOR_BACKENDS)})")
+
+    if name == TensorFlowSpineDetector.name:
+        return TensorFlowSpineDetector(model_path or os.environ.get('SPINECHECK_MODEL_PATH'))
+    return DETECTOR_BACKENDS[name]()
+
+def detector_cache_token():
+    """
+    공유 검출기의 분석 캐시 식별자 (모델을 로드하지 않음)
+
+    Returns:
+        아직 검출기가 없으면 환경 변수 설정으로 만들 검출기의 식별자
+    """
+    detector = _detector
+    return (detector or create_detector()).cache_token
+
+def get_detector():
+    """
+    프로세스 전체에서 공유하는 검출기 반환 (처음 호출 시 생성 및 모델 로드)
+
+    Returns:
+        로드된 SpineDetector
+    """
+    global _detector
+
+    if _detector is None:
+        with _detector_lock:
+            if _detector is None:
+                _detector = create_detector().load()
+    return _detector
+
+def set_detector(detector):
+    """
+    공유 검출기 교체
+
+    Args:
+        detector: 사용할 SpineDetector (None이면 다음 get_detector 호출 시 환경 변수로 다시 생성)
+    """
+    global _detector
+
+    with _detector_lock:
+        _detector = detector.load() if detector is not None else None
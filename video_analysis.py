@@ -0,0 +1,335 @@
+"""
+실시간 영상 분석
+
+카메라 프레임이 들어오는 대로 image_processing 파이프라인(전처리 → 척추 포인트 검출 → Cobb 각도)을 실행한다.
+    - 이전 프레임을 처리 중이면 새 프레임은 버린다 (밀린 프레임을 쌓지 않음)
+    - 축소 썸네일 기준으로 자세 변화가 작으면 검출을 다시 하지 않고 이전 포인트를 사용한다
+    - 흐리거나 어둡거나 잘린 프레임은 검출하지 않는다 (frame_quality)
+    - 검출된 랜드마크는 칼만 필터로 시간 방향 평활화하여 각도가 프레임마다 흔들리지 않게 한다
+
+streamlit-webrtc는 영상 모드를 열 때만 import한다 (SpineVideoProcessor 참고).
+"""
+import threading
+import time
+from collections import deque
+
+import numpy as np
+
+from image_processing import (
+    cv2,
+    preprocess_gray,
+    PreprocessBuffers,
+    detect_spine_points,
+    calculate_cobb_segments,
+    draw_spine_analysis
+)
+from frame_quality import assess_frame_quality
+from lazy_import import lazy_import
+
+# av는 streamlit-webrtc 프레임 변환에만 사용
+av = lazy_import('av')
+
+# 자세 변화 판단용 썸네일 크기 (너비, 높이)
+MOTION_THUMBNAIL_SIZE = (64, 48)
+
+# 썸네일 평균 밝기 차이가 이보다 작으면 자세가 그대로인 것으로 봄 (0~255)
+DEFAULT_MOTION_THRESHOLD = 4.0
+
+# 자세 변화가 없어도 이 프레임 수마다 한 번은 다시 검출
+DEFAULT_MAX_REUSE = 15
+
+# 저장 시 가장 좋은 프레임을 고르는 최근 프레임 수
+BURST_SIZE = 8
+
+class LandmarkSmoother:
+    """
+    랜드마크 좌표별 칼만 필터 (랜덤 워크 모델)
+
+    각 좌표를 독립적으로 추정하며, 측정값이 흔들려도 추정값은 천천히 따라간다.
+    분산이 수렴하면 고정 계수 EMA와 같아진다.
+
+    Args:
+        process_noise: 프레임 사이 실제 자세 변화의 분산 (픽셀²)
+        measurement_noise: 검출 좌표 오차의 분산 (픽셀²)
+    """
+
+    def __init__(self, process_noise=1.0, measurement_noise=16.0):
+        self.process_noise = process_noise
+        self.measurement_noise = measurement_noise
+        self.reset()
+
+    def reset(self):
+        """추정 상태 초기화 (다음 측정값을 그대로 시작값으로 사용)"""
+        self._state = None
+        self._variance = None
+
+    @property
+    def points(self):
+        """현재 추정 좌표 (K, 2), 측정값이 없으면 None"""
+        return self._state
+
+    def update(self, points):
+        """
+        새 측정값 반영
+
+        Args:
+            points: 검출된 척추 포인트 (K, 2)
+
+        Returns:
+            평활화된 좌표 (K, 2) float64
+        """
+        measured = np.asarray(points, dtype=np.float64)
+
+        # 첫 측정이거나 랜드마크 수가 바뀌면 새로 시작
+        if self._state is None or self._state.shape != measured.shape:
+            self._state = measured.copy()
+            self._variance = np.full(measured.shape, self.measurement_noise)
+            return self._state
+
+        # 예측: 자세가 그대로라고 가정하고 불확실성만 증가
+        self._variance += self.process_noise
+
+        # 보정
+        gain = self._variance / (self._variance + self.measurement_noise)
+        self._state += gain * (measured - self._state)
+        self._variance *= 1.0 - gain
+
+        return self._state
+
+class VideoSpineAnalyzer:
+    """
+    프레임 스트림 척추 분석기
+
+    process(frame)는 여러 스레드에서 호출해도 되며, 처리 중에 들어온 프레임은 버린다.
+    분석 좌표는 target_size 기준이다 (ingest_image의 분석 배열과 같은 좌표계).
+
+    Args:
+        target_size: 분석 이미지 크기 (높이, 너비)
+        motion_threshold: 검출을 다시 할 썸네일 평균 밝기 차이
+        max_reuse: 자세 변화가 없어도 다시 검출하기까지의 최대 프레임 수
+        smoother: 사용할 LandmarkSmoother (None이면 기본값)
+    """
+
+    def __init__(self, target_size=(480, 640), motion_threshold=DEFAULT_MOTION_THRESHOLD,
+                 max_reuse=DEFAULT_MAX_REUSE, smoother=None):
+        self.target_size = tuple(target_size)
+        self.motion_threshold = motion_threshold
+        self.max_reuse = max_reuse
+        self.smoother = smoother or LandmarkSmoother()
+
+        # 프레임 콜백 스레드가 바뀔 수 있으므로 스레드별 풀 대신 분석기 전용 버퍼 사용
+        self._buffers = PreprocessBuffers(self.target_size)
+        self._busy = threading.Lock()
+        self._state_lock = threading.Lock()
+
+        self._reference_thumbnail = None
+        self._reused_since_detection = 0
+        self._burst = deque(maxlen=BURST_SIZE)
+        self._latest = None
+        self._frame_times = deque(maxlen=30)
+
+        self.frames = 0
+        self.dropped = 0
+        self.rejected = 0
+        self.detections = 0
+        self.reused = 0
+
+    def process(self, frame):
+        """
+        프레임 분석
+
+        Args:
+            frame: OpenCV BGR 프레임 (H, W, 3)
+
+        Returns:
+            최신 분석 결과 (latest와 같음), 아직 없으면 None
+        """
+        if not self._busy.acquire(blocking=False):
+            # 이전 프레임을 처리 중이면 버림
+            with self._state_lock:
+                self.frames += 1
+                self.dropped += 1
+                return self._latest
+
+        try:
+            return self._process(frame)
+        finally:
+            self._busy.release()
+
+    def _process(self, frame):
+        # 사용할 수 없는 프레임은 검출하지 않음
+        quality = assess_frame_quality(frame)
+        if not quality.usable:
+            with self._state_lock:
+                self.frames += 1
+                self.rejected += 1
+                self._frame_times.append(time.perf_counter())
+                return self._latest
+
+        thumbnail = motion_thumbnail(frame)
+
+        # 자세가 그대로면 이전 검출 결과를 사용
+        moved = (
+            self._reference_thumbnail is None
+            or self._reused_since_detection >= self.max_reuse
+            or motion_score(thumbnail, self._reference_thumbnail) >= self.motion_threshold
+        )
+
+        latest = self._latest
+        if moved:
+            processed = preprocess_gray(frame, self.target_size, buffers=self._buffers)
+            points = self.smoother.update(detect_spine_points(processed))
+
+            segments = calculate_cobb_segments(points)
+            latest = {
+                'points': [(int(round(x)), int(round(y))) for x, y in points],
+                'angle': max((segment['angle'] for segment in segments), default=0.0),
+                'segments': segments
+            }
+            self._reference_thumbnail = thumbnail
+            self._reused_since_detection = 0
+        else:
+            self._reused_since_detection += 1
+
+        with self._state_lock:
+            self.frames += 1
+            if moved:
+                self.detections += 1
+            else:
+                self.reused += 1
+            # 프레임과 그 프레임에 적용된 결과(검출 또는 재사용)를 함께 보관
+            self._burst.append((quality, frame, latest))
+            self._latest = latest
+            self._frame_times.append(time.perf_counter())
+
+        return latest
+
+    @property
+    def latest(self):
+        """최신 분석 결과 ({'points', 'angle', 'segments'}), 아직 없으면 None"""
+        with self._state_lock:
+            return self._latest
+
+    def stats(self):
+        """
+        처리 통계
+
+        Returns:
+            딕셔너리 (frames, dropped, rejected, detections, reused, fps)
+        """
+        with self._state_lock:
+            times = list(self._frame_times)
+            fps = (len(times) - 1) / (times[-1] - times[0]) if len(times) > 1 and times[-1] > times[0] else 0.0
+            return {
+                'frames': self.frames,
+                'dropped': self.dropped,
+                'rejected': self.rejected,
+                'detections': self.detections,
+                'reused': self.reused,
+                'fps': fps
+            }
+
+    def capture(self):
+        """
+        최근 프레임 중 품질이 가장 좋은 프레임과 그 프레임의 분석 결과
+
+        Returns:
+            (BGR 프레임, 분석 결과 딕셔너리 {'points', 'angle', 'segments', 'overlay'}),
+            분석한 프레임이 없으면 (None, None)
+        """
+        with self._state_lock:
+            burst = list(self._burst)
+        if not burst:
+            return None, None
+
+        # 품질 점수는 프레임을 처리할 때 이미 계산됨
+        _, frame, latest = max(burst, key=lambda entry: entry[0].score)
+
+        # 결과 페이지용 오버레이는 분석 해상도로 그림
+        height, width = self.target_size
+        overlay = draw_spine_analysis(cv2.resize(frame, (width, height)), latest['points'], latest['angle'])
+        return frame, dict(latest, overlay=overlay)
+
+    def reset(self):
+        """평활화 상태와 통계 초기화 (촬영 방향이 바뀔 때 호출)"""
+        with self._busy, self._state_lock:
+            self.smoother.reset()
+            self._reference_thumbnail = None
+            self._reused_since_detection = 0
+            self._burst.clear()
+            self._latest = None
+            self._frame_times.clear()
+            self.frames = self.dropped = self.rejected = self.detections = self.reused = 0
+
+def motion_thumbnail(frame):
+    """
+    자세 변화 비교용 흑백 썸네일
+
+    Args:
+        frame: OpenCV 이미지 (BGR 또는 단일 채널)
+
+    Returns:
+        MOTION_THUMBNAIL_SIZE 크기의 uint8 흑백 이미지
+    """
+    thumbnail = cv2.resize(frame, MOTION_THUMBNAIL_SIZE, interpolation=cv2.INTER_AREA)
+    if thumbnail.ndim == 3:
+        thumbnail = cv2.cvtColor(thumbnail, cv2.COLOR_BGR2GRAY)
+    return thumbnail
+
+def motion_score(thumbnail, reference):
+    """
+    두 썸네일의 평균 밝기 차이 (0~255)
+
+    Args:
+        thumbnail: 현재 썸네일
+        reference: 마지막으로 검출한 프레임의 썸네일
+
+    Returns:
+        평균 절대 차이
+    """
+    return float(cv2.absdiff(thumbnail, reference).mean())
+
+def draw_live_overlay(frame, result):
+    """
+    미리보기 프레임에 척추 포인트와 각도를 표시 (프레임마다 호출되므로 가볍게 그림)
+
+    Args:
+        frame: OpenCV BGR 프레임 (제자리에 그림)
+        result: VideoSpineAnalyzer 분석 결과 (프레임과 같은 좌표계)
+
+    Returns:
+        frame
+    """
+    if result is None:
+        return frame
+
+    points = np.asarray(result['points'], dtype=np.int32)
+    cv2.polylines(frame, [points.reshape(-1, 1, 2)], False, (0, 255, 0), 2)
+    for x, y in points:
+        cv2.circle(frame, (int(x), int(y)), 4, (0, 0, 255), -1)
+    cv2.putText(frame, f"Cobb Angle: {result['angle']:.1f}", (20, 40),
+                cv2.FONT_HERSHEY_SIMPLEX, 1.0, (255, 255, 255), 2)
+    return frame
+
+class SpineVideoProcessor:
+    """
+    streamlit-webrtc 영상 처리기 (webrtc_streamer의 video_processor_factory로 사용)
+
+    프레임마다 분석기를 거친 뒤 척추 포인트와 각도를 표시한 미리보기를 반환한다.
+    미리보기는 분석 해상도로 축소되므로 표시 좌표가 분석 좌표와 같다.
+
+    Args:
+        target_size: 분석 이미지 크기 (높이, 너비)
+    """
+
+    def __init__(self, target_size=(480, 640)):
+        self.analyzer = VideoSpineAnalyzer(target_size)
+
+    def recv(self, frame):
+        image = frame.to_ndarray(format='bgr24')
+        result = self.analyzer.process(image)
+
+        height, width = self.analyzer.target_size
+        preview = cv2.resize(image, (width, height))
+        draw_live_overlay(preview, result)
+        return av.VideoFrame.from_ndarray(preview, format='bgr24')